@@ -0,0 +1,115 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { readFileSync } from 'fs';
+import * as path from 'path';
+import { CodeConverter } from '../src/code-converter';
+import { collectGarbage, TimingObserver } from './timing-observer';
+import { createSyntheticPrototype, scaledShape } from './synthetic-prototype';
+
+const TEMPLATE_MAIN_PY = readFileSync(path.join(__dirname, '../src/tests/files/velocitas_template_main.py'), 'utf8');
+const ROUNDS = 5;
+const MIN_ROUND_DURATION_MS = 200;
+const WARM_UP_DURATION_MS = 500;
+
+const PIPELINE_STEPS = [
+    'PrepareCodeSnippetStep',
+    'ExtractImportsStep',
+    'ExtractVariablesStep',
+    'ExtractClassesStep',
+    'ExtractMethodsStep',
+    'CreateCodeSnippetForTemplateStep',
+];
+const CONVERTER_PHASES = [
+    'adaptCodeSnippet',
+    'extractMainPyBaseStructure',
+    'addCodeSnippetToMainPy',
+    'finalizeMainPy',
+    'identifyDatapoints',
+];
+
+/**
+ * @type ConversionBenchmarkResult
+ * @prop {number} size Number of functions, subscriptions and variables of the synthetic prototype.
+ * @prop {number} lines Lines of the synthetic prototype.
+ * @prop {number} iterations Number of measured conversions.
+ * @prop {number} conversionsPerSecond Throughput of the fastest round, which is the least disturbed by other processes.
+ * @prop {number} peakHeapMb Peak heap above the heap before the first conversion.
+ * @prop {Record<string, number>} stepMs Average duration of each pipeline step per conversion.
+ * @prop {Record<string, number>} phaseMs Average duration of each CodeConverter phase per conversion.
+ */
+export interface ConversionBenchmarkResult {
+    size: number;
+    lines: number;
+    iterations: number;
+    conversionsPerSecond: number;
+    peakHeapMb: number;
+    stepMs: Record<string, number>;
+    phaseMs: Record<string, number>;
+}
+
+const averageDurations = (timingObserver: TimingObserver, names: string[], iterations: number): Record<string, number> =>
+    names.reduce((averages: Record<string, number>, name: string) => {
+        averages[name] = (timingObserver.durations.get(name) ?? 0) / iterations;
+        return averages;
+    }, {});
+
+/**
+ * Converts a synthetic prototype of the given size repeatedly, in rounds of at least `minRoundDurationMs`.
+ * @param {number} size
+ * @param {number} seed Seed of the synthetic prototype.
+ * @param {number} minRoundDurationMs
+ * @return {ConversionBenchmarkResult}
+ */
+export const benchmarkConversion = (
+    size: number,
+    seed: number = 1,
+    minRoundDurationMs: number = MIN_ROUND_DURATION_MS
+): ConversionBenchmarkResult => {
+    const codeSnippet = createSyntheticPrototype(scaledShape(size), seed);
+    const timingObserver = new TimingObserver();
+    const codeConverter = new CodeConverter({ observer: timingObserver });
+    // Conversions until the JIT has optimized the converter are not measured
+    const warmUpStart = Date.now();
+    do {
+        codeConverter.convertMainPy(TEMPLATE_MAIN_PY, codeSnippet, 'benchmark');
+    } while (Date.now() - warmUpStart < WARM_UP_DURATION_MS);
+    collectGarbage();
+    timingObserver.reset();
+    const heapBefore = process.memoryUsage().heapUsed;
+
+    let iterations = 0;
+    let conversionsPerSecond = 0;
+    for (let round = 0; round < ROUNDS; round++) {
+        let roundIterations = 0;
+        let elapsedMs = 0;
+        const start = process.hrtime.bigint();
+        while (roundIterations === 0 || elapsedMs < minRoundDurationMs) {
+            codeConverter.convertMainPy(TEMPLATE_MAIN_PY, codeSnippet, 'benchmark');
+            roundIterations++;
+            elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+        }
+        iterations += roundIterations;
+        conversionsPerSecond = Math.max(conversionsPerSecond, (roundIterations * 1000) / elapsedMs);
+    }
+    return {
+        size: size,
+        lines: codeSnippet.split('\n').length,
+        iterations: iterations,
+        conversionsPerSecond: conversionsPerSecond,
+        peakHeapMb: Math.max(0, timingObserver.peakHeap - heapBefore) / 1024 / 1024,
+        stepMs: averageDurations(timingObserver, PIPELINE_STEPS, iterations),
+        phaseMs: averageDurations(timingObserver, CONVERTER_PHASES, iterations),
+    };
+};
@@ -0,0 +1,148 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import nock from 'nock';
+import { HistogramObserver } from '../src/instrumentation-adapters';
+import { ProjectGenerator } from '../src/project-generator';
+import { TemplateCache } from '../src/template-cache';
+import { APP_MANIFEST_PATH, GITHUB_API_URL, MAIN_PY_PATH, PYTHON_TEMPLATE_URL } from '../src/utils/constants';
+import { encode } from '../src/utils/helpers';
+import { collectGarbage } from './timing-observer';
+import { createSyntheticPrototype, scaledShape } from './synthetic-prototype';
+
+const OWNER = 'benchmarkOwner';
+const REPO = 'benchmarkRepo';
+const MOCK_SHA = 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa';
+const APP_MANIFEST = [{ name: 'template', vehicleModel: { src: 'template' } }];
+const VSPEC = { Vehicle: { type: 'branch', description: 'High-level vehicle data.', children: {} } };
+
+/**
+ * @type EndToEndBenchmarkResult
+ * @prop {number} size Size of the synthetic prototype.
+ * @prop {number} latencyMs Simulated latency of every GitHub request.
+ * @prop {number} runs Number of measured `runWithPayload` calls.
+ * @prop {number} requestsPerRun GitHub requests sent by one run.
+ * @prop {number} medianMs Median duration of one run.
+ * @prop {number} runsPerSecond Sequential runs per second.
+ * @prop {number} peakHeapMb Peak heap above the heap before the first run.
+ * @prop {Record<string, number>} operationMs Mean duration of every request and wait, e.g. `httpRequest POST /git/blobs`.
+ */
+export interface EndToEndBenchmarkResult {
+    size: number;
+    latencyMs: number;
+    runs: number;
+    requestsPerRun: number;
+    medianMs: number;
+    runsPerSecond: number;
+    peakHeapMb: number;
+    operationMs: Record<string, number>;
+}
+
+/**
+ * Replies to every request `runWithPayload` sends with the given latency, like GitHub for an empty template.
+ * @return {() => number} Number of requests answered so far.
+ */
+const simulateGitHub = (latencyMs: number, mainPy: string): (() => number) => {
+    let requests = 0;
+    const reply = (status: number, body: any = {}) => () => {
+        requests++;
+        return [status, body];
+    };
+    const repository = nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).persist();
+    const template = nock(PYTHON_TEMPLATE_URL).persist();
+    template.post('/generate').delay(latencyMs).reply(reply(201));
+    template
+        .get(`/contents/${APP_MANIFEST_PATH}`)
+        .query(true)
+        .delay(latencyMs)
+        .reply(reply(200, { content: encode(JSON.stringify(APP_MANIFEST)) }));
+    template
+        .get(`/contents/${MAIN_PY_PATH}`)
+        .query(true)
+        .delay(latencyMs)
+        .reply(reply(200, { content: encode(mainPy) }));
+    repository.get('/contents').delay(latencyMs).reply(reply(200, []));
+    repository.put('/actions/permissions').delay(latencyMs).reply(reply(204));
+    repository.put('/actions/permissions/workflow').delay(latencyMs).reply(reply(204));
+    repository.get('/git/refs/heads/main').delay(latencyMs).reply(reply(200, { object: { sha: MOCK_SHA } }));
+    repository.patch('/git/refs/heads/main').delay(latencyMs).reply(reply(200, { object: { sha: MOCK_SHA } }));
+    repository.get('/git/trees/main').delay(latencyMs).reply(reply(200, { sha: MOCK_SHA }));
+    repository.post('/git/blobs').delay(latencyMs).reply(reply(201, { sha: MOCK_SHA }));
+    repository.post('/git/trees').delay(latencyMs).reply(reply(201, { sha: MOCK_SHA }));
+    repository.post('/git/commits').delay(latencyMs).reply(reply(201, { sha: MOCK_SHA }));
+    repository.get(`/git/commits/${MOCK_SHA}`).delay(latencyMs).reply(reply(200, { sha: MOCK_SHA }));
+    return () => requests;
+};
+
+/**
+ * Measures `ProjectGenerator.runWithPayload` against a simulated GitHub.
+ * Every run uses a new template cache, so the template files are fetched like in a fresh process.
+ * @param {string} templateMainPy Template main.py served by the simulated GitHub.
+ * @param {number} size Size of the synthetic prototype.
+ * @param {number} latencyMs Simulated latency of every GitHub request.
+ * @param {number} runs
+ * @return {Promise<EndToEndBenchmarkResult>}
+ */
+export const benchmarkEndToEnd = async (
+    templateMainPy: string,
+    size: number,
+    latencyMs: number,
+    runs: number = 5
+): Promise<EndToEndBenchmarkResult> => {
+    const countRequests = simulateGitHub(latencyMs, templateMainPy);
+    const codeSnippet = encode(createSyntheticPrototype(scaledShape(size)));
+    const vspecPayload = encode(JSON.stringify(VSPEC));
+    const histogramObserver = new HistogramObserver();
+    const runWithPayload = () =>
+        new ProjectGenerator(OWNER, REPO, 'benchmarkToken', {
+            templateCache: new TemplateCache(),
+            // Logging every readiness check would dominate short runs
+            readiness: { log: () => {} },
+            observer: histogramObserver,
+        }).runWithPayload(codeSnippet, 'benchmark', vspecPayload);
+    try {
+        await runWithPayload();
+        collectGarbage();
+        histogramObserver.reset();
+        const heapBefore = process.memoryUsage().heapUsed;
+        let peakHeap = heapBefore;
+        const requestsBefore = countRequests();
+        const durationsMs: number[] = [];
+        for (let run = 0; run < runs; run++) {
+            const start = process.hrtime.bigint();
+            await runWithPayload();
+            durationsMs.push(Number(process.hrtime.bigint() - start) / 1e6);
+            peakHeap = Math.max(peakHeap, process.memoryUsage().heapUsed);
+        }
+        durationsMs.sort((first: number, second: number) => first - second);
+        const totalMs = durationsMs.reduce((total: number, durationMs: number) => total + durationMs, 0);
+        const summaries = histogramObserver.summary();
+        const operationMs: Record<string, number> = {};
+        Object.keys(summaries)
+            .filter((name: string) => name.startsWith('httpRequest') || name.startsWith('wait'))
+            .forEach((name: string) => (operationMs[name] = summaries[name].meanMs));
+        return {
+            size: size,
+            latencyMs: latencyMs,
+            runs: runs,
+            requestsPerRun: (countRequests() - requestsBefore) / runs,
+            medianMs: durationsMs[Math.floor(runs / 2)],
+            runsPerSecond: (runs * 1000) / totalMs,
+            peakHeapMb: (peakHeap - heapBefore) / 1024 / 1024,
+            operationMs: operationMs,
+        };
+    } finally {
+        nock.cleanAll();
+    }
+};
@@ -0,0 +1,86 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+
+// Compares the cold start of the package entry points: the time to require them in a fresh process
+// and the modules, and their size on disk, which are loaded by that.
+//
+// Usage: npm run benchmark:entry-points [runs]
+
+import { spawnSync } from 'child_process';
+import { existsSync, statSync } from 'fs';
+import * as path from 'path';
+
+const DEFAULT_RUNS = 10;
+const ENTRY_POINTS = ['dist/index.js', 'dist/converter.js'];
+const NETWORK_PACKAGES = ['axios', 'http-status-codes'];
+
+// Runs without the ts-node hooks of this process, so only the entry point itself is measured
+const COLD_START_SCRIPT = `
+const start = process.hrtime.bigint();
+require(process.argv[1]);
+const requireMs = Number(process.hrtime.bigint() - start) / 1e6;
+process.stdout.write(JSON.stringify({ requireMs: requireMs, modules: Object.keys(require.cache) }));
+`;
+
+interface ColdStart {
+    requireMs: number;
+    modules: string[];
+}
+
+const measureColdStart = (entryPointPath: string): ColdStart => {
+    const child = spawnSync(process.execPath, ['-e', COLD_START_SCRIPT, entryPointPath], { encoding: 'utf8' });
+    if (child.status !== 0) {
+        throw new Error(`Requiring ${entryPointPath} failed: ${child.stderr}`);
+    }
+    return JSON.parse(child.stdout);
+};
+
+const median = (values: number[]): number => {
+    const sortedValues = [...values].sort((a: number, b: number) => a - b);
+    const middle = Math.floor(sortedValues.length / 2);
+    return sortedValues.length % 2 ? sortedValues[middle] : (sortedValues[middle - 1] + sortedValues[middle]) / 2;
+};
+
+const isLoaded = (modules: string[], packageName: string): boolean =>
+    modules.some((modulePath: string) => modulePath.includes(`${path.sep}node_modules${path.sep}${packageName}${path.sep}`));
+
+const main = async (): Promise<void> => {
+    const runs = Number(process.argv[2] ?? DEFAULT_RUNS);
+    const rows = ENTRY_POINTS.map((entryPoint: string) => {
+        const entryPointPath = path.resolve(__dirname, '..', entryPoint);
+        if (!existsSync(entryPointPath)) {
+            throw new Error(`${entryPoint} does not exist, run npm run build first.`);
+        }
+        const coldStarts = Array.from({ length: runs }, () => measureColdStart(entryPointPath));
+        // The loaded modules are the same in every run
+        const modules = coldStarts[0].modules;
+        const loadedBytes = modules.reduce((bytes: number, modulePath: string) => bytes + statSync(modulePath).size, 0);
+        const loadedNetworkPackages = NETWORK_PACKAGES.filter((packageName: string) => isLoaded(modules, packageName));
+        return {
+            'entry point': entryPoint,
+            'require median (ms)': Number(median(coldStarts.map((coldStart: ColdStart) => coldStart.requireMs)).toFixed(1)),
+            modules: modules.length,
+            'loaded size (kB)': Math.round(loadedBytes / 1024),
+            'network packages': loadedNetworkPackages.join(', ') || '-',
+        };
+    });
+    console.log(`Cold starts per entry point: ${runs}`);
+    console.table(rows);
+};
+
+main().catch((error) => {
+    console.error(error);
+    process.exit(1);
+});
@@ -0,0 +1,169 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+// Runs the benchmark suite and compares the results with the saved baseline.
+//
+// Usage: node --expose-gc --require ts-node/register benchmarks/run.ts [options]
+//   --sizes=10,100,1000   Sizes of the synthetic prototypes, up to 10000.
+//   --latency=50          Simulated latency of every GitHub request in milliseconds.
+//   --threshold=0.3       Allowed loss of throughput and growth of peak heap before failing.
+//   --save-baseline       Stores the results as new baseline instead of comparing them.
+
+import { existsSync, readFileSync, writeFileSync } from 'fs';
+import * as path from 'path';
+import { benchmarkConversion, ConversionBenchmarkResult } from './conversion';
+import { benchmarkEndToEnd, EndToEndBenchmarkResult } from './end-to-end';
+
+const BASELINE_PATH = path.join(__dirname, 'baseline.json');
+const DEFAULT_SIZES = [10, 100, 1000];
+const END_TO_END_SIZE = 100;
+const DEFAULT_LATENCY_MS = 50;
+const DEFAULT_THRESHOLD = 0.3;
+// The peak heap depends on when the garbage collector runs, small differences are noise
+const HEAP_TOLERANCE_MB = 10;
+
+interface BenchmarkResults {
+    node: string;
+    conversion: ConversionBenchmarkResult[];
+    endToEnd: EndToEndBenchmarkResult[];
+}
+
+interface Measurement {
+    name: string;
+    throughput: number;
+    peakHeapMb: number;
+}
+
+const parseArguments = () => {
+    const options = new Map<string, string>();
+    process.argv.slice(2).forEach((argument: string) => {
+        const [name, value] = argument.replace(/^--/, '').split('=');
+        options.set(name, value ?? 'true');
+    });
+    return {
+        sizes: options.has('sizes') ? options.get('sizes')!.split(',').map(Number) : DEFAULT_SIZES,
+        latencyMs: Number(options.get('latency') ?? DEFAULT_LATENCY_MS),
+        threshold: Number(options.get('threshold') ?? DEFAULT_THRESHOLD),
+        saveBaseline: options.has('save-baseline'),
+    };
+};
+
+const toMeasurements = (results: BenchmarkResults): Measurement[] => [
+    ...results.conversion.map((result: ConversionBenchmarkResult) => ({
+        name: `conversion of size ${result.size}`,
+        throughput: result.conversionsPerSecond,
+        peakHeapMb: result.peakHeapMb,
+    })),
+    ...results.endToEnd.map((result: EndToEndBenchmarkResult) => ({
+        name: `runWithPayload of size ${result.size} with ${result.latencyMs} ms latency`,
+        throughput: result.runsPerSecond,
+        peakHeapMb: result.peakHeapMb,
+    })),
+];
+
+/**
+ * @return {string[]} Description of every measurement which got worse than the threshold allows.
+ */
+const findRegressions = (results: BenchmarkResults, baseline: BenchmarkResults, threshold: number): string[] => {
+    const baselineMeasurements = new Map(toMeasurements(baseline).map((measurement: Measurement) => [measurement.name, measurement]));
+    const regressions: string[] = [];
+    toMeasurements(results).forEach((measurement: Measurement) => {
+        const baselineMeasurement = baselineMeasurements.get(measurement.name);
+        if (!baselineMeasurement) {
+            return;
+        }
+        const { throughput, peakHeapMb } = baselineMeasurement;
+        if (measurement.throughput < throughput * (1 - threshold)) {
+            regressions.push(`${measurement.name}: throughput ${measurement.throughput.toFixed(2)}/s, baseline ${throughput.toFixed(2)}/s`);
+        }
+        if (measurement.peakHeapMb > peakHeapMb * (1 + threshold) + HEAP_TOLERANCE_MB) {
+            regressions.push(
+                `${measurement.name}: peak heap ${measurement.peakHeapMb.toFixed(1)} MB, baseline ${peakHeapMb.toFixed(1)} MB`
+            );
+        }
+    });
+    return regressions;
+};
+
+const printResults = (results: BenchmarkResults): void => {
+    console.table(
+        results.conversion.map((result: ConversionBenchmarkResult) => ({
+            size: result.size,
+            lines: result.lines,
+            'conversions/s': Number(result.conversionsPerSecond.toFixed(2)),
+            'peak heap (MB)': Number(result.peakHeapMb.toFixed(1)),
+        }))
+    );
+    console.log('Average milliseconds per conversion:');
+    console.table(
+        results.conversion.reduce((table: Record<string, Record<string, number>>, result: ConversionBenchmarkResult) => {
+            const durationsMs: Record<string, number> = { ...result.stepMs, ...result.phaseMs };
+            Object.keys(durationsMs).forEach((name: string) => {
+                table[name] = { ...table[name], [`size ${result.size}`]: Number(durationsMs[name].toFixed(3)) };
+            });
+            return table;
+        }, {})
+    );
+    console.table(
+        results.endToEnd.map((result: EndToEndBenchmarkResult) => ({
+            size: result.size,
+            'latency (ms)': result.latencyMs,
+            'requests/run': result.requestsPerRun,
+            'median (ms)': Math.round(result.medianMs),
+            'runs/s': Number(result.runsPerSecond.toFixed(2)),
+            'peak heap (MB)': Number(result.peakHeapMb.toFixed(1)),
+        }))
+    );
+    results.endToEnd.forEach((result: EndToEndBenchmarkResult) => {
+        console.log(`Mean milliseconds per request and wait of runWithPayload of size ${result.size}:`);
+        const operations = Object.keys(result.operationMs).map((name: string) => ({
+            operation: name,
+            'mean (ms)': Number(result.operationMs[name].toFixed(1)),
+        }));
+        console.table(operations);
+    });
+};
+
+const main = async (): Promise<void> => {
+    const options = parseArguments();
+    const results: BenchmarkResults = { node: process.version, conversion: [], endToEnd: [] };
+    for (const size of options.sizes) {
+        results.conversion.push(benchmarkConversion(size));
+    }
+    const templateMainPy = readFileSync(path.join(__dirname, '../src/tests/files/velocitas_template_main.py'), 'utf8');
+    results.endToEnd.push(await benchmarkEndToEnd(templateMainPy, END_TO_END_SIZE, options.latencyMs));
+    printResults(results);
+
+    if (options.saveBaseline) {
+        writeFileSync(BASELINE_PATH, `${JSON.stringify(results, null, 4)}\n`);
+        console.log(`Saved baseline to ${BASELINE_PATH}.`);
+        return;
+    }
+    if (!existsSync(BASELINE_PATH)) {
+        console.log('No baseline found, run with --save-baseline to create one.');
+        return;
+    }
+    const regressions = findRegressions(results, JSON.parse(readFileSync(BASELINE_PATH, 'utf8')), options.threshold);
+    if (regressions.length > 0) {
+        console.error(`Performance regressions of more than ${options.threshold * 100} %:\n${regressions.join('\n')}`);
+        process.exitCode = 1;
+    } else {
+        console.log('No performance regressions compared to the baseline.');
+    }
+};
+
+main().catch((error) => {
+    console.error(error);
+    process.exit(1);
+});
@@ -0,0 +1,114 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+const VEHICLE_SIGNALS = [
+    'Vehicle.Speed',
+    'Vehicle.Cabin.Seat.Row1.Pos1.Position',
+    'Vehicle.Cabin.Sunroof.Switch',
+    'Vehicle.Body.Windshield.Front.Wiping.System.ActualPosition',
+    'Vehicle.Body.Windshield.Front.Wiping.System.TargetPosition',
+    'Vehicle.Body.Lights.Beam.Low.IsOn',
+    'Vehicle.Powertrain.TractionBattery.StateOfCharge.Current',
+    'Vehicle.Cabin.HVAC.Station.Row1.Left.Temperature',
+];
+
+/**
+ * Number of each construct in a synthetic prototype.
+ * @type PrototypeShape
+ * @prop {number} functions Callback functions, each using vehicle signals.
+ * @prop {number} subscriptions Subscriptions of the callback functions to vehicle signals.
+ * @prop {number} classes Helper classes with a constructor and a method.
+ * @prop {number} variables Global variables used by the callback functions.
+ */
+export interface PrototypeShape {
+    functions: number;
+    subscriptions: number;
+    classes: number;
+    variables: number;
+}
+
+/**
+ * Deterministic pseudo random numbers in [0, 1), the same seed always yields the same sequence.
+ * @param {number} seed
+ * @return {() => number}
+ */
+export const createRandom = (seed: number) => () => {
+    seed = (seed + 0x6d2b79f5) | 0;
+    let value = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    value = (value + Math.imul(value ^ (value >>> 7), 61 | value)) ^ value;
+    return ((value ^ (value >>> 14)) >>> 0) / 4294967296;
+};
+
+/**
+ * Shape with `size` functions, subscriptions and variables.
+ * Classes grow slower, the converter copies every class once per following class.
+ * @param {number} size
+ * @return {PrototypeShape}
+ */
+export const scaledShape = (size: number): PrototypeShape => ({
+    functions: size,
+    subscriptions: size,
+    classes: Math.max(1, Math.round(size / 100)),
+    variables: size,
+});
+
+/**
+ * Creates a digital.auto prototype in the style of the playground examples.
+ * @param {PrototypeShape} shape
+ * @param {number} seed
+ * @return {string} Decoded code snippet.
+ */
+export const createSyntheticPrototype = (shape: PrototypeShape, seed: number = 1): string => {
+    const random = createRandom(seed);
+    const pick = <T>(values: T[]): T => values[Math.floor(random() * values.length)];
+    const lines = ['from sdv_model import Vehicle', 'import plugins', 'from browser import aio', '', 'vehicle = Vehicle()', ''];
+
+    for (let index = 0; index < shape.variables; index++) {
+        lines.push(`threshold_${index} = ${Math.floor(random() * 1000)}`);
+    }
+    for (let index = 0; index < shape.classes; index++) {
+        lines.push(
+            '',
+            `class Helper${index}:`,
+            '    def __init__(self):',
+            `        self.factor = ${Math.floor(random() * 100)}`,
+            '',
+            '    def scale(self, value):',
+            '        return value * self.factor',
+            ''
+        );
+    }
+    for (let index = 0; index < shape.functions; index++) {
+        const variableIndex = shape.variables > 0 ? index % shape.variables : -1;
+        const threshold = variableIndex >= 0 ? `threshold_${variableIndex}` : `${Math.floor(random() * 1000)}`;
+        lines.push(
+            '',
+            `async def on_signal_${index}_changed(value):`,
+            `    print(f"Signal ${index} changed to {value}")`,
+            `    if value > ${threshold}:`,
+            `        current = await vehicle.${pick(VEHICLE_SIGNALS).slice('Vehicle.'.length)}.get()`,
+            `        await vehicle.${pick(VEHICLE_SIGNALS).slice('Vehicle.'.length)}.set(current)`,
+            '    else:',
+            `        print("Signal ${index} below threshold")`,
+            ''
+        );
+    }
+    lines.push('');
+    for (let index = 0; index < shape.subscriptions; index++) {
+        const callback = shape.functions > 0 ? `on_signal_${index % shape.functions}_changed` : 'print';
+        lines.push(`await vehicle.${pick(VEHICLE_SIGNALS).slice('Vehicle.'.length)}.subscribe(${callback})`);
+    }
+    lines.push('', 'await aio.sleep(1)', 'print("Prototype finished")');
+    return lines.join('\n');
+};
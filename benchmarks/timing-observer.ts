@@ -0,0 +1,50 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { InstrumentationEvent, InstrumentationObserver } from '../src/instrumentation';
+
+/**
+ * Accumulates the durations of instrumentation events by name and samples the heap whenever one ends.
+ */
+export class TimingObserver implements InstrumentationObserver {
+    readonly durations = new Map<string, number>();
+    private peakHeapUsed = 0;
+
+    public onEnd(event: InstrumentationEvent): void {
+        this.durations.set(event.name, (this.durations.get(event.name) ?? 0) + (event.durationMs ?? 0));
+        this.peakHeapUsed = Math.max(this.peakHeapUsed, process.memoryUsage().heapUsed);
+    }
+
+    /**
+     * Largest heap usage seen at the end of an event since the last reset.
+     * @return {number} Bytes.
+     */
+    get peakHeap(): number {
+        return this.peakHeapUsed;
+    }
+
+    public reset(): void {
+        this.durations.clear();
+        this.peakHeapUsed = 0;
+    }
+}
+
+/**
+ * Runs the garbage collector if node was started with `--expose-gc`, so heap measurements start from a clean state.
+ */
+export const collectGarbage = (): void => {
+    if (global.gc) {
+        global.gc();
+    }
+};
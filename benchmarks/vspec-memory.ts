@@ -0,0 +1,128 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+// Compares the peak memory of formatting a large vspec payload at once and in chunks.
+//
+// Usage: node --require ts-node/register benchmarks/vspec-memory.ts [sizeInMegabytes]
+
+import { spawnSync } from 'child_process';
+import { createHash } from 'crypto';
+import { mkdtempSync, readFileSync, rmSync, writeFileSync } from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { decode, encode } from '../src/utils/helpers';
+import { createEncodedVspecJsonStream } from '../src/utils/vspecStream';
+import { createRandom } from './synthetic-prototype';
+
+const DEFAULT_SIZE_MB = 50;
+const DATATYPES = ['boolean', 'float', 'int8', 'uint16', 'string', 'double'];
+
+type Mode = 'buffered' | 'streaming';
+
+interface MeasurementResult {
+    mode: Mode;
+    durationMs: number;
+    peakMemoryMb: number;
+    outputSha256: string;
+}
+
+const createSyntheticVspecJson = (sizeInBytes: number): string => {
+    const random = createRandom(42);
+    const parts: string[] = ['{"Vehicle":{"type":"branch","description":"High-level vehicle data.","children":{'];
+    let length = parts[0].length;
+    for (let branchIndex = 0; length < sizeInBytes; branchIndex++) {
+        const signals: string[] = [];
+        for (let signalIndex = 0; signalIndex < 50; signalIndex++) {
+            const uuid = createHash('md5').update(`${branchIndex}.${signalIndex}`).digest('hex');
+            const datatype = DATATYPES[Math.floor(random() * DATATYPES.length)];
+            const signal = {
+                datatype: datatype,
+                type: random() < 0.5 ? 'sensor' : 'actuator',
+                description: `Synthetic signal ${signalIndex} of branch ${branchIndex} – value ${random().toFixed(6)}.`,
+                min: Math.floor(random() * -1000),
+                max: random() * 1e6,
+                unit: 'km/h',
+                uuid: uuid,
+            };
+            signals.push(`"Signal${signalIndex}":${JSON.stringify(signal)}`);
+        }
+        const branch = `${branchIndex > 0 ? ',' : ''}"Branch${branchIndex}":{"type":"branch","children":{${signals.join(',')}}}`;
+        parts.push(branch);
+        length += branch.length;
+    }
+    parts.push('}}}');
+    return parts.join('');
+};
+
+const measure = async (mode: Mode, payloadPath: string): Promise<MeasurementResult> => {
+    const vspecPayload = readFileSync(payloadPath, 'utf8');
+    const baselineMemory = process.memoryUsage().rss;
+    const hash = createHash('sha256');
+    const start = process.hrtime.bigint();
+    if (mode === 'buffered') {
+        hash.update(encode(`${JSON.stringify(JSON.parse(decode(vspecPayload)), null, 4)}\n`));
+    } else {
+        for await (const chunk of createEncodedVspecJsonStream(vspecPayload)) {
+            hash.update(chunk);
+        }
+    }
+    const durationMs = Number(process.hrtime.bigint() - start) / 1e6;
+    // maxRSS is reported in kilobytes
+    const peakMemory = process.resourceUsage().maxRSS * 1024 - baselineMemory;
+    return { mode: mode, durationMs: durationMs, peakMemoryMb: peakMemory / 1024 / 1024, outputSha256: hash.digest('hex') };
+};
+
+const runIsolated = (mode: Mode, payloadPath: string): MeasurementResult => {
+    // Every mode runs in its own process, otherwise the peak memory of one mode hides the other
+    const child = spawnSync(process.execPath, [...process.execArgv, __filename, '--measure', mode, payloadPath], { encoding: 'utf8' });
+    if (child.status !== 0) {
+        throw new Error(`Measuring ${mode} failed: ${child.stderr}`);
+    }
+    return JSON.parse(child.stdout);
+};
+
+const main = async (): Promise<void> => {
+    const [firstArgument, mode, payloadPath] = process.argv.slice(2);
+    if (firstArgument === '--measure') {
+        process.stdout.write(JSON.stringify(await measure(mode as Mode, payloadPath)));
+        return;
+    }
+
+    const sizeInMegabytes = Number(firstArgument ?? DEFAULT_SIZE_MB);
+    const temporaryDirectory = mkdtempSync(path.join(os.tmpdir(), 'vspec-memory-'));
+    const vspecPayloadPath = path.join(temporaryDirectory, 'vspec.base64');
+    try {
+        writeFileSync(vspecPayloadPath, encode(createSyntheticVspecJson(sizeInMegabytes * 1024 * 1024)));
+        console.log(`Synthetic vspec: ${sizeInMegabytes} MB`);
+        const results = (['buffered', 'streaming'] as Mode[]).map((measuredMode: Mode) => runIsolated(measuredMode, vspecPayloadPath));
+        console.table(
+            results.map((result: MeasurementResult) => ({
+                mode: result.mode,
+                'duration (ms)': Math.round(result.durationMs),
+                'peak memory (MB)': Math.round(result.peakMemoryMb),
+            }))
+        );
+        if (results[0].outputSha256 !== results[1].outputSha256) {
+            throw new Error('Buffered and streamed vspec.json differ.');
+        }
+        console.log(`Both modes produce the same vspec.json (sha256 ${results[0].outputSha256}).`);
+    } finally {
+        rmSync(temporaryDirectory, { recursive: true, force: true });
+    }
+};
+
+main().catch((error) => {
+    console.error(error);
+    process.exit(1);
+});
@@ -17,17 +17,30 @@ import { ExtractClassesStep } from './pipeline/extract-classes';
 import { ExtractImportsStep } from './pipeline/extract-imports';
 import { ExtractMethodsStep } from './pipeline/extract-methods';
 import { ExtractVariablesStep } from './pipeline/extract-variables';
-import { IPipelineStep } from './pipeline/pipeline-base';
+import { PipelineScheduler } from './pipeline/pipeline-scheduler';
 import { PrepareCodeSnippetStep } from './pipeline/prepare-code-snippet';
+import { parseMainPyTemplate, PreparedTemplate } from './prepared-template';
+import { Instrumentation, InstrumentationObserver, NOOP_INSTRUMENTATION } from './instrumentation';
+import { ConversionCache } from './conversion-cache';
 
 import { DIGITAL_AUTO, PYTHON, VELOCITAS } from './utils/codeConstants';
 import { REGEX } from './utils/regex';
+import {
+    FINALIZE_LINE_RULES,
+    FINALIZE_RULES,
+    MAIN_PY_RULES,
+    RewriteRule,
+    RewriteRuleSet,
+    VELOCITAS_STRUCTURE_RULES,
+} from './utils/rewriteRules';
+import { CodeLineIndex } from './utils/lineIndex';
 import {
     createArrayFromMultilineString,
-    createMultilineStringFromArray,
     indentCodeSnippet,
     insertClassDocString,
     removeEmptyLines,
+    removeMultilineStrings,
+    trimLines,
 } from './utils/helpers';
 
 export class CodeContext {
@@ -35,13 +48,30 @@ export class CodeContext {
     basicImportsArray: string[] = [];
     variablesArray: string[][] = [];
     variableNames: string[] = [];
-    memberVariables: string = '';
+    memberVariables: string[] = [''];
     seperateClassesArray: string[][] = [];
-    seperateClasses: string = '';
+    seperateClasses: string[] = [''];
     seperateMethodsArray: string[][] = [];
-    seperateMethods: string = '';
+    seperateMethods: string[] = [''];
     codeSnippetStringArray: string[] = [];
-    codeSnippetForTemplate: string = '';
+    codeSnippetForTemplate: string[] = [];
+    rewriteRules: RewriteRuleSet = VELOCITAS_STRUCTURE_RULES;
+    private codeSnippetLineIndex: CodeLineIndex | undefined;
+
+    /**
+     * Index of the current `codeSnippetStringArray`, rebuilt lazily after lines were added or removed.
+     * @return {CodeLineIndex}
+     */
+    get codeSnippetIndex(): CodeLineIndex {
+        if (!this.codeSnippetLineIndex || this.codeSnippetLineIndex.lines !== this.codeSnippetStringArray) {
+            this.codeSnippetLineIndex = new CodeLineIndex(this.codeSnippetStringArray);
+        }
+        return this.codeSnippetLineIndex;
+    }
+
+    public invalidateCodeSnippetIndex(): void {
+        this.codeSnippetLineIndex = undefined;
+    }
 }
 
 /**
@@ -56,6 +86,54 @@ export interface CodeConversionResult {
     dataPoints: any[];
 }
 
+/**
+ * Single digital.auto prototype to be converted by `CodeConverter.convertMany`.
+ * @type ConversionInput
+ * @prop {string} codeSnippet Decoded playground code snippet.
+ * @prop {string} appName Name of the VehicleApp.
+ */
+export interface ConversionInput {
+    codeSnippet: string;
+    appName: string;
+}
+
+/**
+ * Outcome of a single conversion within a batch, either `result` or `error` is set.
+ * @type BatchConversionResult
+ * @prop {string} appName Name of the VehicleApp.
+ * @prop {CodeConversionResult} result Result of the code conversion.
+ * @prop {{ name: string; message: string }} error Error which occured during the code conversion.
+ */
+export interface BatchConversionResult {
+    appName: string;
+    result?: CodeConversionResult;
+    error?: { name: string; message: string };
+}
+
+/**
+ * @type BatchConversionOptions
+ * @prop {number} workerCount Number of worker threads, defaults to the number of CPUs.
+ */
+export interface BatchConversionOptions {
+    workerCount?: number;
+}
+
+/**
+ * @type CodeConverterOptions
+ * @prop {InstrumentationObserver} observer Receives the timing of every conversion phase and pipeline step.
+ * @prop {ConversionCache} cache Returns results of repeated conversions without running the pipeline.
+ * @prop {RewriteRule[]} rewriteRules Additional digital.auto to Velocitas rewrites of the code blocks,
+ * taking precedence over the built-in ones. Conversions with function replacements are neither cached nor reused.
+ * @prop {boolean} reuseStepResults Reuses the outputs of pipeline steps from earlier conversions of the process,
+ * if the inputs of a step did not change, e.g. for the same code snippet with another app name.
+ */
+export interface CodeConverterOptions {
+    observer?: InstrumentationObserver;
+    cache?: ConversionCache;
+    rewriteRules?: RewriteRule[];
+    reuseStepResults?: boolean;
+}
+
 /**
  * Initialize a new `CodeConverter`.
  *
@@ -64,53 +142,134 @@ export interface CodeConversionResult {
  */
 export class CodeConverter {
     private codeContext: CodeContext = new CodeContext();
+    private instrumentation: Instrumentation;
+    private cache?: ConversionCache;
+    private rewriteRules: RewriteRuleSet = VELOCITAS_STRUCTURE_RULES;
+    private pipeline: PipelineScheduler;
+
+    /**
+     * @param {CodeConverterOptions} options
+     */
+    constructor(options: CodeConverterOptions = {}) {
+        this.instrumentation = options.observer ? new Instrumentation(options.observer) : NOOP_INSTRUMENTATION;
+        this.cache = options.cache;
+        this.pipeline = new PipelineScheduler(
+            [
+                new PrepareCodeSnippetStep(),
+                new ExtractImportsStep(),
+                new ExtractVariablesStep(),
+                new ExtractClassesStep(),
+                new ExtractMethodsStep(),
+                new CreateCodeSnippetForTemplateStep(),
+            ],
+            ['codeSnippetStringArray', 'rewriteRules'],
+            options.reuseStepResults
+        );
+        if (options.rewriteRules && options.rewriteRules.length > 0) {
+            this.rewriteRules = new RewriteRuleSet([...options.rewriteRules, ...VELOCITAS_STRUCTURE_RULES.rules]);
+        }
+    }
+
+    /**
+     * Converts many digital.auto prototypes against the same template main.py on a pool of worker threads.
+     * @param {string} mainPyContentData Decoded template main.py, prepared once for the whole batch.
+     * @param {Iterable<ConversionInput> | AsyncIterable<ConversionInput>} inputs Code snippets with their app names.
+     * @param {BatchConversionOptions} options
+     * @return {Promise<BatchConversionResult[]>} Results in input order, failed conversions carry their error.
+     * @public
+     */
+    public static async convertMany(
+        mainPyContentData: string,
+        inputs: Iterable<ConversionInput> | AsyncIterable<ConversionInput>,
+        options: BatchConversionOptions = {}
+    ): Promise<BatchConversionResult[]> {
+        // Loaded lazily to keep worker_threads out of the plain converter
+        const { ConversionPool } = await import('./conversion-pool');
+        const conversionPool = new ConversionPool(mainPyContentData, options.workerCount);
+        try {
+            return await conversionPool.convertAll(inputs);
+        } finally {
+            await conversionPool.terminate();
+        }
+    }
 
     /**
      * Converts main.py from digital.auto to velocitas structure.
-     * @param {string} mainPyContentData
+     * @param {string | PreparedTemplate} mainPyContentData Template main.py or a template prepared from it.
      * @param {string} codeSnippet
      * @param {string} appName
      * @return {CodeConversionResult} Result of code conversion.
      * @public
      */
-    public convertMainPy(mainPyContentData: string, codeSnippet: string, appName: string): CodeConversionResult {
+    public convertMainPy(mainPyContentData: string | PreparedTemplate, codeSnippet: string, appName: string): CodeConversionResult {
+        const conversionSpan = this.instrumentation.start('conversion', 'convertMainPy', {
+            appName: appName,
+            snippetLength: codeSnippet?.length,
+        });
+        let cacheKey: string | undefined;
+        const rewriteRulesKey = this.rewriteRules === VELOCITAS_STRUCTURE_RULES ? undefined : this.rewriteRules.signature;
+        // Custom rules with function replacements can not be identified, their results are not cached
+        if (this.cache && (this.rewriteRules === VELOCITAS_STRUCTURE_RULES || rewriteRulesKey !== undefined)) {
+            const templateContent = typeof mainPyContentData === 'string' ? mainPyContentData : mainPyContentData.content;
+            cacheKey = ConversionCache.createKey(templateContent, codeSnippet, appName, rewriteRulesKey);
+            const cachedResult = this.cache.get(cacheKey);
+            if (cachedResult) {
+                conversionSpan.end({ cacheHit: true, mainPyLength: cachedResult.finalizedMainPy.length });
+                return cachedResult;
+            }
+        }
         try {
+            this.codeContext = new CodeContext();
             this.codeContext.appName = appName;
-            this.adaptCodeSnippet(codeSnippet);
-            const extractedMainPyStructure = this.extractMainPyBaseStructure(mainPyContentData);
-            const convertedMainPy = this.addCodeSnippetToMainPy(extractedMainPyStructure);
-            const finalizedMainPy = this.finalizeMainPy(convertedMainPy);
-            const dataPoints = this.identifyDatapoints(finalizedMainPy);
-            return { finalizedMainPy: finalizedMainPy, dataPoints: dataPoints };
+            this.codeContext.rewriteRules = this.rewriteRules;
+            this.measurePhase('adaptCodeSnippet', () => this.adaptCodeSnippet(codeSnippet));
+            const extractedMainPyStructure = this.measurePhase('extractMainPyBaseStructure', () =>
+                this.extractMainPyBaseStructure(mainPyContentData)
+            );
+            const convertedMainPy = this.measurePhase('addCodeSnippetToMainPy', () =>
+                this.addCodeSnippetToMainPy(extractedMainPyStructure)
+            );
+            const finalizedMainPyArray = this.measurePhase('finalizeMainPy', () => this.finalizeMainPy(convertedMainPy));
+            const dataPoints = this.measurePhase('identifyDatapoints', () => this.identifyDatapoints(finalizedMainPyArray));
+            const finalizedMainPy = finalizedMainPyArray.join('\n');
+            const conversionResult = { finalizedMainPy: finalizedMainPy, dataPoints: dataPoints };
+            if (cacheKey) {
+                this.cache?.set(cacheKey, conversionResult);
+            }
+            conversionSpan.end({ cacheHit: false, mainPyLength: finalizedMainPy.length, dataPoints: dataPoints.length });
+            return conversionResult;
         } catch (error) {
+            conversionSpan.end(undefined, error);
             throw error;
         }
     }
 
+    private measurePhase<T>(phase: string, operation: () => T): T {
+        return this.instrumentation.measure('conversion', phase, {}, operation);
+    }
+
     private adaptCodeSnippet(codeSnippet: string): void {
         this.codeContext.codeSnippetStringArray = createArrayFromMultilineString(codeSnippet);
-
-        const pipeline = new Array<IPipelineStep>();
-
-        pipeline.push(new PrepareCodeSnippetStep());
-        pipeline.push(new ExtractImportsStep());
-        pipeline.push(new ExtractVariablesStep());
-        pipeline.push(new ExtractClassesStep());
-        pipeline.push(new ExtractMethodsStep());
-        pipeline.push(new CreateCodeSnippetForTemplateStep());
-
-        pipeline.forEach((pipelineStep) => pipelineStep.execute(this.codeContext));
+        this.pipeline.run(this.codeContext, this.instrumentation);
     }
 
-    private extractMainPyBaseStructure(mainPyContentData: string): string {
+    private extractMainPyBaseStructure(mainPyContentData: string | PreparedTemplate): string[] {
         try {
-            let tempContent: string | string[];
-            tempContent = createArrayFromMultilineString(mainPyContentData);
-            tempContent = tempContent.filter((line) => !line.includes(` ${PYTHON.COMMENT} `) || line.includes(VELOCITAS.TYPE_IGNORE));
-            tempContent = tempContent.filter((line) => !line.includes(VELOCITAS.PREDEFINED_TOPIC));
+            const methodsArray = [...this.codeContext.seperateMethods];
+            if (methodsArray.length > 1) {
+                methodsArray.unshift('');
+                methodsArray.push('');
+            }
+            if (typeof mainPyContentData !== 'string') {
+                const mainPyBaseStructure = mainPyContentData.assemble(this.codeContext.seperateClasses, methodsArray);
+                if (mainPyBaseStructure) {
+                    return mainPyBaseStructure;
+                }
+            }
+            let tempContent = typeof mainPyContentData === 'string' ? parseMainPyTemplate(mainPyContentData) : [...mainPyContentData.lines];
 
-            const classesArray = createArrayFromMultilineString(this.codeContext.seperateClasses);
-            const velocitasClassStartIndex = tempContent.indexOf('class SampleApp(VehicleApp):');
+            const classesArray = this.codeContext.seperateClasses;
+            const velocitasClassStartIndex = tempContent.indexOf(VELOCITAS.SAMPLE_APP_CLASS);
             if (classesArray.length > 0) {
                 tempContent.splice(velocitasClassStartIndex - 1, 0, ...classesArray);
             }
@@ -118,15 +277,9 @@ export class CodeConverter {
             const topPartOfTemplate = tempContent.slice(0, velocitasOnStartIndex + 1);
             const velocitasMainIndex = tempContent.indexOf(VELOCITAS.MAIN_METHOD);
             const bottomPartOfTemplate = tempContent.slice(velocitasMainIndex - 1, tempContent.length);
-            const methodsArray = createArrayFromMultilineString(this.codeContext.seperateMethods);
-            if (methodsArray.length > 1) {
-                methodsArray.unshift('');
-                methodsArray.push('');
-            }
             tempContent = topPartOfTemplate.concat(methodsArray).concat(bottomPartOfTemplate);
-            tempContent = createMultilineStringFromArray(tempContent);
 
-            const mainPyBaseStructure = tempContent.replace(REGEX.EVERYTHING_BETWEEN_MULTILINE, '');
+            const mainPyBaseStructure = removeMultilineStrings(trimLines(tempContent));
 
             return mainPyBaseStructure;
         } catch (error) {
@@ -134,71 +287,46 @@ export class CodeConverter {
         }
     }
 
-    private addCodeSnippetToMainPy(extractedMainPyStructure: string): string {
+    private addCodeSnippetToMainPy(extractedMainPyStructure: string[]): string[] {
         const appNameForTemplate = `${this.codeContext.appName.charAt(0).toUpperCase()}${this.codeContext.appName.slice(1)}${
             VELOCITAS.VEHICLE_APP_SUFFIX
         }`;
         try {
-            const newMainPy = extractedMainPyStructure
-                .replace(REGEX.FIND_BEGIN_OF_ON_START_METHOD, `${this.codeContext.codeSnippetForTemplate}\n`)
-                .replace(REGEX.FIND_VEHICLE_INIT, `self.Vehicle = vehicle_client\n${this.codeContext.memberVariables}`)
-                .replace(VELOCITAS.IMPORT_SUBSCRIBE_TOPIC, '')
-                .replace(REGEX.FIND_SAMPLE_APP, appNameForTemplate);
-            return newMainPy;
+            return MAIN_PY_RULES.applyToLines(extractedMainPyStructure, {
+                codeSnippet: this.codeContext.codeSnippetForTemplate,
+                memberVariables: this.codeContext.memberVariables,
+                appClassName: appNameForTemplate,
+            });
         } catch (error) {
             throw new Error('Error in addCodeSnippetToMainPy.');
         }
     }
 
-    private finalizeMainPy(newMainPy: string): string {
-        let finalCode: string | string[] = createArrayFromMultilineString(newMainPy);
-        this.adaptToMqtt(finalCode);
-        const firstLineOfImport = finalCode.find((element: string) => element.includes(PYTHON.IMPORT));
-        (finalCode as string[]).splice(finalCode.indexOf(firstLineOfImport as string), 0, '# flake8: noqa: E501,B950 line too long');
-
-        this.codeContext.basicImportsArray?.forEach((basicImportString: string) => {
-            if (basicImportString != DIGITAL_AUTO.IMPORT_PLUGINS) {
-                (finalCode as string[]).splice(finalCode.indexOf(firstLineOfImport as string), 0, basicImportString);
-            }
-        });
-        finalCode = createMultilineStringFromArray(finalCode);
-        finalCode = finalCode
-            .replace(REGEX.FIND_SUBSCRIBE_METHOD_CALL, VELOCITAS.SUBSCRIPTION_SIGNATURE)
-            .replace(/await await/gm, `${PYTHON.AWAIT}`)
-            .replace(/\.get\(\)/gm, `${VELOCITAS.GET_VALUE}`)
-            .replace(REGEX.GET_EVERY_PLUGINS_USAGE, '')
-            .replace(/await aio/gm, VELOCITAS.ASYNCIO);
+    private finalizeMainPy(newMainPy: string[]): string[] {
+        let finalCode = this.adaptToMqtt(newMainPy);
+        const firstLineOfImportIndex = finalCode.findIndex((element: string) => element.includes(PYTHON.IMPORT));
+        const importsToAdd = this.codeContext.basicImportsArray.filter(
+            (basicImportString: string) => basicImportString != DIGITAL_AUTO.IMPORT_PLUGINS
+        );
+        finalCode.splice(firstLineOfImportIndex, 0, '# flake8: noqa: E501,B950 line too long', ...importsToAdd);
 
-        finalCode = createArrayFromMultilineString(finalCode);
-        finalCode = removeEmptyLines(finalCode);
-        finalCode.forEach((codeLine: string, index) => {
-            if (codeLine.includes(VELOCITAS.GET_VALUE)) {
-                (finalCode as string[])[index] = codeLine.replace(/await/, '(await').replace(/{await/, '{(await');
-            }
-            if (codeLine.includes(VELOCITAS.INFO_LOGGER_SIGNATURE) && codeLine.includes('",')) {
-                (finalCode as string[])[index] = codeLine.replace('",', ': %s",');
-            }
-            if (codeLine.includes('.set(')) {
-                const setArgument = codeLine.split('(')[1];
-                if (setArgument.startsWith('self.Vehicle')) {
-                    const vehicleClassEnumProperty = setArgument.split(')')[0];
-                    const identifiedEnumString = vehicleClassEnumProperty.split('.').at(-1);
-                    (finalCode as string[])[index] = codeLine.replace(vehicleClassEnumProperty, `"${identifiedEnumString}"`);
-                }
-            }
-        });
+        finalCode = finalCode.map((codeLine: string) => FINALIZE_RULES.apply(codeLine));
+        finalCode = removeEmptyLines(trimLines(finalCode)).map((codeLine: string) => FINALIZE_LINE_RULES.apply(codeLine));
         if (!finalCode.some((line: string) => line.includes(VELOCITAS.CLASS_METHOD_SIGNATURE))) {
-            (finalCode as string[]).splice(finalCode.indexOf(VELOCITAS.IMPORT_DATAPOINT_REPLY), 1);
+            finalCode.splice(finalCode.indexOf(VELOCITAS.IMPORT_DATAPOINT_REPLY), 1);
         }
         insertClassDocString(finalCode, this.codeContext.appName);
-        const convertedFinalCode = createMultilineStringFromArray(finalCode);
 
-        return convertedFinalCode;
+        return trimLines(finalCode);
     }
 
-    private adaptToMqtt(mainPyStringArray: string[]) {
-        const setTextLines = mainPyStringArray.filter((line) => line.includes(DIGITAL_AUTO.NOTIFY) || line.includes(DIGITAL_AUTO.SET_TEXT));
-        for (const setTextLine of setTextLines) {
+    private adaptToMqtt(mainPyStringArray: string[]): string[] {
+        const adaptedMainPyStringArray: string[] = [];
+        for (const setTextLine of mainPyStringArray) {
+            if (!setTextLine.includes(DIGITAL_AUTO.NOTIFY) && !setTextLine.includes(DIGITAL_AUTO.SET_TEXT)) {
+                adaptedMainPyStringArray.push(setTextLine);
+                continue;
+            }
             let mqttTopic;
             if (setTextLine.includes(DIGITAL_AUTO.NOTIFY)) {
                 mqttTopic = setTextLine.split('.')[1].split('(')[0].trim();
@@ -210,9 +338,9 @@ export class CodeConverter {
             const spacesBeforeSetTextLine = new RegExp(`\\s(?=[^,]*${mqttTopic})`, 'g');
             const spaceCountBeforeSetTextLine = setTextLine.length - setTextLine.replace(spacesBeforeSetTextLine, '').length;
             const newMqttPublishLine = indentCodeSnippet(mqttPublishLine, spaceCountBeforeSetTextLine);
-            mainPyStringArray[mainPyStringArray.indexOf(setTextLine)] = newMqttPublishLine;
+            adaptedMainPyStringArray.push(...createArrayFromMultilineString(newMqttPublishLine));
         }
-        return mainPyStringArray;
+        return adaptedMainPyStringArray;
     }
 
     private generateMqttPublishString(mqttMessage: string, mqttTopic: string) {
@@ -230,15 +358,12 @@ export class CodeConverter {
         return mqttPublishString;
     }
 
-    private identifyDatapoints(finalizedMainPy: string): any[] {
-        const finalizedMainPyArray = createArrayFromMultilineString(finalizedMainPy);
+    private identifyDatapoints(finalizedMainPyArray: string[]): any[] {
         const dataPointsMap = new Map();
         const dataPoints: any[] = [];
         finalizedMainPyArray.forEach((line: string) => {
             if (line.includes('.Vehicle.')) {
-                const captureAlternatives = '\\.subscribe|\\.get|\\.set|\\)';
-                const dataPointRegExp = new RegExp(`Vehicle.*?(${captureAlternatives})`);
-                const dataPointMatch = dataPointRegExp.exec(line);
+                const dataPointMatch = REGEX.FIND_DATAPOINT_ACCESS.exec(line);
                 if (dataPointMatch) {
                     const dataPointPath = dataPointMatch[0].split(dataPointMatch[1])[0];
                     switch (dataPointMatch[1]) {
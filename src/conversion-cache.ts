@@ -0,0 +1,168 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { createHash } from 'crypto';
+import { mkdirSync, readFileSync, renameSync, writeFileSync } from 'fs';
+import * as path from 'path';
+import { CodeConversionResult } from './code-converter';
+import { CONVERSION_CACHE, CONVERTER_VERSION } from './utils/constants';
+import { LruCache } from './utils/lruCache';
+
+/**
+ * @type ConversionCacheOptions
+ * @prop {number} maxEntries Maximum number of results kept in memory.
+ * @prop {number} maxBytes Maximum estimated size of all results kept in memory.
+ * @prop {string} directory Directory of the file tier, results are only kept in memory if not given.
+ */
+export interface ConversionCacheOptions {
+    maxEntries?: number;
+    maxBytes?: number;
+    directory?: string;
+}
+
+// Strings are stored with two bytes per character
+const estimateBytes = (result: CodeConversionResult): number =>
+    2 * (result.finalizedMainPy.length + JSON.stringify(result.dataPoints).length);
+
+const isConversionResult = (value: any): value is CodeConversionResult =>
+    typeof value?.finalizedMainPy === 'string' && Array.isArray(value?.dataPoints);
+
+const copyResult = (result: CodeConversionResult): CodeConversionResult => ({
+    finalizedMainPy: result.finalizedMainPy,
+    dataPoints: result.dataPoints.map((dataPoint: any) => ({ ...dataPoint })),
+});
+
+/**
+ * Cache for conversion results, keyed by a hash of the template main.py, the code snippet, the app name and the converter version.
+ *
+ * Results are kept in a least recently used cache in memory. With a directory, every result is also written to a file
+ * named after its key, so results survive restarts of the process. The file tier is best effort, failing reads count as miss.
+ */
+export class ConversionCache {
+    private entries: LruCache<string, CodeConversionResult>;
+    private directory?: string;
+    hits = 0;
+    fileHits = 0;
+    misses = 0;
+
+    /**
+     * @param {ConversionCacheOptions} options
+     */
+    constructor(options: ConversionCacheOptions = {}) {
+        this.entries = new LruCache(
+            options.maxEntries ?? CONVERSION_CACHE.maxEntries,
+            options.maxBytes ?? CONVERSION_CACHE.maxBytes,
+            estimateBytes
+        );
+        this.directory = options.directory;
+    }
+
+    /**
+     * @param {string} mainPyContentData Decoded template main.py.
+     * @param {string} codeSnippet Decoded code snippet.
+     * @param {string} appName
+     * @param {string} rewriteRulesKey Signature of the rewrite rules, if they differ from the built-in ones.
+     * @return {string} Hex encoded SHA-256 of all inputs of a conversion.
+     */
+    public static createKey(mainPyContentData: string, codeSnippet: string, appName: string, rewriteRulesKey?: string): string {
+        const hash = createHash('sha256');
+        const inputs = [String(CONVERTER_VERSION), mainPyContentData, codeSnippet, appName];
+        if (rewriteRulesKey !== undefined) {
+            inputs.push(rewriteRulesKey);
+        }
+        // Every input is prefixed with its length, so no two different inputs produce the same hashed text
+        inputs.forEach((input: string) => {
+            hash.update(`${input.length}:`);
+            hash.update(input);
+        });
+        return hash.digest('hex');
+    }
+
+    get size(): number {
+        return this.entries.size;
+    }
+
+    /**
+     * @param {string} key Created by `ConversionCache.createKey`.
+     * @return {CodeConversionResult | undefined} Copy of the cached result.
+     */
+    public get(key: string): CodeConversionResult | undefined {
+        let result = this.entries.get(key);
+        if (!result && this.directory) {
+            result = this.readFile(key);
+            if (result) {
+                this.fileHits++;
+                this.entries.set(key, result);
+            }
+        }
+        if (!result) {
+            this.misses++;
+            return undefined;
+        }
+        this.hits++;
+        return copyResult(result);
+    }
+
+    /**
+     * @param {string} key Created by `ConversionCache.createKey`.
+     * @param {CodeConversionResult} result
+     */
+    public set(key: string, result: CodeConversionResult): void {
+        const cachedResult = copyResult(result);
+        this.entries.set(key, cachedResult);
+        if (this.directory) {
+            this.writeFile(key, cachedResult);
+        }
+    }
+
+    /**
+     * Clears the memory tier and the counters, files are kept.
+     */
+    public clear(): void {
+        this.entries.clear();
+        this.hits = 0;
+        this.fileHits = 0;
+        this.misses = 0;
+    }
+
+    private filePath(key: string): string {
+        return path.join(this.directory as string, `${key}.json`);
+    }
+
+    private readFile(key: string): CodeConversionResult | undefined {
+        try {
+            const result = JSON.parse(readFileSync(this.filePath(key), 'utf8'));
+            return isConversionResult(result) ? result : undefined;
+        } catch (error) {
+            return undefined;
+        }
+    }
+
+    private writeFile(key: string, result: CodeConversionResult): void {
+        try {
+            mkdirSync(this.directory as string, { recursive: true });
+            // Renaming a completely written file prevents concurrent processes from reading partial results
+            const temporaryFilePath = `${this.filePath(key)}.${process.pid}.tmp`;
+            writeFileSync(temporaryFilePath, JSON.stringify(result));
+            renameSync(temporaryFilePath, this.filePath(key));
+        } catch (error) {
+            // The result stays cached in memory
+        }
+    }
+}
+
+/**
+ * Conversion cache shared by all `ProjectGenerator` instances of the process.
+ */
+export const CONVERSION_RESULT_CACHE = new ConversionCache();
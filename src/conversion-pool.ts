@@ -0,0 +1,123 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as os from 'os';
+import * as path from 'path';
+import { Worker } from 'worker_threads';
+import { BatchConversionResult, CodeConversionResult, ConversionInput } from './code-converter';
+import { PreparedTemplate, PreparedTemplateParts } from './prepared-template';
+import { createItemPuller } from './utils/itemPuller';
+
+export interface ConversionTask extends ConversionInput {
+    index: number;
+}
+
+export interface ConversionTaskResult {
+    index: number;
+    result?: CodeConversionResult;
+    error?: { name: string; message: string };
+}
+
+const WORKER_FILE_NAME = 'conversion-worker';
+
+const prepareTemplate = (mainPyContentData: string): string | PreparedTemplateParts => {
+    try {
+        return new PreparedTemplate(mainPyContentData);
+    } catch (error) {
+        // Templates not matching the Velocitas structure are converted as they are
+        return mainPyContentData;
+    }
+};
+
+const createConversionWorker = (template: string | PreparedTemplateParts): Worker => {
+    const extension = path.extname(__filename);
+    const workerPath = path.join(__dirname, `${WORKER_FILE_NAME}${extension}`);
+    if (extension === '.ts') {
+        // Running from sources (e.g. mocha with ts-node), the worker has to register ts-node on its own
+        return new Worker(`require('ts-node/register');\nrequire(${JSON.stringify(workerPath)});`, {
+            eval: true,
+            workerData: { template },
+        });
+    }
+    return new Worker(workerPath, { workerData: { template } });
+};
+
+/**
+ * Pool of worker threads converting code snippets against one template main.py.
+ */
+export class ConversionPool {
+    private workers: Worker[] = [];
+    private template: string | PreparedTemplateParts;
+
+    /**
+     * @param {string} mainPyContentData Decoded template main.py, prepared once and posted to every worker.
+     * @param {number} workerCount Number of worker threads, defaults to the number of CPUs.
+     */
+    constructor(mainPyContentData: string, workerCount: number = os.cpus().length) {
+        this.template = prepareTemplate(mainPyContentData);
+        for (let index = 0; index < Math.max(1, workerCount); index++) {
+            this.workers.push(createConversionWorker(this.template));
+        }
+    }
+
+    /**
+     * Converts all inputs, each worker pulls the next input as soon as it is idle.
+     * @param {Iterable<ConversionInput> | AsyncIterable<ConversionInput>} inputs
+     * @return {Promise<BatchConversionResult[]>} Results in input order.
+     */
+    public async convertAll(inputs: Iterable<ConversionInput> | AsyncIterable<ConversionInput>): Promise<BatchConversionResult[]> {
+        const pullNextInput = createItemPuller(inputs);
+        const results: BatchConversionResult[] = [];
+
+        const runWorker = async (workerIndex: number): Promise<void> => {
+            for (let input = await pullNextInput(); input; input = await pullNextInput()) {
+                const task = { index: input.index, codeSnippet: input.item.codeSnippet, appName: input.item.appName };
+                const taskResult = await this.runTask(workerIndex, task);
+                results[task.index] = { appName: task.appName, result: taskResult.result, error: taskResult.error };
+            }
+        };
+        await Promise.all(this.workers.map((_worker: Worker, workerIndex: number) => runWorker(workerIndex)));
+        return results;
+    }
+
+    public async terminate(): Promise<void> {
+        await Promise.all(this.workers.map((worker: Worker) => worker.terminate()));
+        this.workers = [];
+    }
+
+    private runTask(workerIndex: number, task: ConversionTask): Promise<ConversionTaskResult> {
+        const worker = this.workers[workerIndex];
+        return new Promise((resolve) => {
+            const settle = (taskResult: ConversionTaskResult) => {
+                worker.off('message', onMessage);
+                worker.off('error', onError);
+                worker.off('exit', onExit);
+                resolve(taskResult);
+            };
+            const fail = (error: { name: string; message: string }) => {
+                // A crashed worker is replaced, the task which crashed it is reported as failed
+                this.workers[workerIndex] = createConversionWorker(this.template);
+                settle({ index: task.index, error: error });
+            };
+            const onMessage = (taskResult: ConversionTaskResult) => settle(taskResult);
+            const onError = (error: Error) => fail({ name: error.name, message: error.message });
+            // A worker can also exit without an error, e.g. when it is terminated or calls process.exit
+            const onExit = (exitCode: number) => fail({ name: 'Error', message: `Conversion worker exited with code ${exitCode}.` });
+            worker.once('message', onMessage);
+            worker.once('error', onError);
+            worker.once('exit', onExit);
+            worker.postMessage(task);
+        });
+    }
+}
@@ -0,0 +1,33 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { parentPort, workerData } from 'worker_threads';
+import { CodeConverter } from './code-converter';
+import { ConversionTask, ConversionTaskResult } from './conversion-pool';
+import { PreparedTemplate } from './prepared-template';
+
+// The template is prepared by the pool, only its fields arrive here
+const template = typeof workerData.template === 'string' ? workerData.template : PreparedTemplate.fromParts(workerData.template);
+const codeConverter = new CodeConverter();
+
+parentPort?.on('message', (task: ConversionTask) => {
+    let taskResult: ConversionTaskResult;
+    try {
+        const result = codeConverter.convertMainPy(template, task.codeSnippet, task.appName);
+        taskResult = { index: task.index, result: result };
+    } catch (error) {
+        taskResult = { index: task.index, error: { name: error?.name ?? 'Error', message: error?.message ?? String(error) } };
+    }
+    parentPort?.postMessage(taskResult);
+});
@@ -0,0 +1,30 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+
+// Entry point of the offline code converter, `@eclipse-velocitas/velocitas-project-generator/converter`.
+// It must not import the GitHub handler or any other module loading network dependencies.
+export { CodeConverter } from './code-converter';
+export type {
+    BatchConversionOptions,
+    BatchConversionResult,
+    CodeConversionResult,
+    CodeConverterOptions,
+    ConversionInput,
+} from './code-converter';
+export { PreparedTemplate } from './prepared-template';
+export { ConversionCache } from './conversion-cache';
+export type { RewriteRule } from './utils/rewriteRules';
+export type { InstrumentationEvent, InstrumentationObserver } from './instrumentation';
+export { HistogramObserver, OpenTelemetryObserver } from './instrumentation-adapters';
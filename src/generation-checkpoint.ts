@@ -0,0 +1,49 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { NewTree, TreeFiles } from './repository-backend';
+import { GENERATION_STAGES } from './utils/constants';
+
+export type GenerationStage = typeof GENERATION_STAGES[keyof typeof GENERATION_STAGES];
+
+/**
+ * @type GenerationInput
+ * @prop {string} codeSnippet Base64 encoded playground code snippet.
+ * @prop {string} appName Name of the VehicleApp.
+ * @prop {string} vspecPayload Base64 encoded Vspec payload.
+ */
+export interface GenerationInput {
+    codeSnippet: string;
+    appName: string;
+    vspecPayload: string;
+}
+
+/**
+ * Progress of a generation, recorded after every completed stage. It only contains plain JSON values,
+ * so it can be stored and passed to `ProjectGenerator.resume` by another process.
+ *
+ * @type GenerationCheckpoint
+ * @prop {GenerationStage} stage Last completed stage.
+ * @prop {GenerationInput} input Only kept until the files are created, they do not need the input anymore.
+ * @prop {TreeFiles} treeFiles Files of the project, from stage `filesCreated` on.
+ * @prop {NewTree} newTree Tree containing the files, from stage `treeCreated` on.
+ * @prop {string} commitSha Commit of the tree, from stage `commitCreated` on.
+ */
+export interface GenerationCheckpoint {
+    stage: GenerationStage;
+    input?: GenerationInput;
+    treeFiles?: TreeFiles;
+    newTree?: NewTree;
+    commitSha?: string;
+}
@@ -12,7 +12,9 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
-import axios from 'axios';
+import type { AxiosInstance, AxiosRequestConfig } from 'axios';
+import * as https from 'https';
+import { Readable } from 'stream';
 import { ProjectGeneratorError } from './project-generator-error';
 import { StatusCodes } from 'http-status-codes';
 import {
@@ -23,12 +25,77 @@ import {
     GIT_DATA_MODES,
     GIT_DATA_TYPES,
     PYTHON_TEMPLATE_URL,
-    MS_TO_WAIT_FOR_GITHUB,
     LOCAL_VSPEC_PATH,
     APP_MANIFEST_PATH,
     MAIN_PY_PATH,
+    MAX_CONCURRENT_REQUESTS,
+    RATE_LIMIT,
+    TRANSIENT_RETRY,
 } from './utils/constants';
+import { TemplateFileResponse } from './template-cache';
+import { MainBranchTree, NewTree, RepositoryBackend, TreeFileContent, TreeFiles } from './repository-backend';
+import { ReadinessOptions, waitForResource } from './utils/readiness';
+import { ConcurrencyLimiter } from './utils/concurrencyLimiter';
+import { RateLimitScheduler } from './utils/rateLimitScheduler';
+import { Instrumentation, InstrumentationObserver, InstrumentationSpan, NOOP_INSTRUMENTATION } from './instrumentation';
 import { delay } from './utils/helpers';
+import { isAxiosError, loadAxios } from './utils/httpClient';
+
+/**
+ * @type TransientRetryOptions
+ * @prop {number} maxRetries Number of retries of a request failing with a server or network error.
+ * @prop {number} initialDelayMs Delay before the first retry.
+ * @prop {number} backoffFactor Factor the delay grows with after every retry.
+ */
+export interface TransientRetryOptions {
+    maxRetries: number;
+    initialDelayMs: number;
+    backoffFactor: number;
+}
+
+/**
+ * @type GitRequestHandlerOptions
+ * @prop {Partial<ReadinessOptions>} readiness Polling used to wait for GitHub to create resources.
+ * @prop {ConcurrencyLimiter} requestLimiter Limits concurrent requests, can be shared between handlers.
+ * @prop {RateLimitScheduler} rateLimitScheduler Pauses requests on rate limits, can be shared between handlers.
+ * @prop {https.Agent} httpsAgent Agent used for all requests, e.g. to share keep-alive connections.
+ * @prop {Partial<TransientRetryOptions>} transientRetry Retries of idempotent requests failing with a server or network error.
+ * @prop {InstrumentationObserver} observer Receives the timing of every request and wait.
+ */
+export interface GitRequestHandlerOptions {
+    readiness?: Partial<ReadinessOptions>;
+    requestLimiter?: ConcurrencyLimiter;
+    rateLimitScheduler?: RateLimitScheduler;
+    httpsAgent?: https.Agent;
+    transientRetry?: Partial<TransientRetryOptions>;
+    observer?: InstrumentationObserver;
+}
+
+interface HttpClients {
+    pythonTemplateClient: AxiosInstance;
+    gitClient: AxiosInstance;
+}
+
+interface ScheduledRequestConfig extends AxiosRequestConfig {
+    rateLimitRetries?: number;
+    retryTransientErrors?: boolean;
+    transientRetries?: number;
+    createStreamData?: () => Readable;
+    instrumentationSpan?: InstrumentationSpan;
+}
+
+// Requests which have the same effect when sent twice, e.g. because git objects are addressed by their content
+const IDEMPOTENT_REQUEST: ScheduledRequestConfig = { retryTransientErrors: true };
+
+const isTransientError = (error: any): boolean =>
+    isAxiosError(error) && (error.response === undefined || error.response.status >= StatusCodes.INTERNAL_SERVER_ERROR);
+
+const byteLength = (data: any): number | undefined => {
+    if (data === undefined || typeof data.pipe === 'function') {
+        return undefined;
+    }
+    return Buffer.byteLength(typeof data === 'string' ? data : JSON.stringify(data));
+};
 
 /**
  * Initialize a new `GitRequestHandler` with the given `options`.
@@ -37,11 +104,15 @@ import { delay } from './utils/helpers';
  * @return {GitRequestHandler} which holds methods to make requests to the GitHub API.
  * @public
  */
-export class GitRequestHandler {
+export class GitRequestHandler implements RepositoryBackend {
     private requestConfig;
     private repositoryPath;
-    private pythonTemplateClient;
-    private gitClient;
+    private clients: Promise<HttpClients> | undefined;
+    private readinessOptions: Partial<ReadinessOptions>;
+    private requestLimiter: ConcurrencyLimiter;
+    private rateLimitScheduler: RateLimitScheduler;
+    private transientRetryOptions: TransientRetryOptions;
+    private instrumentation: Instrumentation;
     /**
      * Parameter will be used to call the GitHub API as follows:
      * https://api.github.com/repos/OWNER/REPO
@@ -51,29 +122,29 @@ export class GitRequestHandler {
      * @param {string} owner
      * @param {string} repo
      * @param {string} authToken as PAT or Oauth Token
+     * @param {GitRequestHandlerOptions} options
      */
-    constructor(private owner: string, private repo: string, private authToken: string) {
+    constructor(private owner: string, private repo: string, private authToken: string, options: GitRequestHandlerOptions = {}) {
+        this.readinessOptions = options.readiness ?? {};
+        this.requestLimiter = options.requestLimiter ?? new ConcurrencyLimiter(MAX_CONCURRENT_REQUESTS);
+        this.rateLimitScheduler = options.rateLimitScheduler ?? new RateLimitScheduler();
+        this.transientRetryOptions = { ...TRANSIENT_RETRY, ...options.transientRetry };
+        this.instrumentation = options.observer ? new Instrumentation(options.observer) : NOOP_INSTRUMENTATION;
         this.requestConfig = {
             headers: {
                 'Content-Type': 'application/json',
                 Accept: 'application/vnd.github+json',
                 Authorization: `Bearer ${this.authToken}`,
             },
+            httpsAgent: options.httpsAgent,
         };
         this.repositoryPath = `${GITHUB_API_URL}/${this.owner}/${this.repo}`;
-        this.pythonTemplateClient = axios.create({
-            baseURL: PYTHON_TEMPLATE_URL,
-            ...this.requestConfig,
-        });
-        this.gitClient = axios.create({
-            baseURL: this.repositoryPath,
-            ...this.requestConfig,
-        });
     }
 
     public async generateRepo(): Promise<number> {
         try {
-            await this.pythonTemplateClient.post('/generate', {
+            const pythonTemplateClient = await this.getPythonTemplateClient();
+            await pythonTemplateClient.post('/generate', {
                 owner: this.owner,
                 name: this.repo,
                 description: DEFAULT_REPOSITORY_DESCRIPTION,
@@ -81,7 +152,7 @@ export class GitRequestHandler {
                 private: true,
             });
         } catch (error) {
-            if (axios.isAxiosError(error)) {
+            if (isAxiosError(error)) {
                 throw new ProjectGeneratorError(error);
             } else {
                 throw error;
@@ -94,14 +165,19 @@ export class GitRequestHandler {
 
     public async createBlob(fileContent: string): Promise<string> {
         try {
-            const response = await this.gitClient.post('/git/blobs', {
-                content: fileContent,
-                encoding: CONTENT_ENCODINGS.base64,
-            });
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.post(
+                '/git/blobs',
+                {
+                    content: fileContent,
+                    encoding: CONTENT_ENCODINGS.base64,
+                },
+                IDEMPOTENT_REQUEST
+            );
             const blobSha = response.data.sha;
             return blobSha;
         } catch (error) {
-            if (axios.isAxiosError(error)) {
+            if (isAxiosError(error)) {
                 throw new ProjectGeneratorError(error);
             } else {
                 throw error;
@@ -109,25 +185,157 @@ export class GitRequestHandler {
         }
     }
 
-    public async updateTree(appManifestBlobSha: string, mainPyBlobSha: string, vspecJsonBlobSha: string = ''): Promise<number> {
+    /**
+     * Creates a blob from base64 encoded content without holding the content in memory.
+     * @param {() => Readable} createContentStream Creates the base64 encoded content, called again for retries.
+     * @return {Promise<string>} SHA of the created blob.
+     */
+    public async createBlobFromStream(createContentStream: () => Readable): Promise<string> {
+        const createRequestBody = () => Readable.from(this.streamBlobRequestBody(createContentStream()));
+        try {
+            const requestConfig: ScheduledRequestConfig = {
+                ...IDEMPOTENT_REQUEST,
+                headers: { 'Content-Type': 'application/json' },
+                maxBodyLength: Infinity,
+                createStreamData: createRequestBody,
+            };
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.post('/git/blobs', createRequestBody(), requestConfig);
+            const blobSha = response.data.sha;
+            return blobSha;
+        } catch (error) {
+            if (isAxiosError(error)) {
+                throw new ProjectGeneratorError(error);
+            } else {
+                throw error;
+            }
+        }
+    }
+
+    /**
+     * Commits the files to the main branch of a generated repository and enables its workflows.
+     * @param {TreeFileContent} appManifestFile
+     * @param {TreeFileContent} mainPyFile
+     * @param {TreeFileContent} vspecJsonFile Only committed if given.
+     */
+    public async updateTree(
+        appManifestFile: TreeFileContent,
+        mainPyFile: TreeFileContent,
+        vspecJsonFile?: TreeFileContent
+    ): Promise<number> {
+        try {
+            const treeFiles: TreeFiles = { [APP_MANIFEST_PATH]: appManifestFile, [MAIN_PY_PATH]: mainPyFile };
+            if (vspecJsonFile) {
+                treeFiles[LOCAL_VSPEC_PATH] = vspecJsonFile;
+            }
+            const newTree = await this.createTree(treeFiles);
+            return this.updateMainBranch(await this.createCommit(newTree), true);
+        } catch (error) {
+            throw error;
+        }
+    }
+
+    /**
+     * Reads the tree of the main branch with the blob SHAs of all files.
+     * Files missing in a truncated tree are not contained in `fileShas`.
+     * @return {Promise<MainBranchTree>}
+     */
+    public async getMainBranchTree(): Promise<MainBranchTree> {
         try {
-            const baseTreeSha = await this.getBaseTreeSha();
-            const newTreeSha = await this.createNewTreeSha(appManifestBlobSha, mainPyBlobSha, vspecJsonBlobSha, baseTreeSha);
+            // The tree is read from the commit instead of the branch, so both belong together even if the branch moves
             const mainBranchSha = await this.getMainBranchSha();
-            const newCommitSha = await this.createCommitSha(mainBranchSha, newTreeSha);
-            await delay(MS_TO_WAIT_FOR_GITHUB);
-            await this.setDefaultWorkflowPermissionToWrite();
-            await this.enableWorkflows(true);
-            await this.updateMainBranchSha(newCommitSha);
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.get(`/git/trees/${mainBranchSha}`, { ...IDEMPOTENT_REQUEST, params: { recursive: 1 } });
+            const fileShas = (response.data.tree ?? [])
+                .filter((treeEntry: any) => treeEntry.type === GIT_DATA_TYPES.blob)
+                .reduce((shas: { [filePath: string]: string }, treeEntry: any) => {
+                    shas[treeEntry.path] = treeEntry.sha;
+                    return shas;
+                }, {});
+            return { commitSha: mainBranchSha, treeSha: response.data.sha, fileShas: fileShas };
+        } catch (error) {
+            if (isAxiosError(error)) {
+                throw new ProjectGeneratorError(error);
+            } else {
+                throw error;
+            }
+        }
+    }
+
+    /**
+     * Commits the files on top of the given tree of the main branch, all other files are kept.
+     * @param {TreeFiles} treeFiles
+     * @param {MainBranchTree} mainBranchTree Read by `getMainBranchTree`.
+     */
+    public async updateFiles(treeFiles: TreeFiles, mainBranchTree: MainBranchTree): Promise<number> {
+        const newTree = await this.createTree(treeFiles, mainBranchTree);
+        return this.updateMainBranch(await this.createCommit(newTree));
+    }
+
+    /**
+     * @param {TreeFiles} treeFiles
+     * @param {MainBranchTree} mainBranchTree Base of the tree, the current main branch is read if not given.
+     * @return {Promise<NewTree>}
+     */
+    public async createTree(treeFiles: TreeFiles, mainBranchTree?: MainBranchTree): Promise<NewTree> {
+        try {
+            const [baseTreeSha, mainBranchSha] = mainBranchTree
+                ? [mainBranchTree.treeSha, mainBranchTree.commitSha]
+                : await Promise.all([this.getBaseTreeSha(), this.getMainBranchSha()]);
+            const newTreeSha = await this.createNewTreeSha(treeFiles, baseTreeSha);
+            return { treeSha: newTreeSha, parentCommitSha: mainBranchSha };
+        } catch (error) {
+            if (isAxiosError(error)) {
+                throw new ProjectGeneratorError(error);
+            } else {
+                throw error;
+            }
+        }
+    }
+
+    /**
+     * @param {NewTree} newTree
+     * @return {Promise<string>} SHA of the commit.
+     */
+    public async createCommit(newTree: NewTree): Promise<string> {
+        try {
+            return await this.createCommitSha(newTree.parentCommitSha, newTree.treeSha);
+        } catch (error) {
+            if (isAxiosError(error)) {
+                throw new ProjectGeneratorError(error);
+            } else {
+                throw error;
+            }
+        }
+    }
+
+    /**
+     * Points the main branch to the commit once it can be read.
+     * @param {string} commitSha
+     * @param {boolean} enableWorkflows Allows the workflows to write and enables them, after `generateRepo` disabled them.
+     */
+    public async updateMainBranch(commitSha: string, enableWorkflows: boolean = false): Promise<number> {
+        try {
+            await Promise.all([
+                this.waitUntilReadable(`/git/commits/${commitSha}`),
+                enableWorkflows ? this.setDefaultWorkflowPermissionToWrite() : undefined,
+                enableWorkflows ? this.enableWorkflows(true) : undefined,
+            ]);
+            await this.updateMainBranchSha(commitSha);
             return StatusCodes.OK;
         } catch (error) {
-            throw error;
+            if (isAxiosError(error)) {
+                throw new ProjectGeneratorError(error);
+            } else {
+                throw error;
+            }
         }
     }
 
     public async getFileContentData(filePath: string): Promise<string> {
         try {
-            const fileContentResponse = await this.gitClient.get(`/contents/${filePath}`);
+            const gitClient = await this.getGitClient();
+            const fileContentResponse = await gitClient.get(`/contents/${filePath}`);
             const fileContentData = fileContentResponse.data.content;
             return fileContentData;
         } catch (error) {
@@ -135,36 +343,209 @@ export class GitRequestHandler {
         }
     }
 
+    /**
+     * Fetches a file of the vehicle app python template.
+     * @param {string} filePath
+     * @param {string} ref Branch, tag or commit of the template.
+     * @param {string} etag ETag of a previous response, sent as \`If-None-Match\`.
+     * @return {Promise<TemplateFileResponse | undefined>} undefined if the file was not modified.
+     */
+    public async getTemplateFileContentData(filePath: string, ref: string, etag?: string): Promise<TemplateFileResponse | undefined> {
+        try {
+            const pythonTemplateClient = await this.getPythonTemplateClient();
+            const response = await pythonTemplateClient.get(`/contents/${filePath}`, {
+                ...IDEMPOTENT_REQUEST,
+                params: { ref: ref },
+                headers: etag ? { 'If-None-Match': etag } : {},
+                validateStatus: (status: number) => status === StatusCodes.OK || status === StatusCodes.NOT_MODIFIED,
+            });
+            if (response.status === StatusCodes.NOT_MODIFIED) {
+                return undefined;
+            }
+            return { content: response.data.content, etag: response.headers.etag };
+        } catch (error) {
+            if (isAxiosError(error)) {
+                throw new ProjectGeneratorError(error);
+            } else {
+                throw error;
+            }
+        }
+    }
+
+    /**
+     * Waits until the main branch of the generated repository can be read.
+     * @throws {ProjectGeneratorError} If the main branch is not created before the deadline.
+     */
+    public async waitForMainBranch(): Promise<number> {
+        return this.waitUntilReadable('/git/refs/heads/main');
+    }
+
+    /**
+     * Creates the clients on first use, so axios is only loaded once a request is sent.
+     * @return {Promise<HttpClients>}
+     */
+    private getClients(): Promise<HttpClients> {
+        if (!this.clients) {
+            this.clients = loadAxios().then((axios) => {
+                const pythonTemplateClient = axios.create({
+                    baseURL: PYTHON_TEMPLATE_URL,
+                    ...this.requestConfig,
+                });
+                const gitClient = axios.create({
+                    baseURL: this.repositoryPath,
+                    ...this.requestConfig,
+                });
+                this.scheduleRequests(pythonTemplateClient);
+                this.scheduleRequests(gitClient);
+                return { pythonTemplateClient: pythonTemplateClient, gitClient: gitClient };
+            });
+        }
+        return this.clients;
+    }
+
+    private async getGitClient(): Promise<AxiosInstance> {
+        return (await this.getClients()).gitClient;
+    }
+
+    private async getPythonTemplateClient(): Promise<AxiosInstance> {
+        return (await this.getClients()).pythonTemplateClient;
+    }
+
+    /**
+     * Requests wait for a rate limit pause to end and for a free slot of the limiter.
+     * Requests rejected by a rate limit are retried after the pause.
+     */
+    private scheduleRequests(client: AxiosInstance): void {
+        client.interceptors.request.use(async (config: ScheduledRequestConfig) => {
+            if (this.rateLimitScheduler.pausedUntil > Date.now()) {
+                await this.instrumentation.measureAsync('wait', 'rateLimit', {}, () => this.rateLimitScheduler.waitForCapacity());
+            }
+            if (this.requestLimiter.active >= this.requestLimiter.maxConcurrent) {
+                await this.instrumentation.measureAsync('wait', 'requestLimiter', { pending: this.requestLimiter.pending }, () =>
+                    this.requestLimiter.acquire()
+                );
+            } else {
+                await this.requestLimiter.acquire();
+            }
+            config.instrumentationSpan = this.startRequestSpan(config);
+            return config;
+        });
+        client.interceptors.response.use(
+            (response) => {
+                this.requestLimiter.release();
+                this.endRequestSpan(response.config, response.status, response.headers, response.data);
+                this.rateLimitScheduler.update(response.status, response.headers);
+                return response;
+            },
+            (error) => {
+                this.requestLimiter.release();
+                const config: ScheduledRequestConfig | undefined = error.config;
+                this.endRequestSpan(config, error.response?.status, error.response?.headers, error.response?.data, error);
+                const isRateLimited = this.rateLimitScheduler.update(error.response?.status, error.response?.headers);
+                const rateLimitRetries = config?.rateLimitRetries ?? 0;
+                if (isRateLimited && config && rateLimitRetries < RATE_LIMIT.maxRetries) {
+                    const retryConfig: ScheduledRequestConfig = { ...config, rateLimitRetries: rateLimitRetries + 1 };
+                    if (config.createStreamData) {
+                        // A streamed request body is consumed by the first attempt
+                        retryConfig.data = config.createStreamData();
+                    }
+                    return client.request(retryConfig);
+                }
+                const transientRetries = config?.transientRetries ?? 0;
+                if (config?.retryTransientErrors && isTransientError(error) && transientRetries < this.transientRetryOptions.maxRetries) {
+                    return this.retryTransientError(client, config, transientRetries + 1);
+                }
+                return Promise.reject(error);
+            }
+        );
+    }
+
+    private async retryTransientError(client: AxiosInstance, config: ScheduledRequestConfig, transientRetries: number): Promise<any> {
+        const retryConfig: ScheduledRequestConfig = { ...config, transientRetries: transientRetries };
+        if (config.createStreamData) {
+            retryConfig.data = config.createStreamData();
+        }
+        const options = this.transientRetryOptions;
+        const waitMs = options.initialDelayMs * Math.pow(options.backoffFactor, transientRetries - 1);
+        const attributes = { path: config.url, retry: transientRetries };
+        await this.instrumentation.measureAsync('wait', 'transientRetry', attributes, () => delay(waitMs));
+        return client.request(retryConfig);
+    }
+
+    private startRequestSpan(config: ScheduledRequestConfig): InstrumentationSpan | undefined {
+        if (!this.instrumentation.enabled) {
+            // Sizes are only computed for observers
+            return undefined;
+        }
+        const method = (config.method ?? 'get').toUpperCase();
+        return this.instrumentation.start('httpRequest', `${method} ${config.url}`, {
+            method: method,
+            path: `${(config.baseURL ?? '').slice(GITHUB_API_URL.length)}${config.url}`,
+            retries: (config.rateLimitRetries ?? 0) + (config.transientRetries ?? 0),
+            requestBytes: byteLength(config.data),
+        });
+    }
+
+    private endRequestSpan(
+        config: ScheduledRequestConfig | undefined,
+        status?: number,
+        headers?: Record<string, any>,
+        data?: any,
+        error?: Error
+    ): void {
+        if (!config?.instrumentationSpan) {
+            return;
+        }
+        const contentLength = headers?.['content-length'];
+        const responseBytes = contentLength !== undefined ? Number(contentLength) : byteLength(data);
+        config.instrumentationSpan.end({ status: status, responseBytes: responseBytes }, error);
+        config.instrumentationSpan = undefined;
+    }
+
+    private async *streamBlobRequestBody(contentStream: Readable): AsyncGenerator<string> {
+        yield `{"content":"`;
+        for await (const chunk of contentStream) {
+            yield chunk.toString();
+        }
+        yield `","encoding":"${CONTENT_ENCODINGS.base64}"}`;
+    }
+
     private async checkRepoAvailability(): Promise<number> {
-        let retries = 0;
-        let success = false;
-        let responseStatus: StatusCodes = StatusCodes.INTERNAL_SERVER_ERROR;
-        const maxRetries = 20;
+        return this.waitUntilReadable('/contents');
+    }
 
-        while (retries < maxRetries && !success) {
+    private async waitUntilReadable(resourcePath: string): Promise<number> {
+        try {
+            const gitClient = await this.getGitClient();
+            const readinessSpan = this.instrumentation.start('wait', 'readiness', { resourcePath: resourcePath });
             try {
-                const response = await this.gitClient.get('/contents');
-                responseStatus = response.status;
-                success = true;
-                return responseStatus;
+                const attempts = await waitForResource(gitClient, resourcePath, this.readinessOptions, this.instrumentation);
+                const status = attempts[attempts.length - 1].status as number;
+                readinessSpan.end({ attempts: attempts.length, status: status });
+                return status;
             } catch (error) {
-                if (axios.isAxiosError(error)) {
-                    console.log(`Check #${retries + 1} if Repository is generated failed. Retrying.`);
-                    responseStatus = error.response?.status as number;
-                } else {
-                    throw error;
-                }
+                readinessSpan.end(undefined, error);
+                throw error;
+            }
+        } catch (error) {
+            if (isAxiosError(error)) {
+                throw new ProjectGeneratorError(error);
+            } else {
+                throw error;
             }
-            retries++;
         }
-        return responseStatus;
     }
 
     private async enableWorkflows(isEnabled: boolean): Promise<boolean> {
         try {
-            await this.gitClient.put('/actions/permissions', {
-                enabled: isEnabled,
-            });
+            const gitClient = await this.getGitClient();
+            await gitClient.put(
+                '/actions/permissions',
+                {
+                    enabled: isEnabled,
+                },
+                IDEMPOTENT_REQUEST
+            );
             return true;
         } catch (error) {
             console.log(error);
@@ -174,9 +555,14 @@ export class GitRequestHandler {
 
     private async setDefaultWorkflowPermissionToWrite(): Promise<boolean> {
         try {
-            await this.gitClient.put('/actions/permissions/workflow', {
-                default_workflow_permissions: 'write',
-            });
+            const gitClient = await this.getGitClient();
+            await gitClient.put(
+                '/actions/permissions/workflow',
+                {
+                    default_workflow_permissions: 'write',
+                },
+                IDEMPOTENT_REQUEST
+            );
             return true;
         } catch (error) {
             console.log(error);
@@ -186,7 +572,8 @@ export class GitRequestHandler {
 
     private async getBaseTreeSha(): Promise<string> {
         try {
-            const response = await this.gitClient.get('/git/trees/main');
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.get('/git/trees/main', IDEMPOTENT_REQUEST);
             const baseTreeSha = response.data.sha;
             return baseTreeSha;
         } catch (error) {
@@ -194,39 +581,23 @@ export class GitRequestHandler {
         }
     }
 
-    private async createNewTreeSha(
-        appManifestBlobSha: string,
-        mainPyBlobSha: string,
-        vspecJsonBlobSha: string,
-        baseTreeSha: string
-    ): Promise<string> {
+    private async createNewTreeSha(treeFiles: TreeFiles, baseTreeSha: string): Promise<string> {
         try {
-            const treeArray = [
+            const treeArray = Object.keys(treeFiles).map((filePath: string) => ({
+                path: filePath,
+                mode: GIT_DATA_MODES.fileBlob,
+                type: GIT_DATA_TYPES.blob,
+                ...treeFiles[filePath],
+            }));
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.post(
+                '/git/trees',
                 {
-                    path: APP_MANIFEST_PATH,
-                    mode: GIT_DATA_MODES.fileBlob,
-                    type: GIT_DATA_TYPES.blob,
-                    sha: appManifestBlobSha,
+                    tree: treeArray,
+                    base_tree: baseTreeSha,
                 },
-                {
-                    path: MAIN_PY_PATH,
-                    mode: GIT_DATA_MODES.fileBlob,
-                    type: GIT_DATA_TYPES.blob,
-                    sha: mainPyBlobSha,
-                },
-            ];
-            if (vspecJsonBlobSha) {
-                treeArray.push({
-                    path: LOCAL_VSPEC_PATH,
-                    mode: GIT_DATA_MODES.fileBlob,
-                    type: GIT_DATA_TYPES.blob,
-                    sha: vspecJsonBlobSha,
-                });
-            }
-            const response = await this.gitClient.post('/git/trees', {
-                tree: treeArray,
-                base_tree: baseTreeSha,
-            });
+                IDEMPOTENT_REQUEST
+            );
             const newTreeSha = response.data.sha;
             return newTreeSha;
         } catch (error) {
@@ -236,7 +607,8 @@ export class GitRequestHandler {
 
     private async getMainBranchSha(): Promise<string> {
         try {
-            const response = await this.gitClient.get('/git/refs/heads/main');
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.get('/git/refs/heads/main', IDEMPOTENT_REQUEST);
             const mainBranchSha = response.data.object.sha;
             return mainBranchSha;
         } catch (error) {
@@ -246,11 +618,17 @@ export class GitRequestHandler {
 
     private async createCommitSha(mainBranchSha: string, newTreeSha: string): Promise<string> {
         try {
-            const response = await this.gitClient.post('/git/commits', {
-                tree: newTreeSha,
-                message: DEFAULT_COMMIT_MESSAGE,
-                parents: [mainBranchSha],
-            });
+            // A retried commit may leave an unreferenced duplicate, which is harmless
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.post(
+                '/git/commits',
+                {
+                    tree: newTreeSha,
+                    message: DEFAULT_COMMIT_MESSAGE,
+                    parents: [mainBranchSha],
+                },
+                IDEMPOTENT_REQUEST
+            );
             const commitSha = response.data.sha;
             return commitSha;
         } catch (error) {
@@ -260,9 +638,14 @@ export class GitRequestHandler {
 
     private async updateMainBranchSha(newCommitSha: string): Promise<string> {
         try {
-            const response = await this.gitClient.patch('/git/refs/heads/main', {
-                sha: newCommitSha,
-            });
+            const gitClient = await this.getGitClient();
+            const response = await gitClient.patch(
+                '/git/refs/heads/main',
+                {
+                    sha: newCommitSha,
+                },
+                IDEMPOTENT_REQUEST
+            );
             const patchResponse = response.data;
             return patchResponse;
         } catch (error) {
@@ -12,5 +12,16 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
+export { CodeConverter } from './code-converter';
+export { PreparedTemplate } from './prepared-template';
 export { ProjectGenerator } from './project-generator';
-export { ProjectGeneratorError } from './project-generator-error';
+export { ProjectGeneratorPool } from './project-generator-pool';
+export { ProjectGeneratorError, UnknownSignalsError } from './project-generator-error';
+export { ConversionCache } from './conversion-cache';
+export { LocalRepositoryBackend } from './local-repository-backend';
+export type { LocalRepositoryBackendOptions } from './local-repository-backend';
+export type { RepositoryBackend } from './repository-backend';
+export type { RewriteRule } from './utils/rewriteRules';
+export type { GenerationCheckpoint, GenerationInput, GenerationStage } from './generation-checkpoint';
+export type { InstrumentationEvent, InstrumentationObserver } from './instrumentation';
+export { HistogramObserver, OpenTelemetryObserver } from './instrumentation-adapters';
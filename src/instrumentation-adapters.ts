@@ -0,0 +1,200 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { InstrumentationAttributes, InstrumentationEvent, InstrumentationObserver } from './instrumentation';
+
+const HISTOGRAM_BOUNDARIES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000];
+
+/**
+ * Durations of one kind and name of event.
+ * @type HistogramSummary
+ * @prop {number} count Number of ended events.
+ * @prop {number} errors Number of failed events.
+ * @prop {number} totalMs
+ * @prop {number} minMs
+ * @prop {number} maxMs
+ * @prop {number} meanMs
+ * @prop {number} p50Ms Upper bound of the bucket containing the median.
+ * @prop {number} p90Ms
+ * @prop {number} p99Ms
+ * @prop {number[]} buckets Counts per bucket, bucket `i` ends at `HistogramObserver.boundariesMs[i]`, the last one is open.
+ */
+export interface HistogramSummary {
+    count: number;
+    errors: number;
+    totalMs: number;
+    minMs: number;
+    maxMs: number;
+    meanMs: number;
+    p50Ms: number;
+    p90Ms: number;
+    p99Ms: number;
+    buckets: number[];
+}
+
+interface Histogram {
+    count: number;
+    errors: number;
+    totalMs: number;
+    minMs: number;
+    maxMs: number;
+    buckets: number[];
+}
+
+/**
+ * Aggregates the durations of all events into histograms with fixed buckets, keyed by `kind name`.
+ * Memory does not grow with the number of events.
+ */
+export class HistogramObserver implements InstrumentationObserver {
+    readonly boundariesMs: number[] = HISTOGRAM_BOUNDARIES_MS;
+    private histograms = new Map<string, Histogram>();
+
+    public onEnd(event: InstrumentationEvent): void {
+        const key = `${event.kind} ${event.name}`;
+        let histogram = this.histograms.get(key);
+        if (!histogram) {
+            const buckets = new Array(this.boundariesMs.length + 1).fill(0);
+            histogram = { count: 0, errors: 0, totalMs: 0, minMs: Infinity, maxMs: 0, buckets: buckets };
+            this.histograms.set(key, histogram);
+        }
+        const durationMs = event.durationMs ?? 0;
+        histogram.count++;
+        histogram.errors += event.error ? 1 : 0;
+        histogram.totalMs += durationMs;
+        histogram.minMs = Math.min(histogram.minMs, durationMs);
+        histogram.maxMs = Math.max(histogram.maxMs, durationMs);
+        const bucketIndex = this.boundariesMs.findIndex((boundaryMs: number) => durationMs <= boundaryMs);
+        histogram.buckets[bucketIndex >= 0 ? bucketIndex : this.boundariesMs.length]++;
+    }
+
+    /**
+     * @return {Record<string, HistogramSummary>} Summary per `kind name`, e.g. `httpRequest POST /git/blobs`.
+     */
+    public summary(): Record<string, HistogramSummary> {
+        const summaries: Record<string, HistogramSummary> = {};
+        this.histograms.forEach((histogram: Histogram, key: string) => {
+            summaries[key] = {
+                count: histogram.count,
+                errors: histogram.errors,
+                totalMs: histogram.totalMs,
+                minMs: histogram.minMs,
+                maxMs: histogram.maxMs,
+                meanMs: histogram.totalMs / histogram.count,
+                p50Ms: this.percentile(histogram, 0.5),
+                p90Ms: this.percentile(histogram, 0.9),
+                p99Ms: this.percentile(histogram, 0.99),
+                buckets: [...histogram.buckets],
+            };
+        });
+        return summaries;
+    }
+
+    public reset(): void {
+        this.histograms.clear();
+    }
+
+    private percentile(histogram: Histogram, fraction: number): number {
+        const rank = Math.ceil(histogram.count * fraction);
+        let count = 0;
+        for (let bucketIndex = 0; bucketIndex < histogram.buckets.length; bucketIndex++) {
+            count += histogram.buckets[bucketIndex];
+            if (count >= rank) {
+                // The bucket boundary is an upper bound, the largest duration is a closer one
+                return Math.min(this.boundariesMs[bucketIndex] ?? Infinity, histogram.maxMs);
+            }
+        }
+        return histogram.maxMs;
+    }
+}
+
+/**
+ * Subset of the OpenTelemetry `Span` API used by `OpenTelemetryObserver`.
+ */
+export interface OpenTelemetrySpan {
+    setAttributes(attributes: InstrumentationAttributes): unknown;
+    setStatus(status: { code: number; message?: string }): unknown;
+    recordException(exception: Error): unknown;
+    end(endTime?: number): void;
+}
+
+/**
+ * Subset of the OpenTelemetry `Tracer` API, e.g. `trace.getTracer('velocitas-project-generator')` of `@opentelemetry/api`.
+ */
+export interface OpenTelemetryTracer {
+    startSpan(name: string, options?: { kind?: number; attributes?: InstrumentationAttributes; startTime?: number }): OpenTelemetrySpan;
+}
+
+// Values of SpanKind and SpanStatusCode in @opentelemetry/api
+const SPAN_KIND_INTERNAL = 0;
+const SPAN_KIND_CLIENT = 2;
+const SPAN_STATUS_OK = 1;
+const SPAN_STATUS_ERROR = 2;
+
+// Attribute names of the OpenTelemetry semantic conventions for HTTP clients
+const HTTP_ATTRIBUTE_NAMES: Record<string, string> = {
+    method: 'http.request.method',
+    path: 'url.path',
+    status: 'http.response.status_code',
+    requestBytes: 'http.request.body.size',
+    responseBytes: 'http.response.body.size',
+    retries: 'http.request.resend_count',
+};
+
+const toSpanAttributes = (event: InstrumentationEvent): InstrumentationAttributes => {
+    const spanAttributes: InstrumentationAttributes = { 'velocitas.kind': event.kind };
+    Object.keys(event.attributes).forEach((name: string) => {
+        const spanAttributeName = event.kind === 'httpRequest' ? HTTP_ATTRIBUTE_NAMES[name] ?? `velocitas.${name}` : `velocitas.${name}`;
+        if (event.attributes[name] !== undefined) {
+            spanAttributes[spanAttributeName] = event.attributes[name];
+        }
+    });
+    return spanAttributes;
+};
+
+/**
+ * Records every event as OpenTelemetry span, HTTP requests as client spans with the HTTP semantic conventions.
+ */
+export class OpenTelemetryObserver implements InstrumentationObserver {
+    private spans = new Map<InstrumentationEvent, OpenTelemetrySpan>();
+
+    /**
+     * @param {OpenTelemetryTracer} tracer
+     */
+    constructor(private tracer: OpenTelemetryTracer) {}
+
+    public onStart(event: InstrumentationEvent): void {
+        const span = this.tracer.startSpan(event.name, {
+            kind: event.kind === 'httpRequest' ? SPAN_KIND_CLIENT : SPAN_KIND_INTERNAL,
+            attributes: toSpanAttributes(event),
+            startTime: event.startTime,
+        });
+        this.spans.set(event, span);
+    }
+
+    public onEnd(event: InstrumentationEvent): void {
+        const span = this.spans.get(event);
+        if (!span) {
+            return;
+        }
+        this.spans.delete(event);
+        span.setAttributes(toSpanAttributes(event));
+        if (event.error) {
+            span.recordException(event.error);
+            span.setStatus({ code: SPAN_STATUS_ERROR, message: event.error.message });
+        } else {
+            span.setStatus({ code: SPAN_STATUS_OK });
+        }
+        span.end(event.startTime + (event.durationMs ?? 0));
+    }
+}
@@ -0,0 +1,154 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+/**
+ * What an instrumentation event measures.
+ */
+export type InstrumentationKind = 'generation' | 'conversion' | 'pipelineStep' | 'httpRequest' | 'wait';
+
+export type InstrumentationAttributes = Record<string, string | number | boolean | undefined>;
+
+/**
+ * A measured operation, the same object is passed to `onStart` and `onEnd` of an observer.
+ * @type InstrumentationEvent
+ * @prop {InstrumentationKind} kind
+ * @prop {string} name E.g. the pipeline step or `POST /git/blobs`.
+ * @prop {InstrumentationAttributes} attributes E.g. sizes, HTTP status or retries, extended when the operation ends.
+ * @prop {number} startTime Milliseconds since epoch.
+ * @prop {number} durationMs Set when the operation ends.
+ * @prop {Error} error Set if the operation failed.
+ */
+export interface InstrumentationEvent {
+    kind: InstrumentationKind;
+    name: string;
+    attributes: InstrumentationAttributes;
+    startTime: number;
+    durationMs?: number;
+    error?: Error;
+}
+
+/**
+ * Receives the start and end of every measured operation, e.g. to record metrics or traces.
+ * Observers are called synchronously and should not throw.
+ */
+export interface InstrumentationObserver {
+    onStart?(event: InstrumentationEvent): void;
+    onEnd?(event: InstrumentationEvent): void;
+}
+
+/**
+ * Handle of a started operation.
+ */
+export interface InstrumentationSpan {
+    /**
+     * @param {InstrumentationAttributes} attributes Added to the attributes of the event.
+     * @param {Error} error Error the operation failed with.
+     */
+    end(attributes?: InstrumentationAttributes, error?: Error): void;
+}
+
+const NOOP_SPAN: InstrumentationSpan = { end: () => {} };
+
+/**
+ * Emits instrumentation events to an optional observer.
+ * Without observer no events are created, so the instrumentation costs a single check per operation.
+ */
+export class Instrumentation {
+    /**
+     * @param {InstrumentationObserver} observer
+     */
+    constructor(private observer?: InstrumentationObserver) {}
+
+    get enabled(): boolean {
+        return this.observer !== undefined;
+    }
+
+    /**
+     * @param {InstrumentationKind} kind
+     * @param {string} name
+     * @param {InstrumentationAttributes} attributes
+     * @return {InstrumentationSpan} Has to be ended exactly once.
+     */
+    public start(kind: InstrumentationKind, name: string, attributes: InstrumentationAttributes = {}): InstrumentationSpan {
+        const observer = this.observer;
+        if (!observer) {
+            return NOOP_SPAN;
+        }
+        const event: InstrumentationEvent = { kind: kind, name: name, attributes: attributes, startTime: Date.now() };
+        const start = process.hrtime();
+        observer.onStart?.(event);
+        return {
+            end: (endAttributes?: InstrumentationAttributes, error?: Error) => {
+                const [seconds, nanoseconds] = process.hrtime(start);
+                event.durationMs = seconds * 1000 + nanoseconds / 1e6;
+                event.attributes = endAttributes ? { ...event.attributes, ...endAttributes } : event.attributes;
+                event.error = error;
+                observer.onEnd?.(event);
+            },
+        };
+    }
+
+    /**
+     * Measures a synchronous operation.
+     * @param {InstrumentationKind} kind
+     * @param {string} name
+     * @param {InstrumentationAttributes} attributes
+     * @param {() => T} operation
+     * @return {T} Result of the operation.
+     */
+    public measure<T>(kind: InstrumentationKind, name: string, attributes: InstrumentationAttributes, operation: () => T): T {
+        if (!this.observer) {
+            return operation();
+        }
+        const span = this.start(kind, name, attributes);
+        try {
+            const result = operation();
+            span.end();
+            return result;
+        } catch (error) {
+            span.end(undefined, error);
+            throw error;
+        }
+    }
+
+    /**
+     * Measures an asynchronous operation until its promise settles.
+     * @param {InstrumentationKind} kind
+     * @param {string} name
+     * @param {InstrumentationAttributes} attributes
+     * @param {() => Promise<T>} operation
+     * @return {Promise<T>} Result of the operation.
+     */
+    public async measureAsync<T>(
+        kind: InstrumentationKind,
+        name: string,
+        attributes: InstrumentationAttributes,
+        operation: () => Promise<T>
+    ): Promise<T> {
+        if (!this.observer) {
+            return operation();
+        }
+        const span = this.start(kind, name, attributes);
+        try {
+            const result = await operation();
+            span.end();
+            return result;
+        } catch (error) {
+            span.end(undefined, error);
+            throw error;
+        }
+    }
+}
+
+export const NOOP_INSTRUMENTATION = new Instrumentation();
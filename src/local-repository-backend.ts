@@ -0,0 +1,280 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { existsSync, lstatSync, mkdirSync, readdirSync, readFileSync, readlinkSync, statSync, symlinkSync, writeFileSync } from 'fs';
+import * as path from 'path';
+import { Readable } from 'stream';
+import { StatusCodes } from 'http-status-codes';
+import { MainBranchTree, NewTree, RepositoryBackend, TreeFileContent, TreeFiles } from './repository-backend';
+import { TemplateFileResponse } from './template-cache';
+import { computeGitBlobSha } from './utils/gitBlob';
+import { GitObjectStore, GitSignature, GitTreeFile } from './utils/gitObjectStore';
+import {
+    APP_MANIFEST_PATH,
+    DEFAULT_COMMIT_MESSAGE,
+    GIT_DATA_MODES,
+    GIT_DATA_TYPES,
+    INITIAL_COMMIT_MESSAGE,
+    LOCAL_COMMIT_AUTHOR,
+    LOCAL_VSPEC_PATH,
+    MAIN_PY_PATH,
+} from './utils/constants';
+
+const MAIN_BRANCH_REF = 'refs/heads/main';
+
+/**
+ * @type LocalRepositoryBackendOptions
+ * @prop {string} templateDirectory Local checkout of the vehicle app python template.
+ * @prop {string} outputDirectory Directory the project is written to, it must not exist or be empty.
+ * @prop {boolean} bare Write a bare git repository with one commit per update instead of plain files.
+ * @prop {GitSignature} author Author and committer of the commits of a bare repository.
+ */
+export interface LocalRepositoryBackendOptions {
+    templateDirectory: string;
+    outputDirectory: string;
+    bare?: boolean;
+    author?: GitSignature;
+}
+
+interface LocalFile {
+    filePath: string;
+    mode: string;
+    content: Buffer;
+}
+
+/**
+ * Repository backend writing the project without any network access.
+ *
+ * The template files are read from a local checkout of the template instead of GitHub. The project is either
+ * written as plain files or as bare git repository, which can be pushed in one operation or cloned directly.
+ * Like a repository generated by GitHub, a bare repository starts with an initial commit of the template.
+ */
+export class LocalRepositoryBackend implements RepositoryBackend {
+    private templateDirectory: string;
+    private outputDirectory: string;
+    private author: GitSignature;
+    private objectStore?: GitObjectStore;
+    // Blobs of plain file output, a bare repository stores them as objects
+    private blobs = new Map<string, Buffer>();
+
+    /**
+     * @param {LocalRepositoryBackendOptions} options
+     */
+    constructor(options: LocalRepositoryBackendOptions) {
+        this.templateDirectory = options.templateDirectory;
+        this.outputDirectory = options.outputDirectory;
+        this.author = options.author ?? LOCAL_COMMIT_AUTHOR;
+        this.objectStore = options.bare ? new GitObjectStore(options.outputDirectory) : undefined;
+    }
+
+    public async generateRepo(): Promise<number> {
+        if (existsSync(this.outputDirectory) && readdirSync(this.outputDirectory).length > 0) {
+            throw new Error(`Output directory ${this.outputDirectory} is not empty.`);
+        }
+        const templateFiles = this.readFiles(this.templateDirectory);
+        if (!this.objectStore) {
+            templateFiles.forEach((templateFile: LocalFile) => this.writeFile(templateFile));
+            return StatusCodes.OK;
+        }
+        this.objectStore.init();
+        const treeFiles = templateFiles.reduce((files: { [filePath: string]: GitTreeFile }, templateFile: LocalFile) => {
+            files[templateFile.filePath] = {
+                sha: this.objectStore?.writeObject(GIT_DATA_TYPES.blob, templateFile.content) as string,
+                mode: templateFile.mode,
+            };
+            return files;
+        }, {});
+        const treeSha = this.objectStore.writeFiles(undefined, treeFiles);
+        const commitSha = this.objectStore.writeCommit(treeSha, [], INITIAL_COMMIT_MESSAGE, this.author);
+        this.objectStore.updateRef(MAIN_BRANCH_REF, commitSha);
+        return StatusCodes.OK;
+    }
+
+    public async waitForMainBranch(): Promise<number> {
+        return StatusCodes.OK;
+    }
+
+    public async createBlob(fileContent: string): Promise<string> {
+        return this.storeBlob(Buffer.from(fileContent, 'base64'));
+    }
+
+    /**
+     * The content is collected in memory, which is no issue without the request size limits of GitHub.
+     */
+    public async createBlobFromStream(createContentStream: () => Readable): Promise<string> {
+        const chunks: string[] = [];
+        for await (const chunk of createContentStream()) {
+            chunks.push(chunk.toString());
+        }
+        return this.storeBlob(Buffer.from(chunks.join(''), 'base64'));
+    }
+
+    public async updateTree(
+        appManifestFile: TreeFileContent,
+        mainPyFile: TreeFileContent,
+        vspecJsonFile?: TreeFileContent
+    ): Promise<number> {
+        const treeFiles: TreeFiles = { [APP_MANIFEST_PATH]: appManifestFile, [MAIN_PY_PATH]: mainPyFile };
+        if (vspecJsonFile) {
+            treeFiles[LOCAL_VSPEC_PATH] = vspecJsonFile;
+        }
+        const newTree = await this.createTree(treeFiles);
+        return this.updateMainBranch(await this.createCommit(newTree));
+    }
+
+    /**
+     * Plain file output has no commits, so only the blob SHAs of the files are set.
+     */
+    public async getMainBranchTree(): Promise<MainBranchTree> {
+        if (!this.objectStore) {
+            const fileShas = this.readFiles(this.outputDirectory).reduce((shas: { [filePath: string]: string }, localFile: LocalFile) => {
+                shas[localFile.filePath] = computeGitBlobSha(localFile.content);
+                return shas;
+            }, {});
+            return { commitSha: '', treeSha: '', fileShas: fileShas };
+        }
+        const mainBranch = this.readMainBranch();
+        return { ...mainBranch, fileShas: this.objectStore.listFiles(mainBranch.treeSha) };
+    }
+
+    public async updateFiles(treeFiles: TreeFiles, mainBranchTree: MainBranchTree): Promise<number> {
+        const newTree = await this.createTree(treeFiles, mainBranchTree);
+        return this.updateMainBranch(await this.createCommit(newTree));
+    }
+
+    /**
+     * Plain file output has no trees, the files are written right away.
+     */
+    public async createTree(treeFiles: TreeFiles, mainBranchTree?: MainBranchTree): Promise<NewTree> {
+        if (!this.objectStore) {
+            Object.keys(treeFiles).forEach((filePath: string) =>
+                this.writeFile({ filePath: filePath, mode: GIT_DATA_MODES.fileBlob, content: this.getBlobContent(treeFiles[filePath]) })
+            );
+            return { treeSha: '', parentCommitSha: '' };
+        }
+        const mainBranch = mainBranchTree ?? this.readMainBranch();
+        const files = Object.keys(treeFiles).reduce((gitTreeFiles: { [filePath: string]: GitTreeFile }, filePath: string) => {
+            gitTreeFiles[filePath] = { sha: this.getBlobSha(treeFiles[filePath]) };
+            return gitTreeFiles;
+        }, {});
+        return { treeSha: this.objectStore.writeFiles(mainBranch.treeSha, files), parentCommitSha: mainBranch.commitSha };
+    }
+
+    public async createCommit(newTree: NewTree): Promise<string> {
+        if (!this.objectStore) {
+            return '';
+        }
+        return this.objectStore.writeCommit(newTree.treeSha, [newTree.parentCommitSha], DEFAULT_COMMIT_MESSAGE, this.author);
+    }
+
+    /**
+     * The main branch is only moved if it still points to the parent of the commit.
+     */
+    public async updateMainBranch(commitSha: string): Promise<number> {
+        if (!this.objectStore) {
+            return StatusCodes.OK;
+        }
+        const mainBranchSha = this.objectStore.readRef(MAIN_BRANCH_REF);
+        if (mainBranchSha === commitSha) {
+            return StatusCodes.OK;
+        }
+        if (mainBranchSha !== this.objectStore.readCommit(commitSha).parentShas[0]) {
+            throw new Error(`The main branch of ${this.outputDirectory} was changed concurrently.`);
+        }
+        this.objectStore.updateRef(MAIN_BRANCH_REF, commitSha);
+        return StatusCodes.OK;
+    }
+
+    /**
+     * The checkout has a single ref, the modification time and size of the file are used as ETag.
+     */
+    public async getTemplateFileContentData(filePath: string, ref: string, etag?: string): Promise<TemplateFileResponse | undefined> {
+        const templateFilePath = path.join(this.templateDirectory, filePath);
+        const stats = statSync(templateFilePath);
+        const fileEtag = `"${stats.size}-${stats.mtimeMs}"`;
+        if (fileEtag === etag) {
+            return undefined;
+        }
+        return { content: readFileSync(templateFilePath).toString('base64'), etag: fileEtag };
+    }
+
+    private readMainBranch(): { commitSha: string; treeSha: string } {
+        const commitSha = this.objectStore?.readRef(MAIN_BRANCH_REF);
+        if (!this.objectStore || !commitSha) {
+            throw new Error(`${this.outputDirectory} has no main branch.`);
+        }
+        return { commitSha: commitSha, treeSha: this.objectStore.readCommit(commitSha).treeSha };
+    }
+
+    private storeBlob(content: Buffer): string {
+        if (this.objectStore) {
+            return this.objectStore.writeObject(GIT_DATA_TYPES.blob, content);
+        }
+        const blobSha = computeGitBlobSha(content);
+        this.blobs.set(blobSha, content);
+        return blobSha;
+    }
+
+    private getBlobSha(treeFileContent: TreeFileContent): string {
+        return 'sha' in treeFileContent ? treeFileContent.sha : this.storeBlob(Buffer.from(treeFileContent.content));
+    }
+
+    private getBlobContent(treeFileContent: TreeFileContent): Buffer {
+        if ('content' in treeFileContent) {
+            return Buffer.from(treeFileContent.content);
+        }
+        const content = this.blobs.get(treeFileContent.sha);
+        if (!content) {
+            throw new Error(`Blob ${treeFileContent.sha} was not created by this backend.`);
+        }
+        return content;
+    }
+
+    /**
+     * @return {LocalFile[]} All files below the directory except the ones of a `.git` directory.
+     */
+    private readFiles(directory: string, relativeDirectory: string = ''): LocalFile[] {
+        if (!existsSync(directory)) {
+            return [];
+        }
+        const localFiles: LocalFile[] = [];
+        readdirSync(directory).forEach((name: string) => {
+            const filePath = path.join(directory, name);
+            const relativeFilePath = `${relativeDirectory}${name}`;
+            const stats = lstatSync(filePath);
+            if (stats.isDirectory()) {
+                if (name !== '.git') {
+                    localFiles.push(...this.readFiles(filePath, `${relativeFilePath}/`));
+                }
+            } else if (stats.isSymbolicLink()) {
+                const linkTarget = Buffer.from(readlinkSync(filePath));
+                localFiles.push({ filePath: relativeFilePath, mode: GIT_DATA_MODES.symlinkPathBlob, content: linkTarget });
+            } else {
+                const mode = stats.mode & 0o111 ? GIT_DATA_MODES.executableBlob : GIT_DATA_MODES.fileBlob;
+                localFiles.push({ filePath: relativeFilePath, mode: mode, content: readFileSync(filePath) });
+            }
+        });
+        return localFiles;
+    }
+
+    private writeFile(localFile: LocalFile): void {
+        const filePath = path.join(this.outputDirectory, localFile.filePath);
+        mkdirSync(path.dirname(filePath), { recursive: true });
+        if (localFile.mode === GIT_DATA_MODES.symlinkPathBlob) {
+            symlinkSync(localFile.content.toString(), filePath);
+        } else {
+            writeFileSync(filePath, localFile.content, { mode: localFile.mode === GIT_DATA_MODES.executableBlob ? 0o755 : 0o644 });
+        }
+    }
+}
@@ -14,44 +14,64 @@
 
 import { CodeContext } from '../code-converter';
 import { INDENTATION, VELOCITAS } from '../utils/codeConstants';
-import { createMultilineStringFromArray, indentCodeSnippet, variableConditionCheck } from '../utils/helpers';
-import { variableRegex } from '../utils/regex';
-import { PipelineStep } from './pipeline-base';
+import { indentCodeSnippet, indentLines, trimLines, variableConditionCheck } from '../utils/helpers';
+import { anyVariableRegex, unquotedVariableRegex, variableRegex } from '../utils/regex';
+import { CodeContextField, PipelineStep } from './pipeline-base';
 
 /**
  * Creates the code snippet which will be put into the velocitas template
  * @extends PipelineStep
  */
 export class CreateCodeSnippetForTemplateStep extends PipelineStep {
+    readonly inputs: CodeContextField[] = ['codeSnippetStringArray', 'variableNames', 'rewriteRules'];
+    readonly outputs: CodeContextField[] = ['codeSnippetStringArray', 'codeSnippetForTemplate'];
+
     public execute(context: CodeContext) {
         this.changeMemberVariables(context);
-        context.codeSnippetForTemplate = `${indentCodeSnippet(VELOCITAS.ON_START, INDENTATION.COUNT_CLASS)}\n${indentCodeSnippet(
-            this.adaptCodeBlocksToVelocitasStructure(createMultilineStringFromArray(context.codeSnippetStringArray)),
-            INDENTATION.COUNT_METHOD
-        )}`;
+        context.codeSnippetForTemplate = [
+            indentCodeSnippet(VELOCITAS.ON_START, INDENTATION.COUNT_CLASS),
+            ...indentLines(
+                this.adaptCodeBlocksToVelocitasStructure(trimLines(context.codeSnippetStringArray), context.rewriteRules),
+                INDENTATION.COUNT_METHOD
+            ),
+        ];
     }
     private changeMemberVariables(context: CodeContext) {
-        context.variableNames.forEach((variableName: string) => {
-            context.codeSnippetStringArray.forEach((stringElement: string, index) => {
-                if (stringElement.includes(`${variableName} =`) && !stringElement.includes(`self.`)) {
-                    context.codeSnippetStringArray[index] = stringElement.replace(variableName, `self.${variableName}`);
-                }
-                if (stringElement.includes(`, ${variableName}`)) {
-                    const re = new RegExp(`(?<!")${variableName}(?!")`, 'g');
-                    context.codeSnippetStringArray[index] = stringElement.replace(re, `self.${variableName}`);
-                }
-                if (
-                    stringElement.includes(`${variableName} <=`) ||
-                    stringElement.includes(`= ${variableName}`) ||
-                    stringElement.includes(`${variableName} +`)
-                ) {
-                    context.codeSnippetStringArray[index] = stringElement.replace(variableName, `self.${variableName}`);
-                }
-
-                if (variableConditionCheck(stringElement, variableName)) {
-                    context.codeSnippetStringArray[index] = stringElement.replace(variableRegex(variableName), `self.${variableName}`);
+        if (context.variableNames.length === 0) {
+            return;
+        }
+        const containsVariableRegex = anyVariableRegex(context.variableNames);
+        context.codeSnippetStringArray.forEach((codeLine: string, index) => {
+            if (!containsVariableRegex.test(codeLine)) {
+                return;
+            }
+            context.variableNames.forEach((variableName: string) => {
+                if (codeLine.includes(variableName)) {
+                    codeLine = this.changeMemberVariable(codeLine, variableName);
                 }
             });
+            context.codeSnippetStringArray[index] = codeLine;
         });
     }
+    private changeMemberVariable(stringElement: string, variableName: string): string {
+        let changedLine = stringElement;
+        if (stringElement.includes(`${variableName} =`) && !stringElement.includes(`self.`)) {
+            changedLine = stringElement.replace(variableName, `self.${variableName}`);
+        }
+        if (stringElement.includes(`, ${variableName}`)) {
+            changedLine = stringElement.replace(unquotedVariableRegex(variableName), `self.${variableName}`);
+        }
+        if (
+            stringElement.includes(`${variableName} <=`) ||
+            stringElement.includes(`= ${variableName}`) ||
+            stringElement.includes(`${variableName} +`)
+        ) {
+            changedLine = stringElement.replace(variableName, `self.${variableName}`);
+        }
+
+        if (variableConditionCheck(stringElement, variableName)) {
+            changedLine = stringElement.replace(variableRegex(variableName), `self.${variableName}`);
+        }
+        return changedLine;
+    }
 }
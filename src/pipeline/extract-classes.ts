@@ -15,40 +15,44 @@
 import { CodeContext } from '../code-converter';
 import { PYTHON } from '../utils/codeConstants';
 import { REGEX } from '../utils/regex';
-import { createMultilineStringFromArray } from '../utils/helpers';
-import { PipelineStep } from './pipeline-base';
+import { LINE_KIND } from '../utils/lineIndex';
+import { joinLineBlocks } from '../utils/helpers';
+import { CodeContextField, LineRange, PipelineStep } from './pipeline-base';
 
 /**
  * Extracts classes from digital.auto prototype to the CodeContext
  * @extends PipelineStep
  */
 export class ExtractClassesStep extends PipelineStep {
+    readonly inputs: CodeContextField[] = ['codeSnippetStringArray', 'rewriteRules'];
+    readonly outputs: CodeContextField[] = ['seperateClassesArray', 'seperateClasses', 'codeSnippetStringArray'];
+
+    public canSkip(context: CodeContext): boolean {
+        return context.codeSnippetIndex.linesOfKind(LINE_KIND.CLASS).length === 0;
+    }
     public execute(context: CodeContext) {
-        context.seperateClassesArray = this.identifySeperateClass(context);
+        const classLineRanges: LineRange[] = [];
+        context.seperateClassesArray = this.identifySeperateClass(context, classLineRanges);
         if (context.seperateClassesArray.length !== 0) {
             context.seperateClasses = this.adaptCodeBlocksToVelocitasStructure(
-                createMultilineStringFromArray(context.seperateClassesArray)
+                joinLineBlocks(context.seperateClassesArray),
+                context.rewriteRules
             );
         }
-        this.cleanUpCodeSnippet(context.seperateClassesArray, context);
+        this.removeLineRanges(classLineRanges, context);
     }
-    private identifySeperateClass(context: CodeContext): string[][] {
-        const classStartIndexArray: number[] = [];
-
-        context.codeSnippetStringArray.forEach((stringElement: string) => {
-            if (stringElement.includes(PYTHON.CLASS)) {
-                const classStartIndex = context.codeSnippetStringArray?.indexOf(stringElement);
-                classStartIndexArray.push(classStartIndex as number);
-            }
-        });
+    private identifySeperateClass(context: CodeContext, classLineRanges: LineRange[]): string[][] {
+        const classStartIndexArray = context.codeSnippetIndex.linesOfKind(LINE_KIND.CLASS);
 
         const classArray: string[][] = [];
         classStartIndexArray.forEach((classStartIndexElement: number) => {
             const tempClasses: string[] = [];
-            for (let index = classStartIndexElement; this.lineBelongsToClass(context.codeSnippetStringArray, index); index++) {
+            let index = classStartIndexElement;
+            for (; this.lineBelongsToClass(context.codeSnippetStringArray, index); index++) {
                 tempClasses.push(context.codeSnippetStringArray[index]);
             }
             classArray.push(tempClasses);
+            classLineRanges.push({ start: classStartIndexElement, end: index });
         });
         return classArray;
     }
@@ -14,20 +14,29 @@
 
 import { CodeContext } from '../code-converter';
 import { PYTHON } from '../utils/codeConstants';
-import { PipelineStep } from './pipeline-base';
+import { CodeContextField, LineRange, PipelineStep } from './pipeline-base';
 
 /**
  * Extracts imports from digital.auto prototype to the CodeContext
  * @extends PipelineStep
  */
 export class ExtractImportsStep extends PipelineStep {
+    readonly inputs: CodeContextField[] = ['codeSnippetStringArray'];
+    readonly outputs: CodeContextField[] = ['basicImportsArray', 'codeSnippetStringArray'];
+
     public execute(context: CodeContext) {
-        context.basicImportsArray = this.identifyBasicImports(context);
-        this.cleanUpCodeSnippet(context.basicImportsArray, context);
+        const importLineRanges: LineRange[] = [];
+        context.basicImportsArray = this.identifyBasicImports(context, importLineRanges);
+        this.removeLineRanges(importLineRanges, context);
     }
-    private identifyBasicImports(context: CodeContext): string[] {
-        let basicImportsArray: string[] = [];
-        basicImportsArray = context.codeSnippetStringArray.filter((stringElement) => stringElement.includes(PYTHON.IMPORT));
+    private identifyBasicImports(context: CodeContext, importLineRanges: LineRange[]): string[] {
+        const basicImportsArray: string[] = [];
+        context.codeSnippetStringArray.forEach((stringElement: string, index: number) => {
+            if (stringElement.includes(PYTHON.IMPORT)) {
+                basicImportsArray.push(stringElement);
+                importLineRanges.push({ start: index, end: index + 1 });
+            }
+        });
         return basicImportsArray;
     }
 }
@@ -14,39 +14,43 @@
 
 import { CodeContext } from '../code-converter';
 import { DIGITAL_AUTO, INDENTATION, PYTHON, VELOCITAS } from '../utils/codeConstants';
-import { createMultilineStringFromArray, indentCodeSnippet, variableConditionCheck } from '../utils/helpers';
-import { variableRegex } from '../utils/regex';
-import { PipelineStep } from './pipeline-base';
+import { indentCodeSnippet, indentLines, joinLineBlocks, variableConditionCheck } from '../utils/helpers';
+import { variablesRegex } from '../utils/regex';
+import { CodeLineIndex, LINE_KIND } from '../utils/lineIndex';
+import { CodeContextField, LineRange, PipelineStep } from './pipeline-base';
 
 /**
  * Extracts methods from digital.auto prototype to the CodeContext
  * @extends PipelineStep
  */
 export class ExtractMethodsStep extends PipelineStep {
+    readonly inputs: CodeContextField[] = ['codeSnippetStringArray', 'variableNames', 'rewriteRules'];
+    readonly outputs: CodeContextField[] = ['seperateMethodsArray', 'seperateMethods', 'codeSnippetStringArray'];
+
+    public canSkip(context: CodeContext): boolean {
+        return context.codeSnippetIndex.linesOfKind(LINE_KIND.METHOD).length === 0;
+    }
     public execute(context: CodeContext) {
         context.seperateMethodsArray = this.identifyMethodBlocks(context);
         if (context.seperateMethodsArray.length !== 0) {
-            context.seperateMethods = createMultilineStringFromArray(context.seperateMethodsArray as string[][]);
-            context.seperateMethods = this.adaptCodeBlocksToVelocitasStructure(context.seperateMethods);
-            context.seperateMethods = indentCodeSnippet(context.seperateMethods, INDENTATION.COUNT_CLASS);
+            context.seperateMethods = this.adaptCodeBlocksToVelocitasStructure(
+                joinLineBlocks(context.seperateMethodsArray),
+                context.rewriteRules
+            );
+            context.seperateMethods = indentLines(context.seperateMethods, INDENTATION.COUNT_CLASS);
         }
     }
     private identifyMethodBlocks(context: CodeContext): string[][] {
-        const methodStartIndexArray: number[] = [];
-        context.codeSnippetStringArray.forEach((stringElement: string) => {
-            if (stringElement.includes(PYTHON.SYNC_METHOD_START)) {
-                const methodStartIndex = context.codeSnippetStringArray?.indexOf(stringElement);
-                methodStartIndexArray.push(methodStartIndex as number);
-            }
-        });
-        const methodArray: string[][] = [];
+        const codeSnippetIndex = context.codeSnippetIndex;
+        const methodStartIndexArray = codeSnippetIndex.linesOfKind(LINE_KIND.METHOD);
+        const memberVariablesRegex = context.variableNames.length > 0 ? variablesRegex(context.variableNames) : undefined;
+        const methodLineRanges: LineRange[] = [];
         const modifiedMethodArray: string[][] = [];
         methodStartIndexArray.forEach((methodStartIndex: number) => {
-            const tempMethods: string[] = [];
             const tempModifiedMethods: string[] = [];
-            for (let index = methodStartIndex; /\S/.test(context.codeSnippetStringArray[index]); index++) {
-                tempMethods.push(context.codeSnippetStringArray[index]);
-                if (context.codeSnippetStringArray[index].includes(PYTHON.SYNC_METHOD_START)) {
+            let index = methodStartIndex;
+            for (; index < context.codeSnippetStringArray.length && /\S/.test(context.codeSnippetStringArray[index]); index++) {
+                if (codeSnippetIndex.isKind(index, LINE_KIND.METHOD)) {
                     let methodLine: string;
                     if (context.codeSnippetStringArray[index].startsWith(PYTHON.ASYNC_METHOD_START)) {
                         methodLine = context.codeSnippetStringArray[index].replace(/\(.*\)/, VELOCITAS.CLASS_METHOD_SIGNATURE);
@@ -55,34 +59,25 @@ export class ExtractMethodsStep extends PipelineStep {
                             .replace(PYTHON.SYNC_METHOD_START, PYTHON.ASYNC_METHOD_START)
                             .replace(/\(.*\)/, VELOCITAS.CLASS_METHOD_SIGNATURE);
                     }
-                    const subscriptionCallbackVariableLine = this.mapSubscriptionCallbackForVelocitas(
-                        context.codeSnippetStringArray,
-                        index
-                    );
+                    const subscriptionCallbackVariableLine = this.mapSubscriptionCallbackForVelocitas(codeSnippetIndex, index);
                     tempModifiedMethods.push(methodLine);
                     tempModifiedMethods.push(subscriptionCallbackVariableLine);
                 } else {
-                    tempModifiedMethods.push(this.changeMemberVariablesInString(context.codeSnippetStringArray[index], context));
+                    tempModifiedMethods.push(
+                        this.changeMemberVariablesInString(context.codeSnippetStringArray[index], memberVariablesRegex)
+                    );
                 }
             }
-            methodArray.push(tempMethods);
+            methodLineRanges.push({ start: methodStartIndex, end: index });
             modifiedMethodArray.push(tempModifiedMethods);
         });
-        this.cleanUpCodeSnippet(methodArray, context);
+        this.removeLineRanges(methodLineRanges, context);
         return modifiedMethodArray;
     }
-    private mapSubscriptionCallbackForVelocitas(codeSnippetStringArray: string[], index: number): string {
-        const methodString = codeSnippetStringArray[index];
-        let methodName: any;
-        let vssSignal;
-        methodName = codeSnippetStringArray
-            ?.find((line: string) => line.includes(methodString))
-            ?.split(PYTHON.SYNC_METHOD_START)[1]
-            .trim()
-            .split(`(`)[0];
-        vssSignal = codeSnippetStringArray
-            ?.find((line: string) => line.includes(`${DIGITAL_AUTO.SUBSCRIBE_CALL}${methodName}`))
-            ?.split(`${DIGITAL_AUTO.SUBSCRIBE_CALL}`)[0];
+    private mapSubscriptionCallbackForVelocitas(codeSnippetIndex: CodeLineIndex, index: number): string {
+        const methodString = codeSnippetIndex.lines[index];
+        const methodName = methodString.split(PYTHON.SYNC_METHOD_START)[1].trim().split(`(`)[0];
+        let vssSignal = codeSnippetIndex.subscribeLineOf(methodName)?.split(`${DIGITAL_AUTO.SUBSCRIBE_CALL}`)[0];
 
         if (vssSignal?.startsWith(`${PYTHON.AWAIT} `)) {
             vssSignal = vssSignal.split(`${PYTHON.AWAIT} `)[1];
@@ -95,12 +90,16 @@ export class ExtractMethodsStep extends PipelineStep {
         );
         return subscriptionCallbackVariableLine;
     }
-    private changeMemberVariablesInString(codeSnippet: string, context: CodeContext): string {
-        context.variableNames?.forEach((variableName: string) => {
-            if (variableConditionCheck(codeSnippet, variableName)) {
-                codeSnippet = codeSnippet.replace(variableRegex(variableName), `self.${variableName}`);
+    private changeMemberVariablesInString(codeSnippet: string, memberVariablesRegex: RegExp | undefined): string {
+        if (!memberVariablesRegex) {
+            return codeSnippet;
+        }
+        const isMemberVariable = new Map<string, boolean>();
+        return codeSnippet.replace(memberVariablesRegex, (variableName: string) => {
+            if (!isMemberVariable.has(variableName)) {
+                isMemberVariable.set(variableName, variableConditionCheck(codeSnippet, variableName));
             }
+            return isMemberVariable.get(variableName) ? `self.${variableName}` : variableName;
         });
-        return codeSnippet;
     }
 }
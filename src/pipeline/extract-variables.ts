@@ -14,29 +14,38 @@
 
 import { CodeContext } from '../code-converter';
 import { INDENTATION } from '../utils/codeConstants';
-import { createMultilineStringFromArray, indentCodeSnippet } from '../utils/helpers';
-import { PipelineStep } from './pipeline-base';
+import { indentLines } from '../utils/helpers';
+import { LINE_KIND } from '../utils/lineIndex';
+import { CodeContextField, PipelineStep } from './pipeline-base';
 
 /**
  * Extracts variables from digital.auto prototype to the CodeContext
  * @extends PipelineStep
  */
 export class ExtractVariablesStep extends PipelineStep {
+    readonly inputs: CodeContextField[] = ['codeSnippetStringArray'];
+    readonly outputs: CodeContextField[] = ['variablesArray', 'variableNames', 'memberVariables'];
+
+    public canSkip(context: CodeContext): boolean {
+        return context.codeSnippetIndex.linesOfKind(LINE_KIND.ASSIGNMENT).length === 0;
+    }
     public execute(context: CodeContext) {
-        context.variablesArray = this.identifyVariables(context.codeSnippetStringArray);
+        context.variablesArray = this.identifyVariables(context);
         context.variableNames = this.identifyVariableNames(context.variablesArray);
         if (context.variableNames?.length != 0) {
             context.memberVariables = this.prepareMemberVariables(context);
         }
     }
-    private identifyVariables(codeSnippetStringArray: string[]) {
+    private identifyVariables(context: CodeContext) {
+        const codeSnippetStringArray = context.codeSnippetStringArray;
         const variablesArray: string[][] = [];
-        codeSnippetStringArray.forEach((stringElement) => {
+        context.codeSnippetIndex.linesOfKind(LINE_KIND.ASSIGNMENT).forEach((lineNumber: number) => {
+            const stringElement = codeSnippetStringArray[lineNumber];
             if (!stringElement.includes('plugins')) {
                 const tempVariables: string[] = [];
                 if (stringElement.includes('= {')) {
                     for (
-                        let index = codeSnippetStringArray.indexOf(stringElement);
+                        let index = lineNumber;
                         codeSnippetStringArray[index] !== '' && !codeSnippetStringArray[index].includes('}}');
                         index++
                     ) {
@@ -71,12 +80,12 @@ export class ExtractVariablesStep extends PipelineStep {
         return variableNames;
     }
 
-    private prepareMemberVariables(context: CodeContext): string {
+    private prepareMemberVariables(context: CodeContext): string[] {
         const memberVariablesArray: string[] = [];
         context.variableNames.forEach((variable: string) => {
             memberVariablesArray.push(`self.${variable.trim()} = None`);
         });
-        const memberVariables = indentCodeSnippet(createMultilineStringFromArray(memberVariablesArray), INDENTATION.COUNT_METHOD);
+        const memberVariables = indentLines(memberVariablesArray, INDENTATION.COUNT_METHOD);
         return memberVariables;
     }
 }
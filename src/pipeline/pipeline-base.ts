@@ -13,12 +13,28 @@
 // SPDX-License-Identifier: Apache-2.0
 
 import { CodeContext } from '../code-converter';
-import { VELOCITAS } from '../utils/codeConstants';
-import { REGEX } from '../utils/regex';
+import { RewriteRuleSet, VELOCITAS_STRUCTURE_RULES } from '../utils/rewriteRules';
+
+/**
+ * Lines `start` up to, but not including, `end` of the code snippet.
+ * @type LineRange
+ */
+export interface LineRange {
+    start: number;
+    end: number;
+}
+
+/**
+ * Field of the `CodeContext` which is read or written by pipeline steps.
+ */
+export type CodeContextField = Exclude<keyof CodeContext, 'appName' | 'codeSnippetIndex' | 'invalidateCodeSnippetIndex'>;
 
 export interface IPipelineStep {
+    readonly inputs: CodeContextField[];
+    readonly outputs: CodeContextField[];
     execute(context: CodeContext): void;
-    cleanUpCodeSnippet(arrayToCleanUp: string[] | string[][], codeContext: CodeContext): void;
+    canSkip(context: CodeContext): boolean;
+    removeLineRanges(lineRanges: LineRange[], codeContext: CodeContext): void;
 }
 
 /**
@@ -26,35 +42,47 @@ export interface IPipelineStep {
  * To be used to extend the functionality for more detailed pipeline steps.
  */
 export class PipelineStep implements IPipelineStep {
+    // Fields the step reads, its outputs may only depend on them
+    readonly inputs: CodeContextField[] = [];
+    // Fields the step writes, all other fields have to be left unchanged
+    readonly outputs: CodeContextField[] = [];
+
     /**
      * @param {CodeContext} context
      */
     public execute(context: CodeContext): void {}
-    cleanUpCodeSnippet(arrayToCleanUp: string[] | string[][], codeContext: CodeContext): void {
-        if (arrayToCleanUp.length === 0) {
+    /**
+     * Cheap check whether `execute` would leave all outputs unchanged, e.g. as the code snippet has no lines of a kind.
+     * @param {CodeContext} context
+     * @return {boolean}
+     */
+    public canSkip(context: CodeContext): boolean {
+        return false;
+    }
+    /**
+     * Removes the lines of all ranges from the code snippet in a single pass, ranges may overlap.
+     * @param {LineRange[]} lineRanges Line numbers of the current code snippet.
+     * @param {CodeContext} codeContext
+     */
+    removeLineRanges(lineRanges: LineRange[], codeContext: CodeContext): void {
+        if (lineRanges.length === 0) {
             return;
         }
-        let linesToRemove: string[] = [];
-        if (arrayToCleanUp[0].constructor === Array) {
-            (arrayToCleanUp as string[][]).forEach((array: string[]) => {
-                linesToRemove = [...linesToRemove, ...array];
-            });
-        } else {
-            (arrayToCleanUp as string[]).forEach((string: string) => {
-                linesToRemove.push(string);
-            });
-        }
-        linesToRemove.forEach((lineToRemove: string) => {
-            if (codeContext.codeSnippetStringArray.indexOf(lineToRemove) >= 0) {
-                codeContext.codeSnippetStringArray?.splice(codeContext.codeSnippetStringArray.indexOf(lineToRemove), 1);
-            }
+        const lines = codeContext.codeSnippetStringArray;
+        // Counts the ranges starting and ending at every line, their running sum is the number of ranges covering a line
+        const rangeBoundaries = new Int32Array(lines.length + 1);
+        lineRanges.forEach((lineRange: LineRange) => {
+            rangeBoundaries[lineRange.start]++;
+            rangeBoundaries[Math.min(lineRange.end, lines.length)]--;
+        });
+        let coveringRanges = 0;
+        codeContext.codeSnippetStringArray = lines.filter((_line: string, index: number) => {
+            coveringRanges += rangeBoundaries[index];
+            return coveringRanges === 0;
         });
+        codeContext.invalidateCodeSnippetIndex();
     }
-    adaptCodeBlocksToVelocitasStructure(codeBlock: string): string {
-        return codeBlock
-            .replace(REGEX.FIND_VEHICLE_OCCURENCE, VELOCITAS.VEHICLE_CALL)
-            .replace(REGEX.FIND_UNWANTED_VEHICLE_CHANGE, VELOCITAS.VEHICLE_CALL_AS_ARGUMENT)
-            .replace(REGEX.FIND_PRINTF_STATEMENTS, VELOCITAS.INFO_LOGGER_SIGNATURE)
-            .replace(REGEX.FIND_PRINT_STATEMENTS, VELOCITAS.INFO_LOGGER_SIGNATURE);
+    adaptCodeBlocksToVelocitasStructure(codeBlock: string[], rewriteRules: RewriteRuleSet = VELOCITAS_STRUCTURE_RULES): string[] {
+        return codeBlock.map((codeLine: string) => rewriteRules.apply(codeLine));
     }
 }
@@ -0,0 +1,131 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+
+import { CodeContext } from '../code-converter';
+import { Instrumentation, NOOP_INSTRUMENTATION } from '../instrumentation';
+import { PIPELINE_STEP_RESULTS } from '../utils/constants';
+import { LruCache } from '../utils/lruCache';
+import { RewriteRuleSet } from '../utils/rewriteRules';
+import { CodeContextField, IPipelineStep } from './pipeline-base';
+
+/**
+ * How a scheduled step was run, reported as `outcome` of its instrumentation event.
+ */
+export type StepOutcome = 'executed' | 'reused' | 'skipped';
+
+interface StepResult {
+    outputs: Partial<Record<CodeContextField, unknown>>;
+    bytes: number;
+}
+
+// Copies the nested string arrays of a context field, as later steps change them in place
+const copyValue = (value: unknown): { value: unknown; bytes: number } => {
+    if (typeof value === 'string') {
+        return { value: value, bytes: value.length * 2 };
+    }
+    if (Array.isArray(value)) {
+        let bytes = 0;
+        const copiedValue = value.map((element: unknown) => {
+            const copiedElement = copyValue(element);
+            bytes += copiedElement.bytes;
+            return copiedElement.value;
+        });
+        return { value: copiedValue, bytes: bytes };
+    }
+    return { value: value, bytes: 0 };
+};
+
+// Shared by all schedulers reusing results, a key identifies the step and the values of its inputs
+const STEP_RESULT_CACHE = new LruCache<string, StepResult>(
+    PIPELINE_STEP_RESULTS.maxEntries,
+    PIPELINE_STEP_RESULTS.maxBytes,
+    (stepResult: StepResult) => stepResult.bytes
+);
+
+/**
+ * Runs pipeline steps in order, based on the `CodeContext` fields they declare to read and write.
+ * Steps which would leave their outputs unchanged are skipped and with `reuseResults` the outputs of a step
+ * are taken from an earlier run, if its inputs had the same values.
+ */
+export class PipelineScheduler {
+    /**
+     * @param {IPipelineStep[]} steps In order of execution.
+     * @param {CodeContextField[]} initialFields Fields which are set before the pipeline runs.
+     * @param {boolean} reuseResults
+     * @throws {Error} If a step reads a field which is neither initial nor written by an earlier step.
+     */
+    constructor(private steps: IPipelineStep[], initialFields: CodeContextField[], private reuseResults: boolean = false) {
+        const availableFields = new Set<CodeContextField>(initialFields);
+        steps.forEach((step: IPipelineStep) => {
+            const unavailableInput = step.inputs.find((input: CodeContextField) => !availableFields.has(input));
+            if (unavailableInput) {
+                throw new Error(`Pipeline step ${step.constructor.name} reads ${unavailableInput}, which no earlier step writes.`);
+            }
+            step.outputs.forEach((output: CodeContextField) => availableFields.add(output));
+        });
+    }
+
+    /**
+     * @param {CodeContext} context
+     * @param {Instrumentation} instrumentation Measures every step.
+     */
+    public run(context: CodeContext, instrumentation: Instrumentation = NOOP_INSTRUMENTATION): void {
+        this.steps.forEach((step: IPipelineStep) => {
+            const stepSpan = instrumentation.start('pipelineStep', step.constructor.name, { lines: context.codeSnippetStringArray.length });
+            try {
+                stepSpan.end({ outcome: this.runStep(step, context) });
+            } catch (error) {
+                stepSpan.end(undefined, error);
+                throw error;
+            }
+        });
+    }
+
+    private runStep(step: IPipelineStep, context: CodeContext): StepOutcome {
+        if (step.canSkip(context)) {
+            return 'skipped';
+        }
+        const key = this.reuseResults ? this.createKey(step, context) : undefined;
+        if (key === undefined) {
+            step.execute(context);
+            return 'executed';
+        }
+        const storedResult = STEP_RESULT_CACHE.get(key);
+        if (storedResult) {
+            step.outputs.forEach((output: CodeContextField) => {
+                (context as any)[output] = copyValue(storedResult.outputs[output]).value;
+            });
+            return 'reused';
+        }
+        step.execute(context);
+        const stepResult: StepResult = { outputs: {}, bytes: key.length * 2 };
+        step.outputs.forEach((output: CodeContextField) => {
+            const copiedOutput = copyValue(context[output]);
+            stepResult.outputs[output] = copiedOutput.value;
+            stepResult.bytes += copiedOutput.bytes;
+        });
+        STEP_RESULT_CACHE.set(key, stepResult);
+        return 'executed';
+    }
+
+    // Undefined if an input can not be identified, e.g. rewrite rules with function replacements
+    private createKey(step: IPipelineStep, context: CodeContext): string | undefined {
+        const inputValues = step.inputs.map((input: CodeContextField) => {
+            const value = context[input];
+            return value instanceof RewriteRuleSet ? value.signature : value;
+        });
+        return inputValues.includes(undefined) ? undefined : `${step.constructor.name}${JSON.stringify(inputValues)}`;
+    }
+}
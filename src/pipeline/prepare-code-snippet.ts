@@ -14,13 +14,16 @@
 
 import { CodeContext } from '../code-converter';
 import { DIGITAL_AUTO, PYTHON } from '../utils/codeConstants';
-import { PipelineStep } from './pipeline-base';
+import { CodeContextField, PipelineStep } from './pipeline-base';
 
 /**
  * Prepares digital.auto prototype code snippet to be used to extract all relevant and needed information.
  * @extends PipelineStep
  */
 export class PrepareCodeSnippetStep extends PipelineStep {
+    readonly inputs: CodeContextField[] = ['codeSnippetStringArray'];
+    readonly outputs: CodeContextField[] = ['codeSnippetStringArray'];
+
     public execute(context: CodeContext) {
         context.codeSnippetStringArray = this.removeSubstringsFromArray(context.codeSnippetStringArray, DIGITAL_AUTO.VEHICLE_INIT);
         context.codeSnippetStringArray = this.removeSubstringsFromArray(
@@ -32,24 +35,8 @@ export class PrepareCodeSnippetStep extends PipelineStep {
     }
 
     private removeSubstringsFromArray(array: string[], substringOne: string, substringTwo?: string): string[] {
-        const indexesToRemove: number[] = [];
-        array.forEach((stringElement: string) => {
-            if (!substringTwo && stringElement.includes(substringOne)) {
-                const indexToRemove = array.indexOf(stringElement);
-                indexesToRemove.push(indexToRemove);
-            }
-            if (substringTwo && stringElement.includes(substringOne) && stringElement.includes(substringTwo)) {
-                const indexToRemove = array.indexOf(stringElement);
-                indexesToRemove.push(indexToRemove);
-            }
-        });
-        for (let index = 0; index < indexesToRemove.length; index++) {
-            if (index === 0) {
-                array.splice(indexesToRemove[index], 1);
-            } else {
-                array.splice(indexesToRemove[index] - index, 1);
-            }
-        }
-        return array;
+        return array.filter(
+            (stringElement: string) => !(stringElement.includes(substringOne) && (!substringTwo || stringElement.includes(substringTwo)))
+        );
     }
 }
@@ -0,0 +1,118 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { PYTHON, VELOCITAS } from './utils/codeConstants';
+import { createArrayFromMultilineString, removeMultilineStrings, trimLines } from './utils/helpers';
+
+/**
+ * Splits the template main.py into lines and drops comments and predefined topics.
+ * @param {string} mainPyContentData Decoded template main.py.
+ * @return {string[]} Parsed template lines.
+ */
+export const parseMainPyTemplate = (mainPyContentData: string): string[] =>
+    createArrayFromMultilineString(mainPyContentData).filter(
+        (line) =>
+            (!line.includes(` ${PYTHON.COMMENT} `) || line.includes(VELOCITAS.TYPE_IGNORE)) && !line.includes(VELOCITAS.PREDEFINED_TOPIC)
+    );
+
+const countMultilineStringQuotes = (lines: string[]): number =>
+    lines.reduce((count: number, line: string) => count + line.split(PYTHON.MULTILINE_STRING).length - 1, 0);
+
+const isBalanced = (lines: string[]): boolean => countMultilineStringQuotes(lines) % 2 === 0;
+
+/**
+ * Data of a `PreparedTemplate`, e.g. after it was posted to a worker thread, which only keeps the fields.
+ * @type PreparedTemplateParts
+ */
+export interface PreparedTemplateParts {
+    content: string;
+    lines: string[];
+    head: string[];
+    body: string[];
+    tail: string[];
+}
+
+/**
+ * Velocitas template main.py parsed once, to be reused for converting many code snippets.
+ *
+ * The skeleton is split at the insertion points for the extracted classes and methods, every part is
+ * already trimmed and free of multiline strings, so a conversion only has to splice in the snippet parts.
+ */
+export class PreparedTemplate implements PreparedTemplateParts {
+    /** Decoded template main.py the template was prepared from. */
+    readonly content: string;
+    /** Parsed template lines, used when snippet parts can not be spliced into the prepared skeleton. */
+    readonly lines: string[];
+    /** Lines before the insertion point of the extracted classes. */
+    readonly head: string[];
+    /** Lines from the insertion point of the extracted classes up to and including on_start. */
+    readonly body: string[];
+    /** Lines from the insertion point of the extracted methods up to the end of the template. */
+    readonly tail: string[];
+
+    /**
+     * @param {string} mainPyContentData Decoded template main.py.
+     * @throws {Error} If the template lacks the SampleApp class, on_start or main.
+     */
+    constructor(mainPyContentData: string) {
+        this.content = mainPyContentData;
+        this.lines = parseMainPyTemplate(mainPyContentData);
+        const trimmedLines = trimLines(this.lines);
+        const classStartIndex = trimmedLines.indexOf(VELOCITAS.SAMPLE_APP_CLASS);
+        const onStartIndex = trimmedLines.indexOf(`    ${VELOCITAS.ON_START}`);
+        const mainIndex = trimmedLines.indexOf(VELOCITAS.MAIN_METHOD);
+        if (classStartIndex < 1 || onStartIndex < classStartIndex || mainIndex <= onStartIndex + 1) {
+            throw new Error('Template main.py does not match the Velocitas structure.');
+        }
+        const parts = [
+            trimmedLines.slice(0, classStartIndex - 1),
+            trimmedLines.slice(classStartIndex - 1, onStartIndex + 1),
+            trimmedLines.slice(mainIndex - 1),
+        ];
+        if (!parts.every(isBalanced) || parts[0].every((line: string) => line.trim() === '')) {
+            throw new Error('Template main.py does not match the Velocitas structure.');
+        }
+        [this.head, this.body, this.tail] = parts.map(removeMultilineStrings);
+    }
+
+    /**
+     * Restores a prepared template without parsing the template main.py again.
+     * @param {PreparedTemplateParts} parts
+     * @return {PreparedTemplate}
+     */
+    public static fromParts(parts: PreparedTemplateParts): PreparedTemplate {
+        return Object.assign(Object.create(PreparedTemplate.prototype), {
+            content: parts.content,
+            lines: parts.lines,
+            head: parts.head,
+            body: parts.body,
+            tail: parts.tail,
+        });
+    }
+
+    /**
+     * Builds the main.py base structure from the prepared skeleton and the snippet derived parts.
+     * @param {string[]} classes Classes extracted from the code snippet.
+     * @param {string[]} methods Methods extracted from the code snippet, already surrounded by empty lines.
+     * @return {string[] | undefined} Base structure, or undefined if the parts have to be merged with the full template.
+     */
+    public assemble(classes: string[], methods: string[]): string[] | undefined {
+        // Classes are inserted before on_start and main are looked up, so they must not contain these lines
+        const anchors = [`    ${VELOCITAS.ON_START}`, VELOCITAS.MAIN_METHOD];
+        if (classes.some((line: string) => anchors.includes(line)) || !isBalanced(classes) || !isBalanced(methods)) {
+            return undefined;
+        }
+        return [...this.head, ...removeMultilineStrings(classes), ...this.body, ...removeMultilineStrings(methods), ...this.tail];
+    }
+}
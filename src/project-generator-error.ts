@@ -12,7 +12,8 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
-import { AxiosError } from 'axios';
+import type { AxiosError } from 'axios';
+import { GenerationCheckpoint } from './generation-checkpoint';
 
 /**
  * ProjectGeneratorError puts all relevant information together
@@ -22,17 +23,57 @@ import { AxiosError } from 'axios';
  * @property {number | undefined} error.statusCode        - API response status code.
  * @property {string | undefined} error.statusText        - API response status text.
  * @property {string[] | undefined} error.responseMessage - Contains API response messages if available.
+ * @property {GenerationCheckpoint | undefined} error.checkpoint - Last checkpoint of a failed generation, to resume it.
+ *
+ * It has the fields of the `AxiosError` it was created from, e.g. `response`, `config` and `code`, and `isAxiosError`
+ * is true, but it does not extend `AxiosError`, so importing the package does not load axios.
  */
-export class ProjectGeneratorError extends AxiosError {
+export class ProjectGeneratorError extends Error {
     statusCode: number | undefined;
     statusText: string | undefined;
     responseMessages: string[] | undefined;
+    checkpoint: GenerationCheckpoint | undefined;
+    config: AxiosError['config'];
+    code: AxiosError['code'];
+    request: AxiosError['request'];
+    response: AxiosError['response'];
+    isAxiosError: boolean = true;
     constructor(error: AxiosError) {
-        const errors = (error.response?.data as any).errors;
+        const errors = (error.response?.data as any)?.errors;
         super(error.message);
         this.name = 'ProjectGeneratorError';
+        this.config = error.config;
+        this.code = error.code;
+        this.request = error.request;
+        this.response = error.response;
         this.statusCode = error.response?.status;
         this.statusText = error.response?.statusText;
-        this.responseMessages = errors ? errors : (error.response?.data as any).message;
+        this.responseMessages = errors ? errors : (error.response?.data as any)?.message;
+    }
+
+    // Same as `AxiosError.toJSON`
+    public toJSON(): object {
+        return {
+            message: this.message,
+            name: this.name,
+            stack: this.stack,
+            config: this.config,
+            code: this.code,
+            status: this.response?.status,
+        };
+    }
+}
+
+/**
+ * UnknownSignalsError lists the datapoints used by the app which do not exist in the vspec.
+ *
+ * @property {string} error.name      - Name of the error.
+ * @property {string} error.message   - Error message.
+ * @property {string[]} error.signals - Paths of the unknown signals.
+ */
+export class UnknownSignalsError extends Error {
+    constructor(readonly signals: string[]) {
+        super(`Signals not found in the vspec: ${signals.join(', ')}`);
+        this.name = 'UnknownSignalsError';
     }
 }
@@ -0,0 +1,145 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as https from 'https';
+import { ProjectGenerator, ProjectGeneratorOptions } from './project-generator';
+import { ConcurrencyLimiter } from './utils/concurrencyLimiter';
+import { MAX_CONCURRENT_JOBS, MAX_SOCKETS } from './utils/constants';
+import { createItemPuller } from './utils/itemPuller';
+import { RateLimitScheduler } from './utils/rateLimitScheduler';
+
+/**
+ * Project to be generated by a `ProjectGeneratorPool`.
+ * @type ProjectGenerationJob
+ * @prop {string} owner Owner of the repository to be generated.
+ * @prop {string} repo Name of the repository to be generated.
+ * @prop {string} authToken PAT or Oauth token of the owner.
+ * @prop {string} codeSnippet Base64 encoded playground code snippet.
+ * @prop {string} appName Name of the VehicleApp.
+ * @prop {string} vspecPayload Base64 encoded Vspec payload.
+ */
+export interface ProjectGenerationJob {
+    owner: string;
+    repo: string;
+    authToken: string;
+    codeSnippet: string;
+    appName: string;
+    vspecPayload: string;
+}
+
+/**
+ * Outcome of a single job, either `status` or `error` is set.
+ * @type ProjectGenerationResult
+ * @prop {ProjectGenerationJob} job
+ * @prop {number} status Status returned by `ProjectGenerator.runWithPayload`.
+ * @prop {Error} error Error the job failed with.
+ * @prop {number} queuedMs Time between starting the pool and starting the job.
+ * @prop {number} durationMs Time the job took.
+ */
+export interface ProjectGenerationResult {
+    job: ProjectGenerationJob;
+    status?: number;
+    error?: Error;
+    queuedMs: number;
+    durationMs: number;
+}
+
+/**
+ * @type ProjectGeneratorPoolOptions
+ * @prop {number} concurrency Number of jobs running at the same time.
+ * @prop {number} maxSockets Number of connections to GitHub, which also limits the concurrent requests.
+ * @prop {ProjectGeneratorOptions} generatorOptions Options passed to every `ProjectGenerator`.
+ */
+export interface ProjectGeneratorPoolOptions {
+    concurrency?: number;
+    maxSockets?: number;
+    generatorOptions?: ProjectGeneratorOptions;
+}
+
+/**
+ * Generates many projects with bounded concurrency.
+ *
+ * All generators share one keep-alive agent and one request limiter. GitHub rate limits apply per token,
+ * so the jobs of a token share a rate limit scheduler and a rate limit hit by one token does not pause the others.
+ */
+export class ProjectGeneratorPool {
+    readonly httpsAgent: https.Agent;
+    readonly requestLimiter: ConcurrencyLimiter;
+    private rateLimitSchedulers = new Map<string, RateLimitScheduler>();
+    private concurrency: number;
+    private generatorOptions: ProjectGeneratorOptions;
+
+    /**
+     * @param {ProjectGeneratorPoolOptions} options
+     */
+    constructor(options: ProjectGeneratorPoolOptions = {}) {
+        const maxSockets = options.maxSockets ?? MAX_SOCKETS;
+        this.concurrency = Math.max(1, options.concurrency ?? MAX_CONCURRENT_JOBS);
+        this.httpsAgent = new https.Agent({ keepAlive: true, maxSockets: maxSockets });
+        this.requestLimiter = new ConcurrencyLimiter(maxSockets);
+        this.generatorOptions = {
+            ...options.generatorOptions,
+            httpsAgent: this.httpsAgent,
+            requestLimiter: this.requestLimiter,
+        };
+    }
+
+    /**
+     * Runs all jobs, a failing job does not stop the others.
+     * @param {Iterable<ProjectGenerationJob> | AsyncIterable<ProjectGenerationJob>} jobs
+     * @return {Promise<ProjectGenerationResult[]>} Results in job order.
+     */
+    public async run(jobs: Iterable<ProjectGenerationJob> | AsyncIterable<ProjectGenerationJob>): Promise<ProjectGenerationResult[]> {
+        const pullNextJob = createItemPuller(jobs);
+        const results: ProjectGenerationResult[] = [];
+        const poolStartTime = Date.now();
+
+        const runJobs = async (): Promise<void> => {
+            for (let nextJob = await pullNextJob(); nextJob; nextJob = await pullNextJob()) {
+                const job = nextJob.item;
+                const jobStartTime = Date.now();
+                const result: ProjectGenerationResult = { job: job, queuedMs: jobStartTime - poolStartTime, durationMs: 0 };
+                try {
+                    const generator = new ProjectGenerator(job.owner, job.repo, job.authToken, {
+                        ...this.generatorOptions,
+                        rateLimitScheduler: this.getRateLimitScheduler(job.authToken),
+                    });
+                    result.status = await generator.runWithPayload(job.codeSnippet, job.appName, job.vspecPayload);
+                } catch (error) {
+                    result.error = error;
+                }
+                result.durationMs = Date.now() - jobStartTime;
+                results[nextJob.index] = result;
+            }
+        };
+        await Promise.all(Array.from({ length: this.concurrency }, runJobs));
+        return results;
+    }
+
+    private getRateLimitScheduler(authToken: string): RateLimitScheduler {
+        let rateLimitScheduler = this.rateLimitSchedulers.get(authToken);
+        if (!rateLimitScheduler) {
+            rateLimitScheduler = new RateLimitScheduler();
+            this.rateLimitSchedulers.set(authToken, rateLimitScheduler);
+        }
+        return rateLimitScheduler;
+    }
+
+    /**
+     * Closes the keep-alive connections.
+     */
+    public destroy(): void {
+        this.httpsAgent.destroy();
+    }
+}
@@ -12,13 +12,85 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
+import * as https from 'https';
 import { StatusCodes } from 'http-status-codes';
 import { CodeConverter, CodeConversionResult } from './code-converter';
-import { MS_TO_WAIT_FOR_GITHUB, LOCAL_VSPEC_PATH, APP_MANIFEST_PATH, MAIN_PY_PATH } from './utils/constants';
-import { decode, delay, encode } from './utils/helpers';
-import { GitRequestHandler } from './gitRequestHandler';
+import { LOCAL_VSPEC_PATH, APP_MANIFEST_PATH, MAIN_PY_PATH, GENERATION_STAGES, VSPEC_STREAMING_THRESHOLD } from './utils/constants';
+import { decode, encode } from './utils/helpers';
+import { GitRequestHandler, TransientRetryOptions } from './gitRequestHandler';
+import { NewTree, RepositoryBackend, TreeFileContent, TreeFiles } from './repository-backend';
+import { GenerationCheckpoint, GenerationInput } from './generation-checkpoint';
 import { VspecUriObject } from './utils/types';
 import { updateAppManifestContent } from './utils/appManifest';
+import { TEMPLATE_CACHE, TemplateCache } from './template-cache';
+import { ReadinessOptions } from './utils/readiness';
+import { ConcurrencyLimiter } from './utils/concurrencyLimiter';
+import { RateLimitScheduler } from './utils/rateLimitScheduler';
+import {
+    createEncodedVspecJsonStream,
+    createVspecJsonStream,
+    findUnknownSignalsInPayload,
+    validateVspecPayload,
+} from './utils/vspecStream';
+import { computeGitBlobSha, computeGitBlobShaFromStream } from './utils/gitBlob';
+import { VspecIndex } from './utils/vspecIndex';
+import { ProjectGeneratorError, UnknownSignalsError } from './project-generator-error';
+import { Instrumentation, InstrumentationObserver, NOOP_INSTRUMENTATION } from './instrumentation';
+import { CONVERSION_RESULT_CACHE, ConversionCache } from './conversion-cache';
+import { RewriteRule } from './utils/rewriteRules';
+
+/**
+ * @type ProjectGeneratorOptions
+ * @prop {RepositoryBackend} backend Repository the project is created in, a GitHub repository `owner/repo` by default.
+ * @prop {TemplateCache} templateCache Cache for the template files, shared by the whole process by default.
+ * @prop {Partial<ReadinessOptions>} readiness Polling used to wait for GitHub to create resources.
+ * @prop {ConcurrencyLimiter} requestLimiter Limits concurrent GitHub requests, can be shared between generators.
+ * @prop {RateLimitScheduler} rateLimitScheduler Pauses GitHub requests on rate limits, can be shared between generators.
+ * @prop {https.Agent} httpsAgent Agent used for all GitHub requests, e.g. to share keep-alive connections.
+ * @prop {Partial<TransientRetryOptions>} transientRetry Retries of GitHub requests failing with a server or network error.
+ * @prop {boolean} inlineTreeContent Send the file contents inline with the new tree instead of creating blobs first.
+ * @prop {number} vspecStreamingThreshold Vspec payloads longer than this are processed and uploaded in chunks.
+ * @prop {ConversionCache} conversionCache Cache for conversion results, shared by the whole process by default.
+ * @prop {RewriteRule[]} rewriteRules Additional digital.auto to Velocitas rewrites, taking precedence over the built-in ones.
+ * @prop {boolean} reuseStepResults Reuses the outputs of conversion steps from earlier conversions of the process,
+ * if their inputs did not change, e.g. for the same code snippet with another app name.
+ * @prop {boolean} checkSignals Reject apps using datapoints which are not part of the vspec, enabled by default.
+ * @prop {boolean} pruneVspec Upload a vspec which only contains the datapoints used by the app and their branches.
+ * @prop {(checkpoint: GenerationCheckpoint) => void | Promise<void>} onCheckpoint Receives a checkpoint after every completed
+ * stage of `runWithPayload` and `resume`, e.g. to store it for resuming the generation in another process.
+ * @prop {InstrumentationObserver} observer Receives the timing of the generation, its requests, waits and conversion steps.
+ */
+export interface ProjectGeneratorOptions {
+    backend?: RepositoryBackend;
+    templateCache?: TemplateCache;
+    readiness?: Partial<ReadinessOptions>;
+    requestLimiter?: ConcurrencyLimiter;
+    rateLimitScheduler?: RateLimitScheduler;
+    httpsAgent?: https.Agent;
+    transientRetry?: Partial<TransientRetryOptions>;
+    inlineTreeContent?: boolean;
+    vspecStreamingThreshold?: number;
+    conversionCache?: ConversionCache;
+    rewriteRules?: RewriteRule[];
+    reuseStepResults?: boolean;
+    checkSignals?: boolean;
+    pruneVspec?: boolean;
+    onCheckpoint?: (checkpoint: GenerationCheckpoint) => void | Promise<void>;
+    observer?: InstrumentationObserver;
+}
+
+interface PreparedContents {
+    appManifestContent: string;
+    mainPyContent: string;
+    // Undefined for streamed vspecs, they are formatted while they are uploaded
+    vspecJson?: string;
+}
+
+interface LocalFile {
+    filePath: string;
+    sha: string;
+    createTreeFileContent: () => Promise<TreeFileContent>;
+}
 
 /**
  * Initialize a new `ProjectGenerator` with the given `options`.
@@ -28,8 +100,15 @@ import { updateAppManifestContent } from './utils/appManifest';
  * @public
  */
 export class ProjectGenerator {
-    private gitRequestHandler: GitRequestHandler;
-    private codeConverter: CodeConverter = new CodeConverter();
+    private repositoryBackend: RepositoryBackend;
+    private codeConverter: CodeConverter;
+    private templateCache: TemplateCache;
+    private inlineTreeContent: boolean;
+    private vspecStreamingThreshold: number;
+    private checkSignals: boolean;
+    private pruneVspec: boolean;
+    private onCheckpoint?: (checkpoint: GenerationCheckpoint) => void | Promise<void>;
+    private instrumentation: Instrumentation;
     /**
      * Parameter will be used to call the GitHub API as follows:
      * https://api.github.com/repos/OWNER/REPO
@@ -39,34 +118,198 @@ export class ProjectGenerator {
      * @param {string} owner
      * @param {string} repo
      * @param {string} authToken as PAT or Oauth Token
+     * @param {ProjectGeneratorOptions} options
      */
-    constructor(private owner: string, private repo: string, private authToken: string) {
-        this.gitRequestHandler = new GitRequestHandler(this.owner, this.repo, this.authToken);
+    constructor(private owner: string, private repo: string, private authToken: string, options: ProjectGeneratorOptions = {}) {
+        this.repositoryBackend =
+            options.backend ??
+            new GitRequestHandler(this.owner, this.repo, this.authToken, {
+                readiness: options.readiness,
+                requestLimiter: options.requestLimiter,
+                rateLimitScheduler: options.rateLimitScheduler,
+                httpsAgent: options.httpsAgent,
+                transientRetry: options.transientRetry,
+                observer: options.observer,
+            });
+        this.codeConverter = new CodeConverter({
+            observer: options.observer,
+            cache: options.conversionCache ?? CONVERSION_RESULT_CACHE,
+            rewriteRules: options.rewriteRules,
+            reuseStepResults: options.reuseStepResults,
+        });
+        this.instrumentation = options.observer ? new Instrumentation(options.observer) : NOOP_INSTRUMENTATION;
+        // The shared template cache holds the files of the GitHub template, other backends may read another template
+        this.templateCache = options.templateCache ?? (options.backend ? new TemplateCache() : TEMPLATE_CACHE);
+        this.inlineTreeContent = options.inlineTreeContent ?? false;
+        this.vspecStreamingThreshold = options.vspecStreamingThreshold ?? VSPEC_STREAMING_THRESHOLD;
+        this.checkSignals = options.checkSignals ?? true;
+        this.pruneVspec = options.pruneVspec ?? false;
+        this.onCheckpoint = options.onCheckpoint;
     }
 
     /**
      * @param {string} codeSnippet Base64 encoded playground code snippet.
      * @param {string} appName Name of the VehicleApp.
      * @param {string} vspecPayload Base64 encoded Vspec payload.
-     * @throws {ProjectGeneratorError}
+     * @throws {ProjectGeneratorError} With the checkpoint of the last completed stage, if the repository was created.
+     * @throws {UnknownSignalsError} Before the repository is created, if the app uses datapoints missing in the vspec.
      */
     public async runWithPayload(codeSnippet: string, appName: string, vspecPayload: string): Promise<number> {
+        const attributes = { appName: appName, snippetLength: codeSnippet.length, payloadLength: vspecPayload.length };
+        return this.instrumentation.measureAsync('generation', 'runWithPayload', attributes, () =>
+            this.generate({
+                stage: GENERATION_STAGES.started,
+                input: { codeSnippet: codeSnippet, appName: appName, vspecPayload: vspecPayload },
+            })
+        );
+    }
+
+    /**
+     * Continues a generation after its last completed stage, e.g. once GitHub answers again after a server error.
+     * Completed stages are not repeated, so no second repository is created and created blobs are reused.
+     * @param {GenerationCheckpoint} checkpoint Received by `onCheckpoint` or attached to the thrown `ProjectGeneratorError`.
+     * @throws {ProjectGeneratorError} With the checkpoint of the last completed stage.
+     */
+    public async resume(checkpoint: GenerationCheckpoint): Promise<number> {
+        return this.instrumentation.measureAsync('generation', 'resume', { stage: checkpoint.stage }, () => this.generate(checkpoint));
+    }
+
+    /**
+     * Updates an existing repository, e.g. one generated before by `runWithPayload`. The git blob SHAs of the new files
+     * are computed locally and compared with the main branch, so only changed files are uploaded and committed.
+     * @param {string} codeSnippet Base64 encoded playground code snippet.
+     * @param {string} appName Name of the VehicleApp.
+     * @param {string} vspecPayload Base64 encoded Vspec payload.
+     * @return {Promise<number>} `NOT_MODIFIED` without any commit if all files are up to date, `OK` otherwise.
+     * @throws {ProjectGeneratorError}
+     * @throws {UnknownSignalsError} Before anything is committed, if the app uses datapoints missing in the vspec.
+     */
+    public async updateWithPayload(codeSnippet: string, appName: string, vspecPayload: string): Promise<number> {
+        const attributes = { appName: appName, snippetLength: codeSnippet.length, payloadLength: vspecPayload.length };
+        return this.instrumentation.measureAsync('generation', 'updateWithPayload', attributes, async () => {
+            const conversion = this.convertCode(appName, codeSnippet);
+            const [[appManifestContent, mainPyContent], vspecJsonFile, mainBranchTree] = await Promise.all([
+                this.createContents(appName, conversion, `./${LOCAL_VSPEC_PATH}`),
+                this.createLocalVspecJsonFile(vspecPayload, conversion),
+                this.repositoryBackend.getMainBranchTree(),
+            ]);
+            const changedFiles = [
+                this.createLocalFile(APP_MANIFEST_PATH, appManifestContent),
+                this.createLocalFile(MAIN_PY_PATH, mainPyContent),
+                vspecJsonFile,
+            ].filter((localFile: LocalFile) => mainBranchTree.fileShas[localFile.filePath] !== localFile.sha);
+            if (changedFiles.length === 0) {
+                return StatusCodes.NOT_MODIFIED;
+            }
+
+            const treeFileContents = await Promise.all(changedFiles.map((localFile: LocalFile) => localFile.createTreeFileContent()));
+            const treeFiles = changedFiles.reduce((files: TreeFiles, localFile: LocalFile, index: number) => {
+                files[localFile.filePath] = treeFileContents[index];
+                return files;
+            }, {});
+            return this.repositoryBackend.updateFiles(treeFiles, mainBranchTree);
+        });
+    }
+
+    /**
+     * Runs the stages following the last completed stage of the checkpoint and records a checkpoint after each of them.
+     *
+     * Large payloads are decoded, validated, formatted and encoded chunk by chunk, so the peak memory
+     * depends on the chunk size instead of the vspec size. The output equals the one of small payloads.
+     */
+    private async generate(initialCheckpoint: GenerationCheckpoint): Promise<number> {
+        let checkpoint = initialCheckpoint;
+        const completeStage = async (nextCheckpoint: GenerationCheckpoint) => {
+            checkpoint = nextCheckpoint;
+            await this.onCheckpoint?.(nextCheckpoint);
+        };
         try {
-            let decodedVspecPayload = JSON.parse(decode(vspecPayload));
-            await this.gitRequestHandler.generateRepo();
-            // Delay is introduced to make sure that the git API creates
-            // everything we need before doing other API requests
-            await delay(MS_TO_WAIT_FOR_GITHUB);
-            const encodedVspec = encode(`${JSON.stringify(decodedVspecPayload, null, 4)}\n`);
-            const vspecJsonBlobSha = await this.gitRequestHandler.createBlob(encodedVspec);
-
-            await this.updateContent(appName, codeSnippet, `./${LOCAL_VSPEC_PATH}`, vspecJsonBlobSha);
+            let preparedContents: Promise<PreparedContents> | undefined;
+            if (checkpoint.stage === GENERATION_STAGES.started) {
+                // Invalid payloads and unknown signals have to be rejected before the repository is created
+                const contents = await this.prepareContents(this.getInput(checkpoint));
+                preparedContents = Promise.resolve(contents);
+                await this.repositoryBackend.generateRepo();
+                await completeStage({ ...checkpoint, stage: GENERATION_STAGES.repositoryCreated });
+            }
+            if (checkpoint.stage === GENERATION_STAGES.repositoryCreated) {
+                const input = this.getInput(checkpoint);
+                // The git API creates the content of the repository asynchronously,
+                // so the main branch has to be readable before the tree is updated
+                const [treeFiles] = await Promise.all([
+                    this.createTreeFiles(input, preparedContents ?? this.prepareContents(input)),
+                    this.repositoryBackend.waitForMainBranch(),
+                ]);
+                // The input is not needed anymore and can be large
+                await completeStage({ stage: GENERATION_STAGES.filesCreated, treeFiles: treeFiles });
+            }
+            if (checkpoint.stage === GENERATION_STAGES.filesCreated) {
+                const newTree = await this.repositoryBackend.createTree(checkpoint.treeFiles as TreeFiles);
+                await completeStage({ ...checkpoint, stage: GENERATION_STAGES.treeCreated, newTree: newTree });
+            }
+            if (checkpoint.stage === GENERATION_STAGES.treeCreated) {
+                const commitSha = await this.repositoryBackend.createCommit(checkpoint.newTree as NewTree);
+                await completeStage({ ...checkpoint, stage: GENERATION_STAGES.commitCreated, commitSha: commitSha });
+            }
+            if (checkpoint.stage === GENERATION_STAGES.commitCreated) {
+                await this.repositoryBackend.updateMainBranch(checkpoint.commitSha as string, true);
+                await completeStage({ stage: GENERATION_STAGES.completed, commitSha: checkpoint.commitSha });
+            }
             return StatusCodes.OK;
         } catch (error) {
+            if (error instanceof ProjectGeneratorError) {
+                error.checkpoint = checkpoint;
+            }
             throw error;
         }
     }
 
+    private getInput(checkpoint: GenerationCheckpoint): GenerationInput {
+        if (!checkpoint.input) {
+            throw new Error(`Checkpoint of stage ${checkpoint.stage} has no input.`);
+        }
+        return checkpoint.input;
+    }
+
+    private async prepareContents(input: GenerationInput): Promise<PreparedContents> {
+        const vspecPath = `./${LOCAL_VSPEC_PATH}`;
+        if (this.isStreamedPayload(input.vspecPayload)) {
+            const conversion = this.convertCode(input.appName, input.codeSnippet);
+            const [[appManifestContent, mainPyContent]] = await Promise.all([
+                this.createContents(input.appName, conversion, vspecPath),
+                this.checkStreamedVspecPayload(input.vspecPayload, conversion),
+            ]);
+            return { appManifestContent: appManifestContent, mainPyContent: mainPyContent };
+        }
+        const decodedVspecPayload = JSON.parse(decode(input.vspecPayload));
+        const conversion = this.convertCode(input.appName, input.codeSnippet);
+        const [[appManifestContent, mainPyContent], convertedCode] = await Promise.all([
+            this.createContents(input.appName, conversion, vspecPath),
+            conversion,
+        ]);
+        const vspecJson = this.createVspecJson(decodedVspecPayload, convertedCode.dataPoints);
+        return { appManifestContent: appManifestContent, mainPyContent: mainPyContent, vspecJson: vspecJson };
+    }
+
+    private async createTreeFiles(input: GenerationInput, preparedContents: Promise<PreparedContents>): Promise<TreeFiles> {
+        const contents = await preparedContents;
+        const [appManifestFile, mainPyFile, vspecJsonFile] = await Promise.all([
+            this.createTreeFileContent(contents.appManifestContent),
+            this.createTreeFileContent(contents.mainPyContent),
+            contents.vspecJson !== undefined
+                ? this.createTreeFileContent(contents.vspecJson)
+                : this.createStreamedVspecJsonFile(input.vspecPayload),
+        ]);
+        return { [APP_MANIFEST_PATH]: appManifestFile, [MAIN_PY_PATH]: mainPyFile, [LOCAL_VSPEC_PATH]: vspecJsonFile };
+    }
+
+    /**
+     * Large vspecs are always uploaded as blob, even in inline mode.
+     */
+    private async createStreamedVspecJsonFile(vspecPayload: string): Promise<TreeFileContent> {
+        return { sha: await this.repositoryBackend.createBlobFromStream(() => createEncodedVspecJsonStream(vspecPayload)) };
+    }
+
     /**
      * @param {string} codeSnippet Base64 encoded playground code snippet.
      * @param {string} appName Name of the VehicleApp.
@@ -78,46 +321,163 @@ export class ProjectGenerator {
             // Assumption for now is, that all individual vspecs are a fork of COVESA following this path
             const vspecUriString = `${vspecUriObject.repo}/tree/${vspecUriObject.commit}/spec`;
 
-            await this.gitRequestHandler.generateRepo();
-            // Delay is introduced to make sure that the git API creates
-            // everything we need before doing other API requests
-            await delay(MS_TO_WAIT_FOR_GITHUB);
-            await this.updateContent(appName, codeSnippet, vspecUriString);
+            await this.repositoryBackend.generateRepo();
+            await this.updateContent(appName, this.convertCode(appName, codeSnippet), vspecUriString);
             return StatusCodes.OK;
         } catch (error) {
             throw error;
         }
     }
 
-    private async updateContent(appName: string, codeSnippet: string, vspecPath: string, vspecJsonBlobSha?: string): Promise<number> {
-        const convertedCode = await this.convertCode(appName, codeSnippet);
-        const appManifestBlobSha = await this.getNewAppManifestSha(appName, vspecPath, convertedCode.dataPoints);
-        const mainPyBlobSha = await this.getNewMainPySha(convertedCode.finalizedMainPy);
+    /**
+     * Requests which do not depend on each other are sent concurrently: the main branch is awaited while
+     * the template files are read and the file contents are created.
+     */
+    private async updateContent(
+        appName: string,
+        conversion: CodeConversionResult | Promise<CodeConversionResult>,
+        vspecPath: string,
+        createVspecJsonFile?: () => Promise<TreeFileContent>
+    ): Promise<number> {
+        // The git API creates the content of the repository asynchronously,
+        // so the main branch has to be readable before the tree is updated
+        const [[appManifestFile, mainPyFile], vspecJsonFile] = await Promise.all([
+            this.createContentFiles(appName, conversion, vspecPath),
+            createVspecJsonFile ? createVspecJsonFile() : undefined,
+            this.repositoryBackend.waitForMainBranch(),
+        ]);
 
-        await this.gitRequestHandler.updateTree(appManifestBlobSha, mainPyBlobSha, vspecJsonBlobSha);
+        await this.repositoryBackend.updateTree(appManifestFile, mainPyFile, vspecJsonFile);
         return StatusCodes.OK;
     }
 
+    private async createContentFiles(
+        appName: string,
+        conversion: CodeConversionResult | Promise<CodeConversionResult>,
+        vspecPath: string
+    ): Promise<[TreeFileContent, TreeFileContent]> {
+        const [appManifestContent, mainPyContent] = await this.createContents(appName, conversion, vspecPath);
+        return Promise.all([this.createTreeFileContent(appManifestContent), this.createTreeFileContent(mainPyContent)]);
+    }
+
+    /**
+     * @return {Promise<[string, string]>} Content of the AppManifest.json and the main.py.
+     */
+    private async createContents(
+        appName: string,
+        conversion: CodeConversionResult | Promise<CodeConversionResult>,
+        vspecPath: string
+    ): Promise<[string, string]> {
+        const [convertedCode, appManifestContent] = await Promise.all([
+            conversion,
+            this.getTemplateFileContent(APP_MANIFEST_PATH),
+        ]);
+        const updatedAppManifestContent = this.getNewAppManifestContent(appManifestContent, appName, vspecPath, convertedCode.dataPoints);
+        return [updatedAppManifestContent, `${convertedCode.finalizedMainPy}\n`];
+    }
+
+    private createLocalFile(filePath: string, fileContent: string): LocalFile {
+        return {
+            filePath: filePath,
+            sha: computeGitBlobSha(fileContent),
+            createTreeFileContent: () => this.createTreeFileContent(fileContent),
+        };
+    }
+
+    /**
+     * The SHA of large vspecs is computed from the streamed vspec.json, which also validates the payload.
+     * The signals are looked up in another pass over the payload, before the SHA is computed.
+     */
+    private async createLocalVspecJsonFile(vspecPayload: string, conversion: Promise<CodeConversionResult>): Promise<LocalFile> {
+        if (!this.isStreamedPayload(vspecPayload)) {
+            const decodedVspecPayload = JSON.parse(decode(vspecPayload));
+            const convertedCode = await conversion;
+            return this.createLocalFile(LOCAL_VSPEC_PATH, this.createVspecJson(decodedVspecPayload, convertedCode.dataPoints));
+        }
+        if (this.checkSignals) {
+            await this.checkStreamedVspecPayload(vspecPayload, conversion);
+        }
+        return {
+            filePath: LOCAL_VSPEC_PATH,
+            sha: await computeGitBlobShaFromStream(() => createVspecJsonStream(vspecPayload)),
+            createTreeFileContent: () => this.createStreamedVspecJsonFile(vspecPayload),
+        };
+    }
+
+    /**
+     * In inline mode the content is sent with the new tree, otherwise it is uploaded as base64 encoded blob.
+     * @param {string} fileContent
+     * @return {Promise<TreeFileContent>}
+     */
+    private async createTreeFileContent(fileContent: string): Promise<TreeFileContent> {
+        if (this.inlineTreeContent) {
+            return { content: fileContent };
+        }
+        const blobSha = await this.repositoryBackend.createBlob(encode(fileContent));
+        return { sha: blobSha };
+    }
+
+    private isStreamedPayload(vspecPayload: string): boolean {
+        // A pruned vspec is small, so the payload is decoded in memory to index it
+        return !this.pruneVspec && vspecPayload.length > this.vspecStreamingThreshold;
+    }
+
+    /**
+     * Validates a streamed vspec payload and checks the signals used by the app in it, if enabled.
+     * @param {string} vspecPayload
+     * @param {Promise<CodeConversionResult>} conversion
+     * @throws {SyntaxError}
+     * @throws {UnknownSignalsError}
+     */
+    private async checkStreamedVspecPayload(vspecPayload: string, conversion: Promise<CodeConversionResult>): Promise<void> {
+        if (!this.checkSignals) {
+            await validateVspecPayload(vspecPayload);
+            return;
+        }
+        const convertedCode = await conversion;
+        const signalPaths = convertedCode.dataPoints.map((dataPoint: any) => dataPoint.path);
+        const unknownSignals = await findUnknownSignalsInPayload(vspecPayload, signalPaths);
+        if (unknownSignals.length > 0) {
+            throw new UnknownSignalsError(unknownSignals);
+        }
+    }
+
+    /**
+     * @param {any} decodedVspecPayload
+     * @param {any[]} dataPoints Datapoints used by the app.
+     * @return {string} Formatted vspec.json, pruned to the datapoints if enabled.
+     * @throws {UnknownSignalsError}
+     */
+    private createVspecJson(decodedVspecPayload: any, dataPoints: any[]): string {
+        const signalPaths = dataPoints.map((dataPoint: any) => dataPoint.path);
+        const vspecIndex = new VspecIndex(decodedVspecPayload);
+        if (this.checkSignals) {
+            const unknownSignals = vspecIndex.findUnknownSignals(signalPaths);
+            if (unknownSignals.length > 0) {
+                throw new UnknownSignalsError(unknownSignals);
+            }
+        }
+        const vspec = this.pruneVspec ? vspecIndex.prune(signalPaths) : decodedVspecPayload;
+        return `${JSON.stringify(vspec, null, 4)}\n`;
+    }
+
     private async convertCode(appName: string, codeSnippet: string): Promise<CodeConversionResult> {
-        const mainPyContentData = await this.gitRequestHandler.getFileContentData(MAIN_PY_PATH);
-        const decodedMainPyContentData = decode(mainPyContentData);
+        const decodedMainPyContentData = await this.getTemplateFileContent(MAIN_PY_PATH);
         const decodedBase64CodeSnippet = decode(codeSnippet);
         const convertedCode = this.codeConverter.convertMainPy(decodedMainPyContentData, decodedBase64CodeSnippet, appName);
         return convertedCode;
     }
 
-    private async getNewAppManifestSha(appName: string, vspecPath: string, dataPoints: any[]): Promise<string> {
-        const appManifestContentData = await this.gitRequestHandler.getFileContentData(APP_MANIFEST_PATH);
-        let decodedAppManifestContent = JSON.parse(decode(appManifestContentData));
+    private getNewAppManifestContent(appManifestContent: string, appName: string, vspecPath: string, dataPoints: any[]): string {
+        let decodedAppManifestContent = JSON.parse(appManifestContent);
         const updatedAppManifestContent = updateAppManifestContent(decodedAppManifestContent, appName, vspecPath, dataPoints);
-        const encodedAppManifestContent = encode(`${JSON.stringify(updatedAppManifestContent, null, 4)}\n`);
-        const appManifestBlobSha = await this.gitRequestHandler.createBlob(encodedAppManifestContent);
-        return appManifestBlobSha;
+        return `${JSON.stringify(updatedAppManifestContent, null, 4)}\n`;
     }
 
-    private async getNewMainPySha(finalizedMainPy: string): Promise<string> {
-        const encodedFinalizedMainPy = encode(`${finalizedMainPy}\n`);
-        const mainPyBlobSha = await this.gitRequestHandler.createBlob(encodedFinalizedMainPy);
-        return mainPyBlobSha;
+    private getTemplateFileContent(filePath: string): Promise<string> {
+        // The generated repository is a copy of the template, so its files can be served from the template cache
+        return this.templateCache.getFileContent(filePath, (templateFilePath: string, ref: string, etag?: string) =>
+            this.repositoryBackend.getTemplateFileContentData(templateFilePath, ref, etag)
+        );
     }
 }
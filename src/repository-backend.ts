@@ -0,0 +1,119 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { Readable } from 'stream';
+import { TemplateFileResponse } from './template-cache';
+
+/**
+ * File of a new git tree, either referencing an existing blob or with its UTF-8 content sent inline.
+ */
+export type TreeFileContent = { sha: string } | { content: string };
+
+/**
+ * Files of a new git tree by their path in the repository.
+ */
+export type TreeFiles = { [filePath: string]: TreeFileContent };
+
+/**
+ * @type MainBranchTree
+ * @prop {string} commitSha Commit the main branch points to.
+ * @prop {string} treeSha Tree of that commit.
+ * @prop {Object} fileShas Blob SHAs of all files of the tree by their path.
+ */
+export interface MainBranchTree {
+    commitSha: string;
+    treeSha: string;
+    fileShas: { [filePath: string]: string };
+}
+
+/**
+ * @type NewTree
+ * @prop {string} treeSha Created tree.
+ * @prop {string} parentCommitSha Commit of the main branch the tree is based on.
+ */
+export interface NewTree {
+    treeSha: string;
+    parentCommitSha: string;
+}
+
+/**
+ * Repository the `ProjectGenerator` creates the project in and reads the vehicle app python template from.
+ *
+ * `GitRequestHandler` creates a GitHub repository from the template, `LocalRepositoryBackend` writes the project
+ * from a local checkout of the template into a directory or a bare git repository.
+ */
+export interface RepositoryBackend {
+    /**
+     * Creates the repository with the content of the template.
+     */
+    generateRepo(): Promise<number>;
+
+    /**
+     * Resolves once the main branch of the created repository can be read.
+     */
+    waitForMainBranch(): Promise<number>;
+
+    /**
+     * @param {string} fileContent Base64 encoded content.
+     * @return {Promise<string>} SHA of the created blob.
+     */
+    createBlob(fileContent: string): Promise<string>;
+
+    /**
+     * @param {() => Readable} createContentStream Creates the base64 encoded content, can be called more than once.
+     * @return {Promise<string>} SHA of the created blob.
+     */
+    createBlobFromStream(createContentStream: () => Readable): Promise<string>;
+
+    /**
+     * Creates a tree with the files on top of the tree of the main branch.
+     * @param {TreeFiles} treeFiles
+     * @param {MainBranchTree} mainBranchTree Base of the tree, the current main branch is read if not given.
+     */
+    createTree(treeFiles: TreeFiles, mainBranchTree?: MainBranchTree): Promise<NewTree>;
+
+    /**
+     * @param {NewTree} newTree
+     * @return {Promise<string>} SHA of the commit of the tree.
+     */
+    createCommit(newTree: NewTree): Promise<string>;
+
+    /**
+     * Points the main branch to the commit.
+     * @param {string} commitSha
+     * @param {boolean} enableWorkflows Enables the workflows of a generated repository.
+     */
+    updateMainBranch(commitSha: string, enableWorkflows?: boolean): Promise<number>;
+
+    /**
+     * Commits the files to the main branch of a generated repository and enables its workflows.
+     */
+    updateTree(appManifestFile: TreeFileContent, mainPyFile: TreeFileContent, vspecJsonFile?: TreeFileContent): Promise<number>;
+
+    /**
+     * Reads the tree of the main branch with the blob SHAs of all files.
+     */
+    getMainBranchTree(): Promise<MainBranchTree>;
+
+    /**
+     * Commits the files on top of the given tree of the main branch, all other files are kept.
+     */
+    updateFiles(treeFiles: TreeFiles, mainBranchTree: MainBranchTree): Promise<number>;
+
+    /**
+     * Reads a file of the vehicle app python template.
+     * @return {Promise<TemplateFileResponse | undefined>} undefined if the file was not modified since `etag`.
+     */
+    getTemplateFileContentData(filePath: string, ref: string, etag?: string): Promise<TemplateFileResponse | undefined>;
+}
@@ -0,0 +1,141 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { promises as fs } from 'fs';
+import * as path from 'path';
+import { APP_MANIFEST_PATH, MAIN_PY_PATH, TEMPLATE_CACHE_TTL_MS, TEMPLATE_REF } from './utils/constants';
+import { decode } from './utils/helpers';
+
+/**
+ * Template file as returned by the GitHub contents API.
+ * @type TemplateFileResponse
+ * @prop {string} content Base64 encoded file content.
+ * @prop {string} etag ETag of the response, used for conditional requests.
+ */
+export interface TemplateFileResponse {
+    content: string;
+    etag?: string;
+}
+
+/**
+ * Fetches a template file, resolves undefined if the file was not modified since `etag`.
+ */
+export type TemplateFileFetcher = (
+    filePath: string,
+    ref: string,
+    etag?: string
+) => Promise<TemplateFileResponse | undefined>;
+
+interface TemplateCacheEntry {
+    content: string;
+    etag?: string;
+    expiresAt: number;
+}
+
+/**
+ * Cache for files of the vehicle app python template, keyed by template ref and file path.
+ *
+ * Files are decoded once when they are fetched. Entries are revalidated with `If-None-Match` once their TTL expired.
+ * Prewarmed entries never expire, which allows generating projects without fetching the template at all.
+ */
+export class TemplateCache {
+    private entries = new Map<string, TemplateCacheEntry>();
+    private pendingFetches = new Map<string, Promise<string>>();
+    hits = 0;
+    misses = 0;
+
+    /**
+     * @param {number} ttlMs Time in milliseconds after which a cached file is revalidated.
+     */
+    constructor(private ttlMs: number = TEMPLATE_CACHE_TTL_MS) {}
+
+    /**
+     * @param {string} filePath Path of the file inside the template.
+     * @param {TemplateFileFetcher} fetchFile Used if the file is not cached or has to be revalidated.
+     * @param {string} ref Template ref the file belongs to.
+     * @return {Promise<string>} Decoded file content.
+     */
+    public async getFileContent(filePath: string, fetchFile: TemplateFileFetcher, ref: string = TEMPLATE_REF): Promise<string> {
+        const key = `${ref}:${filePath}`;
+        const entry = this.entries.get(key);
+        if (entry && entry.expiresAt > Date.now()) {
+            this.hits++;
+            return entry.content;
+        }
+        let pendingFetch = this.pendingFetches.get(key);
+        if (!pendingFetch) {
+            this.misses++;
+            pendingFetch = this.fetchFileContent(key, filePath, ref, fetchFile, entry);
+            this.pendingFetches.set(key, pendingFetch);
+        }
+        try {
+            return await pendingFetch;
+        } finally {
+            this.pendingFetches.delete(key);
+        }
+    }
+
+    /**
+     * @param {string} filePath Path of the file inside the template.
+     * @param {string} content Decoded file content.
+     * @param {string} ref Template ref the file belongs to.
+     */
+    public prewarm(filePath: string, content: string, ref: string = TEMPLATE_REF): void {
+        this.entries.set(`${ref}:${filePath}`, { content: content, expiresAt: Infinity });
+    }
+
+    /**
+     * Prewarms main.py and AppManifest.json from a local checkout of the template.
+     * @param {string} templateDirectory Root directory of the template checkout.
+     * @param {string} ref Template ref the checkout belongs to.
+     */
+    public async prewarmFromDirectory(templateDirectory: string, ref: string = TEMPLATE_REF): Promise<void> {
+        for (const filePath of [MAIN_PY_PATH, APP_MANIFEST_PATH]) {
+            const fileContent = await fs.readFile(path.join(templateDirectory, filePath));
+            this.prewarm(filePath, fileContent.toString('utf8'), ref);
+        }
+    }
+
+    public clear(): void {
+        this.entries.clear();
+        this.hits = 0;
+        this.misses = 0;
+    }
+
+    private async fetchFileContent(
+        key: string,
+        filePath: string,
+        ref: string,
+        fetchFile: TemplateFileFetcher,
+        staleEntry?: TemplateCacheEntry
+    ): Promise<string> {
+        const response = await fetchFile(filePath, ref, staleEntry?.etag);
+        const expiresAt = Date.now() + this.ttlMs;
+        if (!response) {
+            if (!staleEntry) {
+                throw new Error(`Template file ${filePath} was reported as not modified but is not cached.`);
+            }
+            staleEntry.expiresAt = expiresAt;
+            return staleEntry.content;
+        }
+        const content = decode(response.content);
+        this.entries.set(key, { content: content, etag: response.etag, expiresAt: expiresAt });
+        return content;
+    }
+}
+
+/**
+ * Template cache shared by all `ProjectGenerator` instances of the process.
+ */
+export const TEMPLATE_CACHE = new TemplateCache();
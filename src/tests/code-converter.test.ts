@@ -14,10 +14,15 @@
 
 import { readFileSync } from 'fs';
 import * as path from 'path';
+import { deserialize, serialize } from 'v8';
 
 import * as chai from 'chai';
 import chaiAsPromised from 'chai-as-promised';
-import { CodeConverter } from '../code-converter';
+import { CodeConverter, ConversionInput } from '../code-converter';
+import { ConversionPool } from '../conversion-pool';
+import { PreparedTemplate } from '../prepared-template';
+import { ConversionCache } from '../conversion-cache';
+import { RewriteRule } from '../utils/rewriteRules';
 import { createArrayFromMultilineString } from '../utils/helpers';
 
 chai.use(chaiAsPromised);
@@ -146,6 +151,127 @@ describe('Code Converter', () => {
         const convertedMainPy = codeConverter.convertMainPy(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_3, APP_NAME);
         expect(convertedMainPy.dataPoints).to.be.deep.equal(EXPECTED_DATAPOINTS_3);
     });
+    it('should only remove the lines of extracted methods from on_start', async () => {
+        const codeSnippet = [
+            'if vehicle.Speed.get() > 0:',
+            '    print("moving")',
+            '',
+            'def on_speed(speed):',
+            '    print("moving")',
+            '',
+            'vehicle.Speed.subscribe(on_speed)',
+        ].join('\n');
+        const convertedMainPy = new CodeConverter().convertMainPy(VELOCITAS_TEMPLATE_MAINPY, codeSnippet, APP_NAME);
+        expect(convertedMainPy.finalizedMainPy).to.include(
+            [
+                '    async def on_start(self):',
+                '        if (await self.Vehicle.Speed.get()).value > 0:',
+                '            logger.info("moving")',
+                '',
+                '        await self.Vehicle.Speed.subscribe(self.on_speed)',
+            ].join('\n')
+        );
+    });
+    it('should apply additional rewrite rules', async () => {
+        const codeConverter: CodeConverter = new CodeConverter({
+            rewriteRules: [{ name: 'sleep', pattern: /time\.sleep\(/, replacement: 'await asyncio.sleep(' }],
+        });
+        const convertedMainPy = codeConverter.convertMainPy(VELOCITAS_TEMPLATE_MAINPY, 'time.sleep(1)\nprint("done")', APP_NAME);
+        expect(convertedMainPy.finalizedMainPy).to.include('        await asyncio.sleep(1)\n        logger.info("done")');
+    });
+    it('should not share results of rewrite rules with the same source but other captured state', async () => {
+        const createSleepRule = (sleepCall: string): RewriteRule => ({
+            name: 'sleep',
+            pattern: /time\.sleep\(/,
+            replacement: () => sleepCall,
+        });
+        const conversionCache = new ConversionCache();
+        const convertedMainPys = ['await asyncio.sleep(', 'await self.sleep('].map((sleepCall: string) => {
+            const codeConverter = new CodeConverter({
+                cache: conversionCache,
+                reuseStepResults: true,
+                rewriteRules: [createSleepRule(sleepCall)],
+            });
+            return codeConverter.convertMainPy(VELOCITAS_TEMPLATE_MAINPY, 'time.sleep(1)\nprint("done")', APP_NAME);
+        });
+        expect(convertedMainPys[0].finalizedMainPy).to.include('        await asyncio.sleep(1)');
+        expect(convertedMainPys[1].finalizedMainPy).to.include('        await self.sleep(1)');
+        expect(conversionCache.misses).to.be.equal(0);
+    });
+});
+
+describe('Prepared Template', () => {
+    it('should format main.py like the plain template', async () => {
+        const preparedTemplate = new PreparedTemplate(VELOCITAS_TEMPLATE_MAINPY);
+        const codeConverter: CodeConverter = new CodeConverter();
+        [EXAMPLE_INPUT_1, EXAMPLE_INPUT_2, EXAMPLE_INPUT_3].forEach((codeSnippet: string) => {
+            const convertedMainPy = codeConverter.convertMainPy(preparedTemplate, codeSnippet, APP_NAME);
+            const expectedMainPy = new CodeConverter().convertMainPy(VELOCITAS_TEMPLATE_MAINPY, codeSnippet, APP_NAME);
+            expect(convertedMainPy).to.be.deep.equal(expectedMainPy);
+        });
+    });
+    it('should fall back to the full template for unterminated multiline strings', async () => {
+        const preparedTemplate = new PreparedTemplate(VELOCITAS_TEMPLATE_MAINPY);
+        const codeSnippet = 'class Broken:\n    """unterminated\n    value = 1\n\nprint("done")';
+        const convertedMainPy = new CodeConverter().convertMainPy(preparedTemplate, codeSnippet, APP_NAME);
+        const expectedMainPy = new CodeConverter().convertMainPy(VELOCITAS_TEMPLATE_MAINPY, codeSnippet, APP_NAME);
+        expect(convertedMainPy).to.be.deep.equal(expectedMainPy);
+    });
+    it('should restore a template posted to a worker thread', async () => {
+        // Worker threads receive a structured clone, which only keeps the fields of the template
+        const postedTemplate = deserialize(serialize(new PreparedTemplate(VELOCITAS_TEMPLATE_MAINPY)));
+        const restoredTemplate = PreparedTemplate.fromParts(postedTemplate);
+        expect(restoredTemplate).to.be.instanceof(PreparedTemplate);
+        expect(new CodeConverter().convertMainPy(restoredTemplate, EXAMPLE_INPUT_1, APP_NAME)).to.be.deep.equal(
+            new CodeConverter().convertMainPy(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_1, APP_NAME)
+        );
+    });
+    it('should reject templates without the Velocitas structure', async () => {
+        expect(() => new PreparedTemplate('print("no app")')).to.throw();
+    });
+});
+
+describe('Batch Code Converter', () => {
+    it('should convert all snippets in input order', async () => {
+        const inputs = [EXAMPLE_INPUT_1, EXAMPLE_INPUT_2, EXAMPLE_INPUT_3].map((codeSnippet: string) => ({
+            codeSnippet: codeSnippet,
+            appName: APP_NAME,
+        }));
+        const results = await CodeConverter.convertMany(VELOCITAS_TEMPLATE_MAINPY, inputs, { workerCount: 2 });
+        expect(results.map((batchResult) => batchResult.result?.finalizedMainPy)).to.be.deep.equal([
+            EXPECTED_OUTPUT_1.trim(),
+            EXPECTED_OUTPUT_2.trim(),
+            EXPECTED_OUTPUT_3.trim(),
+        ]);
+        expect(results[2].result?.dataPoints).to.be.deep.equal(EXPECTED_DATAPOINTS_3);
+    });
+    it('should accept async iterables and report errors per item', async () => {
+        async function* generateInputs(): AsyncGenerator<ConversionInput> {
+            yield { codeSnippet: EXAMPLE_INPUT_2, appName: APP_NAME };
+            yield { codeSnippet: undefined as unknown as string, appName: 'broken' };
+        }
+        const results = await CodeConverter.convertMany(VELOCITAS_TEMPLATE_MAINPY, generateInputs(), { workerCount: 1 });
+        expect(results[0].result?.finalizedMainPy).to.be.equal(EXPECTED_OUTPUT_2.trim());
+        expect(results[1].appName).to.be.equal('broken');
+        expect(results[1].result).to.be.undefined;
+        expect(results[1].error?.message).to.be.a('string');
+    });
+    it('should report the task of a worker exiting without an error as failed and replace the worker', async () => {
+        const pool = new ConversionPool(VELOCITAS_TEMPLATE_MAINPY, 1);
+        try {
+            const worker = (pool as any).workers[0];
+            // The worker exits instead of converting the task
+            worker.postMessage = () => worker.terminate();
+            const inputs = [{ codeSnippet: EXAMPLE_INPUT_2, appName: APP_NAME }];
+            const failedResults = await pool.convertAll(inputs);
+            expect(failedResults[0].error?.message).to.match(/^Conversion worker exited with code \d+\.$/);
+            expect((pool as any).workers[0]).to.not.be.equal(worker);
+            const results = await pool.convertAll(inputs);
+            expect(results[0].result?.finalizedMainPy).to.be.equal(EXPECTED_OUTPUT_2.trim());
+        } finally {
+            await pool.terminate();
+        }
+    });
 });
 
 describe('Transform to MQTT', () => {
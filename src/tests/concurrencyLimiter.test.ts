@@ -0,0 +1,49 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { ConcurrencyLimiter } from '../utils/concurrencyLimiter';
+import { delay } from '../utils/helpers';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+describe('Concurrency Limiter', () => {
+    it('should not run more tasks at the same time than allowed', async () => {
+        const limiter = new ConcurrencyLimiter(2);
+        let runningTasks = 0;
+        let maxRunningTasks = 0;
+        const results = await Promise.all(
+            [1, 2, 3, 4, 5].map((taskNumber: number) =>
+                limiter.run(async () => {
+                    runningTasks++;
+                    maxRunningTasks = Math.max(maxRunningTasks, runningTasks);
+                    await delay(5);
+                    runningTasks--;
+                    return taskNumber;
+                })
+            )
+        );
+        expect(results).to.be.deep.equal([1, 2, 3, 4, 5]);
+        expect(maxRunningTasks).to.be.equal(2);
+        expect(limiter.active).to.be.equal(0);
+    });
+    it('should free the slot of a failed task', async () => {
+        const limiter = new ConcurrencyLimiter(1);
+        await expect(limiter.run(() => Promise.reject(new Error('failed')))).to.eventually.be.rejectedWith('failed');
+        expect(await limiter.run(async () => 'next')).to.be.equal('next');
+        expect(limiter.active).to.be.equal(0);
+    });
+});
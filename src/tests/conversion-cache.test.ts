@@ -0,0 +1,81 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { mkdtempSync, readdirSync, readFileSync, rmSync, writeFileSync } from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { CodeConverter } from '../code-converter';
+import { ConversionCache } from '../conversion-cache';
+import { InstrumentationEvent } from '../instrumentation';
+import { PreparedTemplate } from '../prepared-template';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const APP_NAME = 'test';
+const EXAMPLE_INPUT_1 = readFileSync(`${path.join(__dirname, 'files/example_input_1.py')}`, 'utf8');
+const EXAMPLE_INPUT_2 = readFileSync(`${path.join(__dirname, 'files/example_input_2.py')}`, 'utf8');
+const VELOCITAS_TEMPLATE_MAINPY = readFileSync(`${path.join(__dirname, 'files/velocitas_template_main.py')}`, 'utf8');
+
+describe('Conversion Cache', () => {
+    it('should return cached results without running the pipeline', async () => {
+        const events: InstrumentationEvent[] = [];
+        const cache = new ConversionCache();
+        const codeConverter = new CodeConverter({ observer: { onEnd: (event) => events.push(event) }, cache: cache });
+        const convertedMainPy = codeConverter.convertMainPy(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_1, APP_NAME);
+        events.length = 0;
+        const cachedMainPy = codeConverter.convertMainPy(new PreparedTemplate(VELOCITAS_TEMPLATE_MAINPY), EXAMPLE_INPUT_1, APP_NAME);
+        expect(cachedMainPy).to.be.deep.equal(convertedMainPy);
+        expect(events.map((event) => event.name)).to.be.deep.equal(['convertMainPy']);
+        expect(events[0].attributes.cacheHit).to.be.true;
+        expect(cache.hits).to.be.equal(1);
+        expect(cache.misses).to.be.equal(1);
+    });
+    it('should key results by template, snippet and app name', async () => {
+        const key = ConversionCache.createKey(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_1, APP_NAME);
+        expect(ConversionCache.createKey(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_1, APP_NAME)).to.be.equal(key);
+        expect(ConversionCache.createKey(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_1, 'other')).to.not.be.equal(key);
+        expect(ConversionCache.createKey(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_2, APP_NAME)).to.not.be.equal(key);
+        expect(ConversionCache.createKey('a', 'bc', APP_NAME)).to.not.be.equal(ConversionCache.createKey('ab', 'c', APP_NAME));
+    });
+    it('should evict the least recently used results when exceeding the byte limit', async () => {
+        const result = { finalizedMainPy: 'x'.repeat(100), dataPoints: [] };
+        const cache = new ConversionCache({ maxBytes: 500 });
+        cache.set('first', result);
+        cache.set('second', result);
+        cache.get('first');
+        cache.set('third', result);
+        expect(cache.size).to.be.equal(2);
+        expect(cache.get('second')).to.be.undefined;
+        expect(cache.get('first')).to.be.deep.equal(result);
+    });
+    it('should keep results in files across instances', async () => {
+        const directory = mkdtempSync(path.join(os.tmpdir(), 'conversion-cache-'));
+        try {
+            const result = new CodeConverter().convertMainPy(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_2, APP_NAME);
+            new ConversionCache({ directory: directory }).set('key', result);
+            writeFileSync(path.join(directory, 'broken.json'), '{"finalizedMainPy": ');
+            const cache = new ConversionCache({ directory: directory });
+            expect(cache.get('key')).to.be.deep.equal(result);
+            expect(cache.get('broken')).to.be.undefined;
+            expect(cache.fileHits).to.be.equal(1);
+            expect(readdirSync(directory).sort()).to.be.deep.equal(['broken.json', 'key.json']);
+        } finally {
+            rmSync(directory, { recursive: true, force: true });
+        }
+    });
+});
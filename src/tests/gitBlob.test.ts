@@ -0,0 +1,39 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { Readable } from 'stream';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { computeGitBlobSha, computeGitBlobShaFromStream } from '../utils/gitBlob';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+// Computed with `git hash-object --stdin`
+const EXPECTED_SHAS: [string, string][] = [
+    ['', 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'],
+    ['hi\n', '45b983be36b73c0788dc9cbcb76cbb80fc7bb057'],
+];
+
+describe('Git Blob', () => {
+    it('should compute the SHA git uses for blobs', async () => {
+        EXPECTED_SHAS.forEach(([content, expectedSha]) => expect(computeGitBlobSha(content)).to.be.equal(expectedSha));
+    });
+    it('should compute the same SHA for streamed content', async () => {
+        const content = '{\n    "umlaut": "äöü 🚗"\n}\n';
+        const createContentStream = () => Readable.from(Array.from(Buffer.from(content)).map((byte: number) => Buffer.from([byte])));
+        expect(await computeGitBlobShaFromStream(createContentStream)).to.be.equal(computeGitBlobSha(content));
+    });
+});
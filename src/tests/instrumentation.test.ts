@@ -0,0 +1,103 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { readFileSync } from 'fs';
+import * as path from 'path';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { CodeConverter } from '../code-converter';
+import { Instrumentation, InstrumentationEvent } from '../instrumentation';
+import { HistogramObserver, OpenTelemetryObserver } from '../instrumentation-adapters';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const EXAMPLE_INPUT_1 = readFileSync(`${path.join(__dirname, 'files/example_input_1.py')}`, 'utf8');
+const VELOCITAS_TEMPLATE_MAINPY = readFileSync(`${path.join(__dirname, 'files/velocitas_template_main.py')}`, 'utf8');
+
+const createEvent = (name: string, durationMs: number): InstrumentationEvent => ({
+    kind: 'httpRequest',
+    name: name,
+    attributes: {},
+    startTime: 0,
+    durationMs: durationMs,
+});
+
+describe('Instrumentation', () => {
+    it('should report every pipeline step and conversion phase', async () => {
+        const events: InstrumentationEvent[] = [];
+        const codeConverter = new CodeConverter({ observer: { onEnd: (event: InstrumentationEvent) => events.push(event) } });
+        const convertedMainPy = codeConverter.convertMainPy(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_1, 'test');
+        expect(convertedMainPy).to.be.deep.equal(new CodeConverter().convertMainPy(VELOCITAS_TEMPLATE_MAINPY, EXAMPLE_INPUT_1, 'test'));
+        expect(events.filter((event) => event.kind === 'pipelineStep').map((event) => event.name)).to.be.deep.equal([
+            'PrepareCodeSnippetStep',
+            'ExtractImportsStep',
+            'ExtractVariablesStep',
+            'ExtractClassesStep',
+            'ExtractMethodsStep',
+            'CreateCodeSnippetForTemplateStep',
+        ]);
+        const conversionEvent = events[events.length - 1];
+        expect(conversionEvent.name).to.be.equal('convertMainPy');
+        expect(conversionEvent.attributes.snippetLength).to.be.equal(EXAMPLE_INPUT_1.length);
+        expect(conversionEvent.attributes.dataPoints).to.be.equal(convertedMainPy.dataPoints.length);
+        expect(events.every((event) => event.durationMs !== undefined && event.durationMs >= 0)).to.be.true;
+    });
+    it('should report failed operations with their error', async () => {
+        const events: InstrumentationEvent[] = [];
+        const instrumentation = new Instrumentation({ onEnd: (event: InstrumentationEvent) => events.push(event) });
+        const error = new Error('failed');
+        await expect(instrumentation.measureAsync('wait', 'failing', {}, () => Promise.reject(error))).to.be.rejectedWith('failed');
+        expect(events[0].error).to.be.equal(error);
+    });
+    it('should summarize durations in histograms', async () => {
+        const histogramObserver = new HistogramObserver();
+        [0.5, 3, 3, 40, 700].forEach((durationMs: number) => histogramObserver.onEnd(createEvent('GET /contents', durationMs)));
+        const summary = histogramObserver.summary()['httpRequest GET /contents'];
+        expect(summary.count).to.be.equal(5);
+        expect(summary.minMs).to.be.equal(0.5);
+        expect(summary.maxMs).to.be.equal(700);
+        expect(summary.meanMs).to.be.closeTo(149.3, 0.01);
+        expect(summary.p50Ms).to.be.equal(5);
+        expect(summary.p99Ms).to.be.equal(700);
+    });
+    it('should record OpenTelemetry client spans for requests', async () => {
+        const spans: any[] = [];
+        const tracer = {
+            startSpan: (name: string, options: any) => {
+                const span = {
+                    name: name,
+                    options: options,
+                    attributes: {},
+                    status: undefined,
+                    endTime: undefined,
+                    setAttributes: (attributes: any) => Object.assign(span.attributes, attributes),
+                    setStatus: (status: any) => (span.status = status),
+                    recordException: () => {},
+                    end: (endTime: any) => (span.endTime = endTime),
+                };
+                spans.push(span);
+                return span;
+            },
+        };
+        const instrumentation = new Instrumentation(new OpenTelemetryObserver(tracer));
+        instrumentation.start('httpRequest', 'POST /git/blobs', { method: 'POST', requestBytes: 10 }).end({ status: 201 });
+        expect(spans[0].name).to.be.equal('POST /git/blobs');
+        expect(spans[0].options.kind).to.be.equal(2);
+        expect(spans[0].attributes).to.include({ 'http.request.method': 'POST', 'http.response.status_code': 201 });
+        expect(spans[0].status).to.be.deep.equal({ code: 1 });
+        expect(spans[0].endTime).to.be.at.least(spans[0].options.startTime);
+    });
+});
@@ -0,0 +1,49 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { CodeLineIndex, LINE_KIND } from '../utils/lineIndex';
+import { createArrayFromMultilineString } from '../utils/helpers';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const CODE_SNIPPET = `def on_change(value):
+    print(value)
+
+def on_change(value):
+    print(value)
+
+speed = 0
+vehicle.Speed.subscribe(on_change_speed)
+vehicle.Cabin.Sunroof.Switch.subscribe(on_change)
+SmartPhone.set_text("Done")`;
+
+describe('Line Index', () => {
+    it('should index duplicated lines by their own line number', async () => {
+        const lineIndex = new CodeLineIndex(createArrayFromMultilineString(CODE_SNIPPET));
+        expect(lineIndex.linesOfKind(LINE_KIND.METHOD)).to.be.deep.equal([0, 3]);
+        expect(lineIndex.linesOfKind(LINE_KIND.ASSIGNMENT)).to.be.deep.equal([6]);
+        expect(lineIndex.linesOfKind(LINE_KIND.MQTT_CALL)).to.be.deep.equal([9]);
+        expect(lineIndex.isKind(7, LINE_KIND.SUBSCRIBE_CALL)).to.be.true;
+        expect(lineIndex.isKind(7, LINE_KIND.METHOD)).to.be.false;
+    });
+    it('should map callbacks to their subscribe line by exact name', async () => {
+        const lineIndex = new CodeLineIndex(createArrayFromMultilineString(CODE_SNIPPET));
+        expect(lineIndex.subscribeLineOf('on_change')).to.be.equal('vehicle.Cabin.Sunroof.Switch.subscribe(on_change)');
+        expect(lineIndex.subscribeLineOf('on_change_speed')).to.be.equal('vehicle.Speed.subscribe(on_change_speed)');
+        expect(lineIndex.subscribeLineOf('unknown')).to.be.undefined;
+    });
+});
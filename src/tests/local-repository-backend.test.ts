@@ -0,0 +1,105 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { chmodSync, mkdirSync, mkdtempSync, readFileSync, rmSync, statSync, writeFileSync } from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { LocalRepositoryBackend } from '../local-repository-backend';
+import { ProjectGenerator } from '../project-generator';
+import { APP_MANIFEST_PATH, LOCAL_VSPEC_PATH, MAIN_PY_PATH } from '../utils/constants';
+import { GitObjectStore } from '../utils/gitObjectStore';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const APP_NAME = 'testApp';
+const CODE_SNIPPET = readFileSync(path.join(__dirname, 'files/example_input_2.py')).toString('base64');
+const VSPEC = {
+    Vehicle: {
+        type: 'branch',
+        children: {
+            Cabin: {
+                type: 'branch',
+                children: {
+                    Sunroof: { type: 'branch', children: { Switch: { type: 'actuator', datatype: 'string' } } },
+                },
+            },
+        },
+    },
+};
+const VSPEC_PAYLOAD = Buffer.from(JSON.stringify(VSPEC)).toString('base64');
+const APP_MANIFEST = [{ name: 'template', vehicleModel: { src: 'template' } }];
+
+const createTemplate = (templateDirectory: string): void => {
+    mkdirSync(path.join(templateDirectory, 'app', 'src'), { recursive: true });
+    mkdirSync(path.join(templateDirectory, '.git'));
+    writeFileSync(path.join(templateDirectory, MAIN_PY_PATH), readFileSync(path.join(__dirname, 'files/velocitas_template_main.py')));
+    writeFileSync(path.join(templateDirectory, APP_MANIFEST_PATH), JSON.stringify(APP_MANIFEST));
+    writeFileSync(path.join(templateDirectory, 'install.sh'), '#!/bin/sh\n');
+    chmodSync(path.join(templateDirectory, 'install.sh'), 0o755);
+    writeFileSync(path.join(templateDirectory, '.git', 'HEAD'), 'ref: refs/heads/main\n');
+};
+
+describe('Local Repository Backend', () => {
+    let directory: string;
+    let templateDirectory: string;
+    let outputDirectory: string;
+    beforeEach(() => {
+        directory = mkdtempSync(path.join(os.tmpdir(), 'local-repository-backend-'));
+        templateDirectory = path.join(directory, 'template');
+        outputDirectory = path.join(directory, 'output');
+        createTemplate(templateDirectory);
+    });
+    afterEach(() => {
+        rmSync(directory, { recursive: true, force: true });
+    });
+
+    it('should write the project to a directory', async () => {
+        const backend = new LocalRepositoryBackend({ templateDirectory: templateDirectory, outputDirectory: outputDirectory });
+        const generator = new ProjectGenerator('', '', '', { backend: backend });
+        expect(await generator.runWithPayload(CODE_SNIPPET, APP_NAME, VSPEC_PAYLOAD)).to.be.equal(200);
+
+        expect(readFileSync(path.join(outputDirectory, MAIN_PY_PATH), 'utf8')).to.include('class TestAppApp(VehicleApp):');
+        expect(JSON.parse(readFileSync(path.join(outputDirectory, APP_MANIFEST_PATH), 'utf8'))[0].name).to.be.equal('testapp');
+        expect(JSON.parse(readFileSync(path.join(outputDirectory, LOCAL_VSPEC_PATH), 'utf8'))).to.be.deep.equal(VSPEC);
+        expect(statSync(path.join(outputDirectory, 'install.sh')).mode & 0o111).to.not.be.equal(0);
+        expect(() => statSync(path.join(outputDirectory, '.git'))).to.throw();
+        expect(await generator.updateWithPayload(CODE_SNIPPET, APP_NAME, VSPEC_PAYLOAD)).to.be.equal(304);
+    });
+    it('should commit the project to a bare repository', async () => {
+        const backend = new LocalRepositoryBackend({ templateDirectory: templateDirectory, outputDirectory: outputDirectory, bare: true });
+        const generator = new ProjectGenerator('', '', '', { backend: backend });
+        expect(await generator.runWithPayload(CODE_SNIPPET, APP_NAME, VSPEC_PAYLOAD)).to.be.equal(200);
+
+        const objectStore = new GitObjectStore(outputDirectory);
+        const commitSha = objectStore.readRef('refs/heads/main') as string;
+        const fileShas = objectStore.listFiles(objectStore.readCommit(commitSha).treeSha);
+        expect(Object.keys(fileShas).sort()).to.be.deep.equal([APP_MANIFEST_PATH, MAIN_PY_PATH, LOCAL_VSPEC_PATH, 'install.sh']);
+        expect(objectStore.readObject(fileShas[MAIN_PY_PATH]).content.toString()).to.include('class TestAppApp(VehicleApp):');
+        const commit = objectStore.readObject(commitSha).content.toString();
+        expect(commit).to.match(/^tree [0-9a-f]{40}\nparent [0-9a-f]{40}\nauthor /);
+
+        expect(await generator.updateWithPayload(CODE_SNIPPET, APP_NAME, VSPEC_PAYLOAD)).to.be.equal(304);
+        expect(objectStore.readRef('refs/heads/main')).to.be.equal(commitSha);
+    });
+    it('should not overwrite existing projects', async () => {
+        mkdirSync(outputDirectory);
+        writeFileSync(path.join(outputDirectory, 'README.md'), '');
+        const backend = new LocalRepositoryBackend({ templateDirectory: templateDirectory, outputDirectory: outputDirectory });
+        await expect(backend.generateRepo()).to.eventually.be.rejectedWith('is not empty');
+    });
+});
@@ -0,0 +1,92 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+
+import { readFileSync } from 'fs';
+import * as path from 'path';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { CodeConverter } from '../code-converter';
+import { InstrumentationEvent } from '../instrumentation';
+import { ExtractMethodsStep } from '../pipeline/extract-methods';
+import { PipelineScheduler } from '../pipeline/pipeline-scheduler';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const EXAMPLE_INPUT_1 = readFileSync(`${path.join(__dirname, 'files/example_input_1.py')}`, 'utf8');
+const VELOCITAS_TEMPLATE_MAINPY = readFileSync(`${path.join(__dirname, 'files/velocitas_template_main.py')}`, 'utf8');
+
+const collectStepOutcomes = (events: InstrumentationEvent[]): Record<string, unknown> =>
+    events
+        .filter((event: InstrumentationEvent) => event.kind === 'pipelineStep')
+        .reduce((outcomes: Record<string, unknown>, event: InstrumentationEvent) => {
+            outcomes[event.name] = event.attributes.outcome;
+            return outcomes;
+        }, {});
+
+describe('Pipeline Scheduler', () => {
+    it('should skip the steps of code constructs which are not in the code snippet', async () => {
+        const events: InstrumentationEvent[] = [];
+        const codeConverter = new CodeConverter({ observer: { onEnd: (event: InstrumentationEvent) => events.push(event) } });
+        const convertedMainPy = codeConverter.convertMainPy(VELOCITAS_TEMPLATE_MAINPY, 'vehicle.Cabin.Light.IsOn.set(True)', 'test');
+        expect(collectStepOutcomes(events)).to.be.deep.equal({
+            PrepareCodeSnippetStep: 'executed',
+            ExtractImportsStep: 'executed',
+            ExtractVariablesStep: 'skipped',
+            ExtractClassesStep: 'skipped',
+            ExtractMethodsStep: 'skipped',
+            CreateCodeSnippetForTemplateStep: 'executed',
+        });
+        expect(convertedMainPy.finalizedMainPy).to.include('await self.Vehicle.Cabin.Light.IsOn.set(True)');
+    });
+    it('should reuse the step results of an unchanged code snippet', async () => {
+        const events: InstrumentationEvent[] = [];
+        const observer = { onEnd: (event: InstrumentationEvent) => events.push(event) };
+        const codeSnippet = `${EXAMPLE_INPUT_1}\nprint("reused")`;
+        new CodeConverter({ observer: observer, reuseStepResults: true }).convertMainPy(VELOCITAS_TEMPLATE_MAINPY, codeSnippet, 'test');
+        const firstOutcomes = collectStepOutcomes(events);
+
+        events.length = 0;
+        const reusedResult = new CodeConverter({ observer: observer, reuseStepResults: true }).convertMainPy(
+            VELOCITAS_TEMPLATE_MAINPY,
+            codeSnippet,
+            'otherApp'
+        );
+        const stepOutcomes = {
+            PrepareCodeSnippetStep: 'executed',
+            ExtractImportsStep: 'executed',
+            ExtractVariablesStep: 'executed',
+            ExtractClassesStep: 'skipped',
+            ExtractMethodsStep: 'executed',
+            CreateCodeSnippetForTemplateStep: 'executed',
+        };
+        expect(firstOutcomes).to.be.deep.equal(stepOutcomes);
+        expect(collectStepOutcomes(events)).to.be.deep.equal({
+            ...stepOutcomes,
+            PrepareCodeSnippetStep: 'reused',
+            ExtractImportsStep: 'reused',
+            ExtractVariablesStep: 'reused',
+            ExtractMethodsStep: 'reused',
+            CreateCodeSnippetForTemplateStep: 'reused',
+        });
+        expect(reusedResult).to.be.deep.equal(new CodeConverter().convertMainPy(VELOCITAS_TEMPLATE_MAINPY, codeSnippet, 'otherApp'));
+    });
+    it('should reject steps reading fields which no earlier step writes', async () => {
+        expect(() => new PipelineScheduler([new ExtractMethodsStep()], ['codeSnippetStringArray', 'rewriteRules'])).to.throw(
+            'Pipeline step ExtractMethodsStep reads variableNames, which no earlier step writes.'
+        );
+    });
+});
@@ -0,0 +1,133 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import nock from 'nock';
+import { ProjectGenerationJob, ProjectGeneratorPool } from '../project-generator-pool';
+import { TemplateCache } from '../template-cache';
+import { APP_MANIFEST_PATH, MAIN_PY_PATH } from '../utils/constants';
+import { RateLimitScheduler } from '../utils/rateLimitScheduler';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const OWNER = 'testOwner';
+const TOKEN = 'testToken';
+const BASE64_CODE_SNIPPET = 'VGVzdFNuaXBwZXQ=';
+const BASE64_PAYLOAD = 'eyJWZWhpY2xlIjp7fX0=';
+const MOCK_SHA = 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa';
+
+const GITHUB_API_URL = 'https://api.github.com/repos';
+const PYTHON_TEMPLATE_URL = `${GITHUB_API_URL}/eclipse-velocitas/vehicle-app-python-template`;
+
+const mockGeneratedRepository = (repo: string) => {
+    const repositoryUrl = `${GITHUB_API_URL}/${OWNER}/${repo}`;
+    nock(repositoryUrl).get('/contents').reply(200);
+    nock(repositoryUrl).put('/actions/permissions').twice().reply(200);
+    nock(repositoryUrl).post('/git/trees').reply(200, { sha: MOCK_SHA });
+    nock(repositoryUrl).get('/git/trees/main').reply(200, { sha: MOCK_SHA });
+    nock(repositoryUrl)
+        .get('/git/refs/heads/main')
+        .twice()
+        .reply(200, { object: { sha: MOCK_SHA } });
+    nock(repositoryUrl).post('/git/commits').reply(200, { sha: MOCK_SHA });
+    nock(repositoryUrl).get(`/git/commits/${MOCK_SHA}`).reply(200, { sha: MOCK_SHA });
+    nock(repositoryUrl).put('/actions/permissions/workflow').reply(200);
+    nock(repositoryUrl).patch('/git/refs/heads/main').reply(200, { content: MOCK_SHA });
+};
+
+const createJob = (repo: string, authToken: string = TOKEN): ProjectGenerationJob => ({
+    owner: OWNER,
+    repo: repo,
+    authToken: authToken,
+    codeSnippet: BASE64_CODE_SNIPPET,
+    appName: 'testApp',
+    vspecPayload: BASE64_PAYLOAD,
+});
+
+describe('Project Generator Pool', () => {
+    it('should report a result for every job in job order', async () => {
+        nock(PYTHON_TEMPLATE_URL)
+            .post('/generate', (body: any) => body.name === 'poolRepo1')
+            .reply(429, {}, { 'Retry-After': '0' });
+        nock(PYTHON_TEMPLATE_URL)
+            .post('/generate', (body: any) => body.name === 'poolRepo1')
+            .reply(200);
+        nock(PYTHON_TEMPLATE_URL)
+            .post('/generate', (body: any) => body.name === 'poolRepo2')
+            .reply(422, { message: 'Repository creation failed.' });
+        mockGeneratedRepository('poolRepo1');
+
+        const templateCache = new TemplateCache();
+        templateCache.prewarm(MAIN_PY_PATH, 'print("Hello World")\n');
+        templateCache.prewarm(APP_MANIFEST_PATH, '[{"name": "template", "vehicleModel": {"src": "template"}}]\n');
+        const pool = new ProjectGeneratorPool({ concurrency: 2, generatorOptions: { templateCache, inlineTreeContent: true } });
+        try {
+            const results = await pool.run([createJob('poolRepo1'), createJob('poolRepo2')]);
+            expect(results.map((result) => result.job.repo)).to.be.deep.equal(['poolRepo1', 'poolRepo2']);
+            expect(results[0].status).to.be.equal(200);
+            expect(results[0].error).to.be.undefined;
+            expect(results[1].error).to.be.instanceof(Error);
+            expect(results[1].durationMs).to.be.at.least(0);
+        } finally {
+            pool.destroy();
+        }
+    });
+    it('should not pause the jobs of other tokens on a rate limit', async () => {
+        const resetInSeconds = Math.floor(Date.now() / 1000) + 3600;
+        nock(PYTHON_TEMPLATE_URL)
+            .post('/generate', (body: any) => body.name === 'rateLimitedRepo')
+            .reply(
+                422,
+                { message: 'Repository creation failed.' },
+                { 'x-ratelimit-remaining': '0', 'x-ratelimit-reset': `${resetInSeconds}` }
+            );
+        nock(PYTHON_TEMPLATE_URL)
+            .post('/generate', (body: any) => body.name === 'otherTokenRepo')
+            .reply(200);
+        mockGeneratedRepository('otherTokenRepo');
+
+        const templateCache = new TemplateCache();
+        templateCache.prewarm(MAIN_PY_PATH, 'print("Hello World")\n');
+        templateCache.prewarm(APP_MANIFEST_PATH, '[{"name": "template", "vehicleModel": {"src": "template"}}]\n');
+        // One job at a time, so the rate limit of the first token is known before the job of the second token starts
+        const pool = new ProjectGeneratorPool({ concurrency: 1, generatorOptions: { templateCache, inlineTreeContent: true } });
+        try {
+            const results = await pool.run([createJob('rateLimitedRepo', 'tokenA'), createJob('otherTokenRepo', 'tokenB')]);
+            expect(results[0].error).to.be.instanceof(Error);
+            expect(results[1].error).to.be.undefined;
+            expect(results[1].status).to.be.equal(200);
+            expect(results[1].durationMs).to.be.below(5000);
+        } finally {
+            pool.destroy();
+        }
+    });
+});
+
+describe('Rate Limit Scheduler', () => {
+    it('should pause until the rate limit is reset', async () => {
+        const scheduler = new RateLimitScheduler();
+        const resetInSeconds = Math.floor(Date.now() / 1000) + 60;
+        const isRateLimited = scheduler.update(403, { 'x-ratelimit-remaining': '0', 'x-ratelimit-reset': `${resetInSeconds}` });
+        expect(isRateLimited).to.be.true;
+        expect(scheduler.pausedUntil).to.be.equal(resetInSeconds * 1000);
+    });
+    it('should not pause for regular responses', async () => {
+        const scheduler = new RateLimitScheduler();
+        expect(scheduler.update(403, { 'x-ratelimit-remaining': '42' })).to.be.false;
+        expect(scheduler.update(200, {})).to.be.false;
+        expect(scheduler.pausedUntil).to.be.equal(0);
+    });
+});
@@ -12,13 +12,21 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
+import { readFileSync } from 'fs';
+import * as path from 'path';
 import { ProjectGenerator } from '../project-generator';
+import { ProjectGeneratorError } from '../project-generator-error';
+import { GenerationCheckpoint } from '../generation-checkpoint';
 
 import * as chai from 'chai';
 import chaiAsPromised from 'chai-as-promised';
 import nock from 'nock';
-import { APP_MANIFEST_PATH, MAIN_PY_PATH } from '../utils/constants';
+import { APP_MANIFEST_PATH, GENERATION_STAGES, LOCAL_VSPEC_PATH, MAIN_PY_PATH } from '../utils/constants';
 import { VspecUriObject } from '../utils/types';
+import { TemplateCache } from '../template-cache';
+import { HistogramObserver } from '../instrumentation-adapters';
+import { ConversionCache } from '../conversion-cache';
+import { computeGitBlobSha } from '../utils/gitBlob';
 
 chai.use(chaiAsPromised);
 const expect = chai.expect;
@@ -34,12 +42,75 @@ const BASE64_CONTENT =
     'WwogICB7CiAgICAgICJuYW1lIjoidGVzdGFwcCIsCiAgICAgICJ2ZWhpY2xlTW9kZWwiOnsKICAgICAgICAgInNyYyI6InRlc3RzcmMiCiAgICAgIH0KICAgfQpd';
 const MOCK_SHA = 'aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa';
 
+const SIGNALS_CODE_SNIPPET = readFileSync(path.join(__dirname, 'files/example_input_3.py')).toString('base64');
+const VELOCITAS_TEMPLATE_CONTENT = readFileSync(path.join(__dirname, 'files/velocitas_template_main.py')).toString('base64');
+const SIGNALS_VSPEC = {
+    Vehicle: {
+        type: 'branch',
+        children: {
+            Speed: { type: 'sensor', datatype: 'float' },
+            Cabin: {
+                type: 'branch',
+                children: {
+                    Seat: { type: 'branch', children: { Row1: { type: 'branch', children: { Pos1: { type: 'branch', children: {} } } } } },
+                    Sunroof: { type: 'branch', children: { Switch: { type: 'actuator', datatype: 'string' } } },
+                },
+            },
+        },
+    },
+};
+
 const vspecUriObject: VspecUriObject = { repo: 'https://test.com/testOrg/testRepo', commit: '015dd1532922091ce2675755843273c41efbeba8' };
 
 const GITHUB_API_URL = 'https://api.github.com/repos';
 const PYTHON_TEMPLATE_URL = `${GITHUB_API_URL}/eclipse-velocitas/vehicle-app-python-template`;
 
+/**
+ * @type GenerationFlowOverrides
+ * @prop {number} blobs Number of blobs created, without `inlineTreeContent`.
+ * @prop {(body: any) => boolean} blobBody Matcher of the created blobs.
+ * @prop {(body: any) => boolean} treeBody Matcher of the created tree.
+ */
+interface GenerationFlowOverrides {
+    blobs?: number;
+    blobBody?: (body: any) => boolean;
+    treeBody?: (body: any) => boolean;
+}
+
+const mockTemplateFiles = (mainPyContent: string = BASE64_CONTENT) => {
+    nock(`${PYTHON_TEMPLATE_URL}`).get(`/contents/${APP_MANIFEST_PATH}`).query({ ref: 'main' }).reply(200, { content: BASE64_CONTENT });
+    nock(`${PYTHON_TEMPLATE_URL}`).get(`/contents/${MAIN_PY_PATH}`).query({ ref: 'main' }).reply(200, { content: mainPyContent });
+};
+
+// Every GitHub request of generating a repository from the template, each expected as often as it is sent
+const mockGenerationFlow = (overrides: GenerationFlowOverrides = {}) => {
+    nock(`${PYTHON_TEMPLATE_URL}`).post('/generate').reply(200);
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get('/contents').reply(200);
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).put('/actions/permissions').twice().reply(200);
+    mockTemplateFiles();
+    if (overrides.blobs) {
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`)
+            .post('/git/blobs', overrides.blobBody ?? (() => true))
+            .times(overrides.blobs)
+            .reply(200, { sha: MOCK_SHA });
+    }
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get('/git/trees/main').reply(200, { sha: MOCK_SHA });
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`)
+        .post('/git/trees', overrides.treeBody ?? (() => true))
+        .reply(200, { sha: MOCK_SHA });
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`)
+        .get('/git/refs/heads/main')
+        .twice()
+        .reply(200, { object: { sha: MOCK_SHA } });
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).post('/git/commits').reply(200, { sha: MOCK_SHA });
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get(`/git/commits/${MOCK_SHA}`).reply(200, { sha: MOCK_SHA });
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).put('/actions/permissions/workflow').reply(200);
+    nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).patch('/git/refs/heads/main').reply(200, { content: MOCK_SHA });
+};
+
 describe('Project Generator', () => {
+    afterEach(() => nock.cleanAll());
+
     it('should initialize', async () => {
         const generator = new ProjectGenerator(OWNER, REPO, TOKEN);
         expect(generator).to.be.instanceof(ProjectGenerator);
@@ -65,28 +136,213 @@ describe('Project Generator', () => {
     //     expect(response).to.be.equal(200);
     // });
     it('should run with payload', async () => {
-        nock(`${PYTHON_TEMPLATE_URL}`).post('/generate').reply(200);
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get('/contents').reply(200);
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).persist().put('/actions/permissions').reply(200);
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get(`/contents/${APP_MANIFEST_PATH}`).reply(200, { content: BASE64_CONTENT });
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get(`/contents/${MAIN_PY_PATH}`).reply(200, { content: BASE64_CONTENT });
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).persist().post('/git/blobs').reply(200, { sha: MOCK_SHA });
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get('/git/trees/main').reply(200, { sha: MOCK_SHA });
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).post('/git/trees').reply(200, { sha: MOCK_SHA });
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`)
-            .get('/git/refs/heads/main')
-            .reply(200, { object: { sha: MOCK_SHA } });
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).post('/git/commits').reply(200, { sha: MOCK_SHA });
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).put('/actions/permissions/workflow').reply(200);
-        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).patch('/git/refs/heads/main').reply(200, { content: MOCK_SHA });
+        mockGenerationFlow({ blobs: 3 });
 
-        const generator = new ProjectGenerator(OWNER, REPO, TOKEN);
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, { templateCache: new TemplateCache() });
+        const response = await generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD);
+        expect(response).to.be.equal(200);
+    });
+    it('should run with payload and inline tree content', async () => {
+        mockGenerationFlow({
+            treeBody: (body: any) => body.tree.length === 3 && body.tree.every((file: any) => file.content && !file.sha),
+        });
+
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, { templateCache: new TemplateCache(), inlineTreeContent: true });
+        const response = await generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD);
+        expect(response).to.be.equal(200);
+    });
+    it('should report requests and waits to the observer', async () => {
+        mockGenerationFlow();
+
+        const histogramObserver = new HistogramObserver();
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, {
+            templateCache: new TemplateCache(),
+            inlineTreeContent: true,
+            conversionCache: new ConversionCache(),
+            observer: histogramObserver,
+        });
+        await generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD);
+        const summary = histogramObserver.summary();
+        expect(summary['generation runWithPayload'].count).to.be.equal(1);
+        expect(summary['httpRequest PUT /actions/permissions'].count).to.be.equal(2);
+        expect(summary['httpRequest GET /git/refs/heads/main'].count).to.be.equal(2);
+        expect(summary['wait readiness'].count).to.be.equal(3);
+        expect(summary['pipelineStep ExtractMethodsStep'].count).to.be.equal(1);
+    });
+    it('should stream large payloads as blob', async () => {
+        const expectedVspecJson = `${JSON.stringify(JSON.parse(Buffer.from(BASE64_PAYLOAD, 'base64').toString()), null, 4)}\n`;
+        mockGenerationFlow({
+            blobs: 1,
+            blobBody: (body: any) => Buffer.from(body.content, 'base64').toString() === expectedVspecJson,
+            treeBody: (body: any) => body.tree.filter((file: any) => file.sha === MOCK_SHA).length === 1,
+        });
+
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, {
+            templateCache: new TemplateCache(),
+            inlineTreeContent: true,
+            vspecStreamingThreshold: 0,
+        });
+        const response = await generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD);
+        expect(response).to.be.equal(200);
+    });
+    it('should reject invalid large payloads before generating the repository', async () => {
+        mockTemplateFiles();
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, { templateCache: new TemplateCache(), vspecStreamingThreshold: 0 });
+        const invalidPayload = Buffer.from('{"Vehicle": ').toString('base64');
+        await expect(generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, invalidPayload)).to.eventually.be.rejectedWith(SyntaxError);
+    });
+    it('should reject unknown signals before generating the repository', async () => {
+        const vspecPayload = Buffer.from(JSON.stringify(SIGNALS_VSPEC)).toString('base64');
+        for (const vspecStreamingThreshold of [Infinity, 0]) {
+            mockTemplateFiles(VELOCITAS_TEMPLATE_CONTENT);
+            const generateScope = nock(`${PYTHON_TEMPLATE_URL}`).post('/generate').reply(200);
+            const generator = new ProjectGenerator(OWNER, REPO, TOKEN, {
+                templateCache: new TemplateCache(),
+                vspecStreamingThreshold: vspecStreamingThreshold,
+            });
+            await expect(generator.runWithPayload(SIGNALS_CODE_SNIPPET, APP_NAME, vspecPayload)).to.eventually.be.rejectedWith(
+                'Signals not found in the vspec: Vehicle.Cabin.Seat.Row1.Pos1.Position'
+            );
+            expect(generateScope.isDone()).to.be.equal(false);
+            nock.cleanAll();
+        }
+    });
+    it('should retry idempotent requests failing with a server error', async () => {
+        // Interceptors match in the order they are registered, so the first commit fails
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).post('/git/commits').reply(502);
+        mockGenerationFlow();
+
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, {
+            templateCache: new TemplateCache(),
+            inlineTreeContent: true,
+            transientRetry: { initialDelayMs: 1 },
+        });
         const response = await generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD);
         expect(response).to.be.equal(200);
     });
+    it('should resume after the last completed stage', async () => {
+        // The commit of the generation fails, the one of the flow is left for resuming
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).post('/git/commits').reply(503);
+        mockGenerationFlow();
+
+        const stages: string[] = [];
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, {
+            templateCache: new TemplateCache(),
+            inlineTreeContent: true,
+            transientRetry: { maxRetries: 0 },
+            onCheckpoint: (checkpoint: GenerationCheckpoint) => {
+                stages.push(checkpoint.stage);
+            },
+        });
+        const error = await generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD).catch((error: any) => error);
+        expect(error).to.be.instanceof(ProjectGeneratorError);
+        expect(error.checkpoint.stage).to.be.equal(GENERATION_STAGES.treeCreated);
+        expect(error.checkpoint.newTree).to.be.deep.equal({ treeSha: MOCK_SHA, parentCommitSha: MOCK_SHA });
+        expect(stages).to.be.deep.equal([
+            GENERATION_STAGES.repositoryCreated,
+            GENERATION_STAGES.filesCreated,
+            GENERATION_STAGES.treeCreated,
+        ]);
+
+        const response = await generator.resume(error.checkpoint);
+        expect(response).to.be.equal(200);
+        expect(stages.slice(3)).to.be.deep.equal([GENERATION_STAGES.commitCreated, GENERATION_STAGES.completed]);
+    });
     it('should throw an error on repository generation', async () => {
+        mockTemplateFiles();
         nock(`${PYTHON_TEMPLATE_URL}`).post('/generate').reply(422);
         const generator = new ProjectGenerator(OWNER, REPO, TOKEN);
-        await expect(generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD)).to.eventually.be.rejectedWith(Error);
+        const error = await generator.runWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD).catch((error: any) => error);
+        expect(error).to.be.instanceof(ProjectGeneratorError);
+        expect(error.statusCode).to.be.equal(422);
+        expect(error.isAxiosError).to.be.equal(true);
+        expect(error.response.status).to.be.equal(422);
+        expect(error.config.url).to.include('/generate');
     });
 });
+
+describe('Project Generator Update', () => {
+    afterEach(() => nock.cleanAll());
+
+    const mockMainBranchTree = (fileShas: { [filePath: string]: string }) => {
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`)
+            .get('/git/refs/heads/main')
+            .reply(200, { object: { sha: MOCK_SHA } });
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`)
+            .get(`/git/trees/${MOCK_SHA}`)
+            .query({ recursive: '1' })
+            .reply(200, {
+                sha: MOCK_SHA,
+                tree: Object.keys(fileShas).map((filePath: string) => ({ path: filePath, type: 'blob', sha: fileShas[filePath] })),
+            });
+    };
+    const mockCommit = (onTree: (tree: any[]) => void) => {
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`)
+            .post('/git/trees', (body: any) => {
+                onTree(body.tree);
+                return body.base_tree === MOCK_SHA;
+            })
+            .reply(200, { sha: MOCK_SHA });
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).post('/git/commits').reply(200, { sha: MOCK_SHA });
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).get(`/git/commits/${MOCK_SHA}`).reply(200, { sha: MOCK_SHA });
+        // The workflows were enabled with the generation, so updates do not change their permissions
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).patch('/git/refs/heads/main').reply(200, { content: MOCK_SHA });
+    };
+
+    it('should only commit files which differ from the main branch', async () => {
+        mockTemplateFiles();
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, { templateCache: new TemplateCache(), inlineTreeContent: true });
+
+        let committedTree: any[] = [];
+        mockMainBranchTree({});
+        mockCommit((tree: any[]) => (committedTree = tree));
+        expect(await generator.updateWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD)).to.be.equal(200);
+        expect(committedTree.map((file: any) => file.path)).to.be.deep.equal([APP_MANIFEST_PATH, MAIN_PY_PATH, LOCAL_VSPEC_PATH]);
+
+        const fileShas = committedTree.reduce((shas: { [filePath: string]: string }, file: any) => {
+            shas[file.path] = computeGitBlobSha(file.content);
+            return shas;
+        }, {});
+        mockMainBranchTree(fileShas);
+        expect(await generator.updateWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD)).to.be.equal(304);
+
+        mockMainBranchTree(fileShas);
+        mockCommit((tree: any[]) => (committedTree = tree));
+        const otherPayload = Buffer.from('{"Vehicle": {"type": "branch"}}').toString('base64');
+        expect(await generator.updateWithPayload(BASE64_CODE_SNIPPET, APP_NAME, otherPayload)).to.be.equal(200);
+        expect(committedTree.map((file: any) => file.path)).to.be.deep.equal([LOCAL_VSPEC_PATH]);
+    });
+    it('should compare streamed large vspecs', async () => {
+        mockTemplateFiles();
+        const templateCache = new TemplateCache();
+        const vspecJson = `${JSON.stringify(JSON.parse(Buffer.from(BASE64_PAYLOAD, 'base64').toString()), null, 4)}\n`;
+
+        let committedTree: any[] = [];
+        mockMainBranchTree({ [LOCAL_VSPEC_PATH]: computeGitBlobSha(vspecJson) });
+        mockCommit((tree: any[]) => (committedTree = tree));
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, { templateCache: templateCache, vspecStreamingThreshold: 0 });
+        nock(`${GITHUB_API_URL}/${OWNER}/${REPO}`).post('/git/blobs').twice().reply(200, { sha: MOCK_SHA });
+        expect(await generator.updateWithPayload(BASE64_CODE_SNIPPET, APP_NAME, BASE64_PAYLOAD)).to.be.equal(200);
+        expect(committedTree.map((file: any) => file.path)).to.be.deep.equal([APP_MANIFEST_PATH, MAIN_PY_PATH]);
+    });
+    it('should upload the vspec pruned to the used signals', async () => {
+        mockTemplateFiles(VELOCITAS_TEMPLATE_CONTENT);
+        const vspec = JSON.parse(JSON.stringify(SIGNALS_VSPEC));
+        vspec.Vehicle.children.Cabin.children.Seat.children.Row1.children.Pos1.children.Position = { type: 'actuator', datatype: 'uint16' };
+        const vspecPayload = Buffer.from(JSON.stringify(vspec)).toString('base64');
+
+        let committedTree: any[] = [];
+        mockMainBranchTree({});
+        mockCommit((tree: any[]) => (committedTree = tree));
+        const generator = new ProjectGenerator(OWNER, REPO, TOKEN, {
+            templateCache: new TemplateCache(),
+            inlineTreeContent: true,
+            pruneVspec: true,
+            vspecStreamingThreshold: 0,
+        });
+        expect(await generator.updateWithPayload(SIGNALS_CODE_SNIPPET, APP_NAME, vspecPayload)).to.be.equal(200);
+        const prunedVspec = JSON.parse(committedTree.find((file: any) => file.path === LOCAL_VSPEC_PATH).content);
+        expect(Object.keys(prunedVspec.Vehicle.children)).to.be.deep.equal(['Cabin', 'Speed']);
+        expect(Object.keys(prunedVspec.Vehicle.children.Cabin.children)).to.be.deep.equal(['Seat']);
+    });
+});
\ No newline at end of file
@@ -0,0 +1,81 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as http from 'http';
+import * as net from 'net';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import axios from 'axios';
+import { backoffDelay, DEFAULT_READINESS_OPTIONS, waitForResource } from '../utils/readiness';
+import { Instrumentation, InstrumentationEvent } from '../instrumentation';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const FAST_POLLING = { initialDelayMs: 1, maxDelayMs: 5, jitter: 0, timeoutMs: 1000 };
+
+// Local stand-in for GitHub answering with the given status codes one after another
+const startStandIn = async (statusCodes: number[]): Promise<http.Server> => {
+    const server = http.createServer((_request, response) => {
+        response.statusCode = statusCodes.length > 1 ? (statusCodes.shift() as number) : statusCodes[0];
+        response.setHeader('Content-Type', 'application/json');
+        response.end('{}');
+    });
+    await new Promise<void>((resolve) => server.listen(0, '127.0.0.1', resolve));
+    return server;
+};
+
+const clientFor = (server: http.Server) => axios.create({ baseURL: `http://127.0.0.1:${(server.address() as net.AddressInfo).port}` });
+
+describe('Readiness', () => {
+    it('should poll until the resource is readable', async () => {
+        const server = await startStandIn([404, 409, 200]);
+        try {
+            const events: InstrumentationEvent[] = [];
+            const instrumentation = new Instrumentation({ onEnd: (event: InstrumentationEvent) => events.push(event) });
+            const attempts = await waitForResource(clientFor(server), '/git/refs/heads/main', FAST_POLLING, instrumentation);
+            expect(attempts.map((attempt) => attempt.status)).to.be.deep.equal([404, 409, 200]);
+            const backoffs = events.map((event: InstrumentationEvent) => [event.name, event.attributes.attempt, event.attributes.status]);
+            expect(backoffs).to.be.deep.equal([
+                ['readinessBackoff', 1, 404],
+                ['readinessBackoff', 2, 409],
+            ]);
+        } finally {
+            server.close();
+        }
+    });
+    it('should give up after the deadline', async () => {
+        const server = await startStandIn([404]);
+        try {
+            const readiness = waitForResource(clientFor(server), '/contents', { ...FAST_POLLING, timeoutMs: 20 });
+            await expect(readiness).to.eventually.be.rejectedWith(Error);
+        } finally {
+            server.close();
+        }
+    });
+    it('should not retry unexpected errors', async () => {
+        const server = await startStandIn([401, 200]);
+        try {
+            await expect(waitForResource(clientFor(server), '/contents', FAST_POLLING)).to.eventually.be.rejectedWith(Error);
+        } finally {
+            server.close();
+        }
+    });
+    it('should grow the delay exponentially up to its maximum', async () => {
+        const options = { ...DEFAULT_READINESS_OPTIONS, jitter: 0 };
+        const delays = [1, 2, 3, 10].map((attempt: number) => backoffDelay(attempt, options));
+        expect(delays).to.be.deep.equal([250, 500, 1000, 4000]);
+    });
+});
@@ -12,7 +12,8 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
-import { REGEX } from '../utils/regex';
+import { REGEX, variableRegex, variablesRegex } from '../utils/regex';
+import { createArrayFromMultilineString, removeMultilineStrings } from '../utils/helpers';
 
 import * as chai from 'chai';
 import chaiAsPromised from 'chai-as-promised';
@@ -97,4 +98,34 @@ describe('Regex', () => {
         expect(convertedMultilineTwoLines).to.be.equal(expectedMultilineOutput);
         expect(convertedIndentedMultilineTwoLines).to.be.equal(expectedIndentedMultilineOutput);
     });
+    it('should remove multiline comments line by line like the regex does', async () => {
+        const inputs = [
+            multiline,
+            indentedMultiline,
+            multilineOneLine,
+            indentedMultilineOneLine,
+            multilineTwoLines,
+            indentedMultilineTwoLines,
+            `DO NOT REPLACE """ unterminated\nDO NOT REPLACE`,
+            `DO NOT REPLACE """ first """ DO NOT REPLACE """ second\nsecond """ DO NOT REPLACE`,
+        ];
+        inputs.forEach((input: string) => {
+            const expectedOutput = input.replace(REGEX.EVERYTHING_BETWEEN_MULTILINE, '');
+            expect(removeMultilineStrings(createArrayFromMultilineString(input)).join('\n')).to.be.equal(expectedOutput);
+        });
+    });
+});
+
+describe('Variable Regex', () => {
+    it('should reuse compiled patterns', async () => {
+        expect(variableRegex('speed')).to.be.equal(variableRegex('speed'));
+        expect(variablesRegex(['speed', 'position'])).to.be.equal(variablesRegex(['speed', 'position']));
+    });
+    it('should prefer longer variable names in the alternation', async () => {
+        const rewrittenLine = 'if ActualPosition < Position: print("Position")'.replace(
+            variablesRegex(['Position', 'ActualPosition']),
+            (variableName: string) => `self.${variableName}`
+        );
+        expect(rewrittenLine).to.be.equal('if self.ActualPosition < self.Position: print("Position")');
+    });
 });
@@ -0,0 +1,84 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { MAIN_PY_RULES, RewriteRuleSet, VELOCITAS_STRUCTURE_RULES } from '../utils/rewriteRules';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+describe('Rewrite Rules', () => {
+    it('should rewrite code blocks like the chained replacements', async () => {
+        const codeLines = [
+            'vehicle.Speed.get()',
+            'print(vehicle.Speed.get())',
+            'print(f"Speed {vehicle.Speed.get()}")',
+            'value = (await self.Vehicle.Speed.get()).value',
+        ];
+        expect(codeLines.map((codeLine: string) => VELOCITAS_STRUCTURE_RULES.apply(codeLine))).to.be.deep.equal([
+            'await self.Vehicle.Speed.get()',
+            'logger.info(self.Vehicle.Speed.get())',
+            'logger.info("Speed {await self.Vehicle.Speed.get()}")',
+            'value = (self.Vehicle.Speed.get()).value',
+        ]);
+    });
+    it('should apply the first registered rule at the same position', async () => {
+        const rules = new RewriteRuleSet([{ name: 'number', pattern: /\d+/, replacement: '<number>' }]);
+        rules.register({ name: 'version', pattern: /v(\d+)/, replacement: (_match: string, version: string) => `version ${version}` });
+        rules.register({ name: 'zero', pattern: /0/, replacement: 'zero' }, 'number');
+        expect(rules.rules.map((rule) => rule.name)).to.be.deep.equal(['zero', 'number', 'version']);
+        expect(rules.apply('v2 has 10 items')).to.be.equal('version 2 has <number> items');
+        expect(rules.apply('0 or 01')).to.be.equal('zero or zero<number>');
+        expect(() => rules.register({ name: 'zero', pattern: /0/, replacement: '' })).to.throw();
+        expect(() => rules.register({ name: 'one', pattern: /1/, replacement: '' }, 'unknown')).to.throw();
+    });
+    it('should split replacements into lines and rewrite once rules only once', async () => {
+        const rules = new RewriteRuleSet([
+            { name: 'marker', pattern: /MARKER/, replacement: 'first\nsecond' },
+            { name: 'import', pattern: /, extra/, replacement: '', once: true },
+        ]);
+        expect(rules.applyToLines(['import a, extra', 'MARKER', 'import b, extra'])).to.be.deep.equal([
+            'import a',
+            'first',
+            'second',
+            'import b, extra',
+        ]);
+    });
+    it('should pass the context to function replacements and rewrite once rules once per call', async () => {
+        const templateLines = [
+            'from velocitas_sdk.vehicle_app import VehicleApp, subscribe_topic',
+            'class SampleApp(VehicleApp):',
+            '    async def on_start(self):',
+            '# import VehicleApp, subscribe_topic',
+        ];
+        const convert = (appClassName: string, codeSnippet: string[]) =>
+            MAIN_PY_RULES.applyToLines(templateLines, { codeSnippet: codeSnippet, memberVariables: [], appClassName: appClassName });
+        expect(convert('FirstApp', ['    async def on_start(self):', '        pass'])).to.be.deep.equal([
+            'from velocitas_sdk.vehicle_app import VehicleApp',
+            'class FirstApp(VehicleApp):',
+            '    async def on_start(self):',
+            '        pass',
+            '# import VehicleApp, subscribe_topic',
+        ]);
+        expect(convert('SecondApp', ['    async def on_start(self):', '        return'])).to.be.deep.equal([
+            'from velocitas_sdk.vehicle_app import VehicleApp',
+            'class SecondApp(VehicleApp):',
+            '    async def on_start(self):',
+            '        return',
+            '# import VehicleApp, subscribe_topic',
+        ]);
+    });
+});
@@ -0,0 +1,81 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { mkdtempSync, mkdirSync, writeFileSync } from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import nock from 'nock';
+import { GitRequestHandler } from '../gitRequestHandler';
+import { TemplateCache, TemplateFileResponse } from '../template-cache';
+import { APP_MANIFEST_PATH, MAIN_PY_PATH } from '../utils/constants';
+import { encode } from '../utils/helpers';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const PYTHON_TEMPLATE_URL = 'https://api.github.com/repos/eclipse-velocitas/vehicle-app-python-template';
+const MAIN_PY_CONTENT = 'print("Hello World")\n';
+const ETAG = '"0123456789abcdef"';
+
+describe('Template Cache', () => {
+    it('should fetch a template file only once within its TTL', async () => {
+        const templateCache = new TemplateCache();
+        const requestedFiles: string[] = [];
+        const fetchFile = async (filePath: string): Promise<TemplateFileResponse> => {
+            requestedFiles.push(filePath);
+            return { content: encode(MAIN_PY_CONTENT), etag: ETAG };
+        };
+        const fileContents = await Promise.all([
+            templateCache.getFileContent(MAIN_PY_PATH, fetchFile),
+            templateCache.getFileContent(MAIN_PY_PATH, fetchFile),
+        ]);
+        fileContents.push(await templateCache.getFileContent(MAIN_PY_PATH, fetchFile));
+        expect(fileContents).to.be.deep.equal([MAIN_PY_CONTENT, MAIN_PY_CONTENT, MAIN_PY_CONTENT]);
+        expect(requestedFiles).to.be.deep.equal([MAIN_PY_PATH]);
+    });
+    it('should revalidate expired files with If-None-Match', async () => {
+        nock(PYTHON_TEMPLATE_URL)
+            .get(`/contents/${MAIN_PY_PATH}`)
+            .query({ ref: 'main' })
+            .reply(200, { content: encode(MAIN_PY_CONTENT) }, { ETag: ETAG });
+        nock(PYTHON_TEMPLATE_URL, { reqheaders: { 'If-None-Match': ETAG } })
+            .get(`/contents/${MAIN_PY_PATH}`)
+            .query({ ref: 'main' })
+            .reply(304);
+        const gitRequestHandler = new GitRequestHandler('testOwner', 'testRepo', 'testToken');
+        const fetchFile = (filePath: string, ref: string, etag?: string) =>
+            gitRequestHandler.getTemplateFileContentData(filePath, ref, etag);
+        const templateCache = new TemplateCache(0);
+        expect(await templateCache.getFileContent(MAIN_PY_PATH, fetchFile)).to.be.equal(MAIN_PY_CONTENT);
+        expect(await templateCache.getFileContent(MAIN_PY_PATH, fetchFile)).to.be.equal(MAIN_PY_CONTENT);
+        expect(templateCache.misses).to.be.equal(2);
+    });
+    it('should serve prewarmed files without fetching them', async () => {
+        const templateDirectory = mkdtempSync(path.join(os.tmpdir(), 'velocitas-template-'));
+        mkdirSync(path.join(templateDirectory, path.dirname(MAIN_PY_PATH)), { recursive: true });
+        writeFileSync(path.join(templateDirectory, MAIN_PY_PATH), MAIN_PY_CONTENT);
+        writeFileSync(path.join(templateDirectory, APP_MANIFEST_PATH), '{}\n');
+        const templateCache = new TemplateCache(0);
+        await templateCache.prewarmFromDirectory(templateDirectory);
+        const fetchFile = async (): Promise<TemplateFileResponse> => {
+            throw new Error('Prewarmed files must not be fetched.');
+        };
+        expect(await templateCache.getFileContent(MAIN_PY_PATH, fetchFile)).to.be.equal(MAIN_PY_CONTENT);
+        expect(await templateCache.getFileContent(APP_MANIFEST_PATH, fetchFile)).to.be.equal('{}\n');
+        expect(templateCache.hits).to.be.equal(2);
+    });
+});
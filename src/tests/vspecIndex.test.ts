@@ -0,0 +1,78 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import { VspecIndex } from '../utils/vspecIndex';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const SPEED = { datatype: 'float', type: 'sensor', unit: 'km/h' };
+const POSITION = { datatype: 'uint16', type: 'actuator' };
+const ROW1 = { type: 'branch', description: 'Row 1', children: { Pos1: { type: 'branch', children: { Position: POSITION } } } };
+const VSPEC = {
+    Vehicle: {
+        type: 'branch',
+        description: 'High-level vehicle data.',
+        children: {
+            Speed: SPEED,
+            Cabin: {
+                type: 'branch',
+                children: {
+                    Seat: { type: 'branch', children: { Row1: ROW1, Row2: { type: 'branch', children: {} } } },
+                    Sunroof: { type: 'branch', children: { Switch: { type: 'actuator' } } },
+                },
+            },
+        },
+    },
+};
+
+describe('Vspec Index', () => {
+    it('should resolve signal and branch paths', async () => {
+        const vspecIndex = new VspecIndex(VSPEC);
+        expect(vspecIndex.resolve('Vehicle.Speed')).to.be.equal(SPEED);
+        expect(vspecIndex.resolve('Vehicle.Cabin.Seat.Row1')).to.be.equal(ROW1);
+        const signalPaths = ['Vehicle.Speed', 'Vehicle.Speeds', 'Vehicle.Speed.Max', 'Vehicle.toString', 'Cabin'];
+        const unknownSignals = vspecIndex.findUnknownSignals(signalPaths);
+        expect(unknownSignals).to.be.deep.equal(['Vehicle.Speeds', 'Vehicle.Speed.Max', 'Vehicle.toString', 'Cabin']);
+    });
+    it('should prune the vspec to the given signals', async () => {
+        const prunedVspec = new VspecIndex(VSPEC).prune(['Vehicle.Cabin.Seat.Row1.Pos1.Position', 'Vehicle.Speed', 'Vehicle.Unknown']);
+        expect(prunedVspec).to.be.deep.equal({
+            Vehicle: {
+                type: 'branch',
+                description: 'High-level vehicle data.',
+                children: {
+                    Cabin: {
+                        type: 'branch',
+                        children: {
+                            Seat: { type: 'branch', children: { Row1: ROW1 } },
+                        },
+                    },
+                    Speed: SPEED,
+                },
+            },
+        });
+        expect(VSPEC.Vehicle.children.Cabin.children.Sunroof).to.not.be.undefined;
+    });
+    it('should keep branches given as path completely', async () => {
+        const signalPaths = ['Vehicle.Cabin.Seat.Row1.Pos1.Position', 'Vehicle.Cabin.Seat', 'Vehicle.Cabin.Seat.Row2'];
+        const prunedVspec = new VspecIndex(VSPEC).prune(signalPaths);
+        expect(prunedVspec.Vehicle.children.Cabin.children.Seat).to.be.equal(VSPEC.Vehicle.children.Cabin.children.Seat);
+        expect(new VspecIndex(VSPEC).prune([])).to.be.deep.equal({
+            Vehicle: { type: 'branch', description: 'High-level vehicle data.', children: {} },
+        });
+    });
+});
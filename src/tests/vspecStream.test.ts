@@ -0,0 +1,122 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { Readable } from 'stream';
+
+import * as chai from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import {
+    Base64DecodeStream,
+    Base64EncodeStream,
+    JsonFormatStream,
+    createVspecJsonStream,
+    findUnknownSignalsInPayload,
+} from '../utils/vspecStream';
+import { VspecIndex } from '../utils/vspecIndex';
+
+chai.use(chaiAsPromised);
+const expect = chai.expect;
+
+const CHUNK_SIZES = [1, 2, 3, 7, 64];
+const JSON_DOCUMENTS = [
+    '{"Vehicle": {"type": "branch", "children": {"Speed": {"datatype": "float", "min": -250, "max": 2.5e2}}}}',
+    ' [ 1 , -0, 0.50, 1E3, 12345678901234567890, true, false, null, [], {}, [[]], [{}] ] ',
+    '{"escaped": "quote \\" backslash \\\\ slash \\/ unicode \\u00e4 \\ud83d\\ude97", "umlaut": "äöü 🚗", "empty": ""}',
+    '{"nested": {"": {"a": [ {"b": {}} , [ ] ]}}}',
+    '"text"',
+    '42',
+];
+const INVALID_JSON_DOCUMENTS = ['{"a": 1,}', '{"a" 1}', '[1 2]', '{"a": tru}', '[01]', '{"a": "unterminated', '{]', '[1]]', '', '{} {}'];
+
+const collect = async (stream: Readable): Promise<string> => {
+    const chunks: Buffer[] = [];
+    for await (const chunk of stream) {
+        chunks.push(Buffer.from(chunk));
+    }
+    return Buffer.concat(chunks).toString();
+};
+
+const chunked = (content: string | Buffer, chunkSize: number): Readable => {
+    const chunks = [];
+    for (let index = 0; index < content.length; index += chunkSize) {
+        chunks.push(content.slice(index, index + chunkSize));
+    }
+    return Readable.from(chunks);
+};
+
+describe('Vspec Stream', () => {
+    it('should format JSON like JSON.stringify for any chunk size', async () => {
+        for (const jsonDocument of JSON_DOCUMENTS) {
+            const expectedJson = JSON.stringify(JSON.parse(jsonDocument), null, 4);
+            for (const chunkSize of CHUNK_SIZES) {
+                const formattedJson = await collect(chunked(Buffer.from(jsonDocument), chunkSize).pipe(new JsonFormatStream()));
+                expect(formattedJson).to.be.equal(expectedJson);
+            }
+        }
+    });
+    it('should keep keys in the order of the text', async () => {
+        const jsonDocument = '{"b": 1, "2": 2, "a": 3, "1": 4, "a": 5}';
+        const formattedJson = await collect(chunked(Buffer.from(jsonDocument), 3).pipe(new JsonFormatStream(2)));
+        expect(formattedJson).to.be.equal('{\n  "b": 1,\n  "2": 2,\n  "a": 3,\n  "1": 4,\n  "a": 5\n}');
+        expect(JSON.stringify(JSON.parse(jsonDocument), null, 2)).to.be.equal('{\n  "1": 4,\n  "2": 2,\n  "b": 1,\n  "a": 5\n}');
+    });
+    it('should reject invalid JSON', async () => {
+        for (const jsonDocument of INVALID_JSON_DOCUMENTS) {
+            expect(() => JSON.parse(jsonDocument)).to.throw(SyntaxError);
+            await expect(collect(chunked(Buffer.from(jsonDocument), 3).pipe(new JsonFormatStream()))).to.be.rejectedWith(SyntaxError);
+        }
+    });
+    it('should decode and encode base64 like Buffer for any chunk size', async () => {
+        const content = Buffer.from(JSON_DOCUMENTS.join('\n'));
+        const base64Content = content.toString('base64');
+        const wrappedBase64Content = base64Content.replace(/(.{60})/g, '$1\n');
+        for (const chunkSize of CHUNK_SIZES) {
+            expect(await collect(chunked(wrappedBase64Content, chunkSize).pipe(new Base64DecodeStream()))).to.be.equal(content.toString());
+            expect(await collect(chunked(content, chunkSize).pipe(new Base64EncodeStream()))).to.be.equal(base64Content);
+        }
+    });
+    it('should stream the same vspec.json as formatting the decoded payload', async () => {
+        const vspecPayload = Buffer.from(JSON_DOCUMENTS[0]).toString('base64');
+        const expectedVspecJson = `${JSON.stringify(JSON.parse(JSON_DOCUMENTS[0]), null, 4)}\n`;
+        expect(await collect(createVspecJsonStream(vspecPayload, 5))).to.be.equal(expectedVspecJson);
+        await expect(collect(createVspecJsonStream(Buffer.from('{"a":').toString('base64'), 5))).to.be.rejectedWith(SyntaxError);
+    });
+    it('should find unknown signals like the vspec index for any chunk size', async () => {
+        const vspec = {
+            Vehicle: {
+                type: 'branch',
+                children: {
+                    Speed: { type: 'sensor' },
+                    Cabin: { type: 'branch', children: { Speed: { type: 'sensor' }, Doors: [{ children: { Open: {} } }] } },
+                },
+            },
+        };
+        const vspecPayload = Buffer.from(JSON.stringify(vspec)).toString('base64');
+        const signalPaths = [
+            'Vehicle.Cabin.Speed',
+            'Vehicle.Children',
+            'Vehicle.Speed',
+            'Vehicle.Cabin.Doors.Open',
+            'Vehicle.Cabin.Type',
+            'Vehicle',
+        ];
+        const expectedUnknownSignals = new VspecIndex(vspec).findUnknownSignals(signalPaths);
+        expect(expectedUnknownSignals).to.be.deep.equal(['Vehicle.Children', 'Vehicle.Cabin.Doors.Open', 'Vehicle.Cabin.Type']);
+        for (const chunkSize of CHUNK_SIZES) {
+            expect(await findUnknownSignalsInPayload(vspecPayload, signalPaths, chunkSize)).to.be.deep.equal(expectedUnknownSignals);
+        }
+        const invalidPayload = Buffer.from('{"Vehicle":').toString('base64');
+        await expect(findUnknownSignalsInPayload(invalidPayload, signalPaths)).to.be.rejectedWith(SyntaxError);
+    });
+});
@@ -17,12 +17,14 @@ export const PYTHON = {
     IMPORT: 'import',
     IMPORT_DEPENDENCY_FROM: 'from',
     COMMENT: '#',
+    MULTILINE_STRING: '"""',
     SYNC_METHOD_START: 'def ',
     ASYNC_METHOD_START: 'async def ',
     AWAIT: 'await',
 };
 export const VELOCITAS = {
     MAIN_METHOD: 'async def main():',
+    SAMPLE_APP_CLASS: 'class SampleApp(VehicleApp):',
     ON_START: 'async def on_start(self):',
     VEHICLE_APP_SUFFIX: 'App',
     CLASS_METHOD_SIGNATURE: '(self, data: DataPointReply)',
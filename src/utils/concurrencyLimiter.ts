@@ -0,0 +1,65 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+/**
+ * Limits the number of tasks running at the same time, waiting tasks are started in FIFO order.
+ */
+export class ConcurrencyLimiter {
+    private activeCount = 0;
+    private waitingTasks: (() => void)[] = [];
+
+    /**
+     * @param {number} maxConcurrent Maximum number of tasks running at the same time.
+     */
+    constructor(readonly maxConcurrent: number) {}
+
+    get active(): number {
+        return this.activeCount;
+    }
+
+    get pending(): number {
+        return this.waitingTasks.length;
+    }
+
+    /**
+     * @param {() => Promise<T>} task Started as soon as a slot is free.
+     * @return {Promise<T>} Result of the task.
+     */
+    public async run<T>(task: () => Promise<T>): Promise<T> {
+        await this.acquire();
+        try {
+            return await task();
+        } finally {
+            this.release();
+        }
+    }
+
+    public acquire(): Promise<void> {
+        if (this.activeCount < this.maxConcurrent) {
+            this.activeCount++;
+            return Promise.resolve();
+        }
+        return new Promise((resolve) => this.waitingTasks.push(resolve));
+    }
+
+    public release(): void {
+        const nextTask = this.waitingTasks.shift();
+        if (nextTask) {
+            // The slot is handed over to the next task without being released
+            nextTask();
+        } else {
+            this.activeCount--;
+        }
+    }
+}
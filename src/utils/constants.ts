@@ -28,8 +28,46 @@ export const GIT_DATA_MODES = {
 
 export const DEFAULT_REPOSITORY_DESCRIPTION = 'Template generated from eclipse-velocitas';
 export const DEFAULT_COMMIT_MESSAGE = 'Update content with digital.auto code';
-export const MS_TO_WAIT_FOR_GITHUB = 4000;
+export const INITIAL_COMMIT_MESSAGE = 'Initial commit';
+export const LOCAL_COMMIT_AUTHOR = { name: 'Velocitas Project Generator', email: 'velocitas-project-generator@localhost' };
+export const READINESS_POLLING = {
+    initialDelayMs: 250,
+    maxDelayMs: 4000,
+    backoffFactor: 2,
+    jitter: 0.5,
+    timeoutMs: 60000,
+};
 
 export const LOCAL_VSPEC_PATH = 'app/vspec.json';
 export const APP_MANIFEST_PATH = 'app/AppManifest.json';
 export const MAIN_PY_PATH = 'app/src/main.py';
+
+export const GENERATION_STAGES = {
+    started: 'started',
+    repositoryCreated: 'repositoryCreated',
+    filesCreated: 'filesCreated',
+    treeCreated: 'treeCreated',
+    commitCreated: 'commitCreated',
+    completed: 'completed',
+} as const;
+
+export const TEMPLATE_REF = 'main';
+export const TEMPLATE_CACHE_TTL_MS = 10 * 60 * 1000;
+export const MAX_CONCURRENT_REQUESTS = 4;
+export const RATE_LIMIT = {
+    maxRetries: 3,
+    defaultWaitMs: 60000,
+};
+export const TRANSIENT_RETRY = {
+    maxRetries: 2,
+    initialDelayMs: 500,
+    backoffFactor: 2,
+};
+export const MAX_CONCURRENT_JOBS = 4;
+export const MAX_SOCKETS = 16;
+export const VSPEC_STREAMING_THRESHOLD = 8 * 1024 * 1024;
+export const VSPEC_CHUNK_SIZE = 64 * 1024;
+// Part of every conversion cache key, has to be increased whenever the conversion output changes
+export const CONVERTER_VERSION = 2;
+export const CONVERSION_CACHE = { maxEntries: 500, maxBytes: 64 * 1024 * 1024 };
+export const PIPELINE_STEP_RESULTS = { maxEntries: 1000, maxBytes: 32 * 1024 * 1024 };
@@ -0,0 +1,42 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { createHash } from 'crypto';
+import * as stream from 'stream';
+
+/**
+ * Computes the SHA-1 git uses for a blob with the given content, so files can be compared with a git tree without downloading them.
+ * @param {string | Buffer} content Content of the file, strings are encoded as UTF-8.
+ * @return {string} Hex encoded object SHA.
+ */
+export const computeGitBlobSha = (content: string | Buffer): string =>
+    createHash('sha1').update(`blob ${Buffer.byteLength(content)}\0`).update(content).digest('hex');
+
+/**
+ * Computes the git blob SHA of streamed content without holding it in memory.
+ * The object header contains the size of the content, so the content is streamed twice.
+ * @param {() => Readable} createContentStream Creates the content, called once per pass.
+ * @return {Promise<string>} Hex encoded object SHA.
+ */
+export const computeGitBlobShaFromStream = async (createContentStream: () => stream.Readable): Promise<string> => {
+    let contentLength = 0;
+    for await (const chunk of createContentStream()) {
+        contentLength += Buffer.byteLength(chunk);
+    }
+    const hash = createHash('sha1').update(`blob ${contentLength}\0`);
+    for await (const chunk of createContentStream()) {
+        hash.update(chunk);
+    }
+    return hash.digest('hex');
+};
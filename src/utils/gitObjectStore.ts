@@ -0,0 +1,258 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { createHash } from 'crypto';
+import { existsSync, mkdirSync, readFileSync, renameSync, writeFileSync } from 'fs';
+import * as path from 'path';
+import { deflateSync, inflateSync } from 'zlib';
+import { GIT_DATA_MODES, GIT_DATA_TYPES } from './constants';
+
+// Tree objects store the mode of subdirectories without the leading zero the GitHub API uses
+const TREE_MODE = '40000';
+const SHA_BYTES = 20;
+
+/**
+ * @type GitTreeEntry
+ * @prop {string} mode File mode as stored in tree objects, e.g. `100644`.
+ * @prop {string} name Name of the file or subdirectory.
+ * @prop {string} sha SHA of the blob or tree.
+ */
+export interface GitTreeEntry {
+    mode: string;
+    name: string;
+    sha: string;
+}
+
+/**
+ * @type GitTreeFile
+ * @prop {string} sha SHA of the blob.
+ * @prop {string} mode File mode, `100644` if not given.
+ */
+export interface GitTreeFile {
+    sha: string;
+    mode?: string;
+}
+
+/**
+ * @type GitSignature
+ * @prop {string} name
+ * @prop {string} email
+ */
+export interface GitSignature {
+    name: string;
+    email: string;
+}
+
+/**
+ * Reads and writes loose objects and refs of a bare git repository, so commits can be created without git being installed.
+ *
+ * Objects packed by `git gc` or a push are not read, repositories created by the store only contain loose objects.
+ */
+export class GitObjectStore {
+    /**
+     * @param {string} gitDirectory Directory of the bare repository.
+     */
+    constructor(readonly gitDirectory: string) {}
+
+    /**
+     * Creates the directories and files of an empty bare repository whose HEAD is the main branch.
+     */
+    public init(): void {
+        mkdirSync(path.join(this.gitDirectory, 'objects'), { recursive: true });
+        mkdirSync(path.join(this.gitDirectory, 'refs', 'heads'), { recursive: true });
+        mkdirSync(path.join(this.gitDirectory, 'refs', 'tags'), { recursive: true });
+        this.writeFileIfMissing('HEAD', 'ref: refs/heads/main\n');
+        this.writeFileIfMissing('config', '[core]\n\trepositoryformatversion = 0\n\tfilemode = true\n\tbare = true\n');
+    }
+
+    /**
+     * @param {string} type `blob`, `tree` or `commit`.
+     * @param {Buffer} content
+     * @return {string} SHA of the object, existing objects are not written again.
+     */
+    public writeObject(type: string, content: Buffer): string {
+        const gitObject = Buffer.concat([Buffer.from(`${type} ${content.length}\0`), content]);
+        const sha = createHash('sha1').update(gitObject).digest('hex');
+        const objectPath = this.objectPath(sha);
+        if (!existsSync(objectPath)) {
+            mkdirSync(path.dirname(objectPath), { recursive: true });
+            this.writeFileAtomically(objectPath, deflateSync(gitObject));
+        }
+        return sha;
+    }
+
+    /**
+     * @param {string} sha
+     * @return {{ type: string, content: Buffer }}
+     */
+    public readObject(sha: string): { type: string; content: Buffer } {
+        const gitObject = inflateSync(readFileSync(this.objectPath(sha)));
+        const headerEnd = gitObject.indexOf(0);
+        const type = gitObject.toString('utf8', 0, headerEnd).split(' ')[0];
+        return { type: type, content: gitObject.subarray(headerEnd + 1) };
+    }
+
+    /**
+     * @param {GitTreeEntry[]} entries
+     * @return {string} SHA of the tree.
+     */
+    public writeTree(entries: GitTreeEntry[]): string {
+        // Git sorts the entries bytewise by name, subdirectories as if their name ended with a slash
+        const sortKey = (entry: GitTreeEntry) => Buffer.from(entry.mode === TREE_MODE ? `${entry.name}/` : entry.name);
+        const sortedEntries = entries.slice().sort((first, second) => Buffer.compare(sortKey(first), sortKey(second)));
+        const chunks: Buffer[] = [];
+        sortedEntries.forEach((entry: GitTreeEntry) => {
+            chunks.push(Buffer.from(`${entry.mode} ${entry.name}\0`), Buffer.from(entry.sha, 'hex'));
+        });
+        return this.writeObject(GIT_DATA_TYPES.tree, Buffer.concat(chunks));
+    }
+
+    /**
+     * @param {string} sha
+     * @return {GitTreeEntry[]}
+     */
+    public readTree(sha: string): GitTreeEntry[] {
+        const content = this.readObject(sha).content;
+        const entries: GitTreeEntry[] = [];
+        let offset = 0;
+        while (offset < content.length) {
+            const modeEnd = content.indexOf(0x20, offset);
+            const nameEnd = content.indexOf(0, modeEnd);
+            entries.push({
+                mode: content.toString('utf8', offset, modeEnd),
+                name: content.toString('utf8', modeEnd + 1, nameEnd),
+                sha: content.toString('hex', nameEnd + 1, nameEnd + 1 + SHA_BYTES),
+            });
+            offset = nameEnd + 1 + SHA_BYTES;
+        }
+        return entries;
+    }
+
+    /**
+     * Writes the files into a copy of a tree, subtrees are created and copied as needed.
+     * @param {string | undefined} baseTreeSha Tree whose other entries are kept, an empty tree if undefined.
+     * @param {Object} files Files by their path relative to the tree.
+     * @return {string} SHA of the new tree.
+     */
+    public writeFiles(baseTreeSha: string | undefined, files: { [filePath: string]: GitTreeFile }): string {
+        const entries = new Map<string, GitTreeEntry>();
+        (baseTreeSha ? this.readTree(baseTreeSha) : []).forEach((entry: GitTreeEntry) => entries.set(entry.name, entry));
+        const filesBySubdirectory = new Map<string, { [filePath: string]: GitTreeFile }>();
+        Object.keys(files).forEach((filePath: string) => {
+            const separatorIndex = filePath.indexOf('/');
+            if (separatorIndex < 0) {
+                entries.set(filePath, { mode: files[filePath].mode ?? GIT_DATA_MODES.fileBlob, name: filePath, sha: files[filePath].sha });
+                return;
+            }
+            const subdirectory = filePath.slice(0, separatorIndex);
+            const subdirectoryFiles = filesBySubdirectory.get(subdirectory) ?? {};
+            subdirectoryFiles[filePath.slice(separatorIndex + 1)] = files[filePath];
+            filesBySubdirectory.set(subdirectory, subdirectoryFiles);
+        });
+        filesBySubdirectory.forEach((subdirectoryFiles, subdirectory: string) => {
+            const entry = entries.get(subdirectory);
+            const subtreeSha = this.writeFiles(entry?.mode === TREE_MODE ? entry.sha : undefined, subdirectoryFiles);
+            entries.set(subdirectory, { mode: TREE_MODE, name: subdirectory, sha: subtreeSha });
+        });
+        return this.writeTree(Array.from(entries.values()));
+    }
+
+    /**
+     * @param {string} treeSha
+     * @return {Object} Blob SHAs of all files of the tree and its subtrees by their path.
+     */
+    public listFiles(treeSha: string, directory: string = ''): { [filePath: string]: string } {
+        return this.readTree(treeSha).reduce((fileShas: { [filePath: string]: string }, entry: GitTreeEntry) => {
+            const filePath = `${directory}${entry.name}`;
+            if (entry.mode === TREE_MODE) {
+                Object.assign(fileShas, this.listFiles(entry.sha, `${filePath}/`));
+            } else if (entry.mode !== GIT_DATA_MODES.submoduleCommit) {
+                fileShas[filePath] = entry.sha;
+            }
+            return fileShas;
+        }, {});
+    }
+
+    /**
+     * @param {string} treeSha
+     * @param {string[]} parentShas
+     * @param {string} message
+     * @param {GitSignature} signature Used as author and committer.
+     * @param {Date} date
+     * @return {string} SHA of the commit.
+     */
+    public writeCommit(treeSha: string, parentShas: string[], message: string, signature: GitSignature, date: Date = new Date()): string {
+        const signatureLine = `${signature.name} <${signature.email}> ${Math.floor(date.getTime() / 1000)} +0000`;
+        const lines = [`tree ${treeSha}`, ...parentShas.map((parentSha: string) => `parent ${parentSha}`)];
+        lines.push(`author ${signatureLine}`, `committer ${signatureLine}`, '', message);
+        return this.writeObject(GIT_DATA_TYPES.commit, Buffer.from(`${lines.join('\n')}\n`));
+    }
+
+    /**
+     * @param {string} commitSha
+     * @return {{ treeSha: string, parentShas: string[] }} Tree and parents of the commit.
+     */
+    public readCommit(commitSha: string): { treeSha: string; parentShas: string[] } {
+        const headerLines = this.readObject(commitSha).content.toString('utf8').split('\n\n')[0].split('\n');
+        const valuesOf = (key: string) =>
+            headerLines.filter((line: string) => line.startsWith(`${key} `)).map((line: string) => line.slice(key.length + 1));
+        return { treeSha: valuesOf('tree')[0], parentShas: valuesOf('parent') };
+    }
+
+    /**
+     * @param {string} refName e.g. `refs/heads/main`.
+     * @return {string | undefined} SHA the ref points to, undefined if it does not exist.
+     */
+    public readRef(refName: string): string | undefined {
+        const refPath = path.join(this.gitDirectory, refName);
+        if (existsSync(refPath)) {
+            return readFileSync(refPath, 'utf8').trim();
+        }
+        const packedRefsPath = path.join(this.gitDirectory, 'packed-refs');
+        if (!existsSync(packedRefsPath)) {
+            return undefined;
+        }
+        const packedRef = readFileSync(packedRefsPath, 'utf8')
+            .split('\n')
+            .find((line: string) => line.endsWith(` ${refName}`));
+        return packedRef?.split(' ')[0];
+    }
+
+    /**
+     * @param {string} refName e.g. `refs/heads/main`.
+     * @param {string} sha
+     */
+    public updateRef(refName: string, sha: string): void {
+        const refPath = path.join(this.gitDirectory, refName);
+        mkdirSync(path.dirname(refPath), { recursive: true });
+        this.writeFileAtomically(refPath, `${sha}\n`);
+    }
+
+    private objectPath(sha: string): string {
+        return path.join(this.gitDirectory, 'objects', sha.slice(0, 2), sha.slice(2));
+    }
+
+    private writeFileIfMissing(fileName: string, content: string): void {
+        const filePath = path.join(this.gitDirectory, fileName);
+        if (!existsSync(filePath)) {
+            writeFileSync(filePath, content);
+        }
+    }
+
+    private writeFileAtomically(filePath: string, content: string | Buffer): void {
+        const temporaryFilePath = `${filePath}.${process.pid}.tmp`;
+        writeFileSync(temporaryFilePath, content);
+        renameSync(temporaryFilePath, filePath);
+    }
+}
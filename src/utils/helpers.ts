@@ -44,6 +44,95 @@ export const createMultilineStringFromArray = (array: string[] | string[][]): st
     return multilineString.trim();
 };
 
+/**
+ * Line based counterpart of `createArrayFromMultilineString(createMultilineStringFromArray(array))`.
+ * Trims the block like `String.trim()` would, without joining and splitting it again.
+ */
+export const trimLines = (array: string[]): string[] => {
+    let start = 0;
+    let end = array.length - 1;
+    while (start <= end && array[start].trim() === '') {
+        start++;
+    }
+    while (end >= start && array[end].trim() === '') {
+        end--;
+    }
+    if (start > end) {
+        return [''];
+    }
+    const trimmedLines = array.slice(start, end + 1);
+    trimmedLines[0] = trimmedLines[0].replace(/^\s+/, '');
+    trimmedLines[trimmedLines.length - 1] = trimmedLines[trimmedLines.length - 1].replace(/\s+$/, '');
+    return trimmedLines;
+};
+
+/**
+ * Line based counterpart of `createMultilineStringFromArray` for blocks of lines.
+ * Blocks are separated by an empty line and the result is trimmed.
+ */
+export const joinLineBlocks = (blocks: string[][]): string[] => {
+    const lines: string[] = [];
+    blocks.forEach((block: string[]) => {
+        lines.push(...block, '');
+    });
+    return trimLines(lines);
+};
+
+export const indentLines = (array: string[], indentCount: number): string[] => {
+    const indent = ' '.repeat(indentCount);
+    return array.map((line: string) => (/\S/.test(line) ? `${indent}${line}` : line));
+};
+
+/**
+ * Removes every multiline string (e.g. docstrings) including the whitespaces in front of it.
+ * Behaves like replacing `REGEX.EVERYTHING_BETWEEN_MULTILINE` on the joined lines.
+ */
+export const removeMultilineStrings = (array: string[]): string[] => {
+    const lines: string[] = [];
+    let currentLine = '';
+    let openLineIndex = -1;
+    let openColumn = 0;
+    let lineBeforeOpen = '';
+    for (let lineIndex = 0; lineIndex < array.length; lineIndex++) {
+        const line = array[lineIndex];
+        let position = 0;
+        while (position <= line.length) {
+            if (openLineIndex === -1) {
+                const quoteIndex = line.indexOf(PYTHON.MULTILINE_STRING, position);
+                if (quoteIndex === -1) {
+                    currentLine += line.slice(position);
+                    break;
+                }
+                let whitespaceIndex = quoteIndex;
+                while (whitespaceIndex > position && /[^\S\r\n]/.test(line[whitespaceIndex - 1])) {
+                    whitespaceIndex--;
+                }
+                currentLine += line.slice(position, whitespaceIndex);
+                lineBeforeOpen = currentLine;
+                openLineIndex = lineIndex;
+                openColumn = whitespaceIndex;
+                position = quoteIndex + PYTHON.MULTILINE_STRING.length;
+            } else {
+                const quoteIndex = line.indexOf(PYTHON.MULTILINE_STRING, position);
+                if (quoteIndex === -1) {
+                    break;
+                }
+                openLineIndex = -1;
+                position = quoteIndex + PYTHON.MULTILINE_STRING.length;
+            }
+        }
+        if (openLineIndex === -1) {
+            lines.push(currentLine);
+            currentLine = '';
+        }
+    }
+    if (openLineIndex !== -1) {
+        // An unterminated multiline string is kept as it is
+        lines.push(`${lineBeforeOpen}${array[openLineIndex].slice(openColumn)}`, ...array.slice(openLineIndex + 1));
+    }
+    return lines;
+};
+
 export const removeEmptyLines = (array: string[]): string[] => {
     const indexesToRemove = new Set<number>();
     array.forEach((e: string, index: number) => {
@@ -0,0 +1,32 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import type { AxiosError, AxiosStatic } from 'axios';
+
+let axiosModule: Promise<AxiosStatic> | undefined;
+
+/**
+ * Loads axios on first use, so importing the package does not load the HTTP stack.
+ * @return {Promise<AxiosStatic>}
+ */
+export const loadAxios = (): Promise<AxiosStatic> => {
+    if (!axiosModule) {
+        axiosModule = import('axios').then((module) => module.default);
+    }
+    return axiosModule;
+};
+
+// Same check as `axios.isAxiosError`, without loading axios
+export const isAxiosError = (error: any): error is AxiosError =>
+    typeof error === 'object' && error !== null && error.isAxiosError === true;
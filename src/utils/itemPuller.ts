@@ -0,0 +1,39 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+export interface IndexedItem<T> {
+    index: number;
+    item: T;
+}
+
+/**
+ * Creates a function handing out the items of a sync or async iterable one after another.
+ * It can be called by concurrent runners, indexes always follow the input order.
+ * @param {Iterable<T> | AsyncIterable<T>} items
+ * @return {() => Promise<IndexedItem<T> | undefined>} Resolves undefined once all items were handed out.
+ */
+export const createItemPuller = <T>(items: Iterable<T> | AsyncIterable<T>): (() => Promise<IndexedItem<T> | undefined>) => {
+    const iterator: AsyncIterator<T> | Iterator<T> =
+        Symbol.asyncIterator in items ? (items as AsyncIterable<T>)[Symbol.asyncIterator]() : (items as Iterable<T>)[Symbol.iterator]();
+    let nextIndex = 0;
+    let pulling: Promise<unknown> = Promise.resolve();
+    return () => {
+        const pulledItem = pulling.then(async () => {
+            const next = await iterator.next();
+            return next.done ? undefined : { index: nextIndex++, item: next.value };
+        });
+        pulling = pulledItem.catch(() => undefined);
+        return pulledItem;
+    };
+};
@@ -0,0 +1,96 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { DIGITAL_AUTO, PYTHON } from './codeConstants';
+
+// Bit flags, a single line can be of several kinds (e.g. an assignment of a subscribe call)
+export const LINE_KIND = {
+    CLASS: 1,
+    METHOD: 2,
+    SUBSCRIBE_CALL: 4,
+    ASSIGNMENT: 8,
+    MQTT_CALL: 16,
+};
+
+export const classifyLine = (line: string): number => {
+    let kind = 0;
+    if (line.includes(PYTHON.CLASS)) {
+        kind |= LINE_KIND.CLASS;
+    }
+    if (line.includes(PYTHON.SYNC_METHOD_START)) {
+        kind |= LINE_KIND.METHOD;
+    }
+    if (line.includes(DIGITAL_AUTO.SUBSCRIBE_CALL)) {
+        kind |= LINE_KIND.SUBSCRIBE_CALL;
+    }
+    if (line.includes(' = ') || line.includes('= {')) {
+        kind |= LINE_KIND.ASSIGNMENT;
+    }
+    if (line.includes(DIGITAL_AUTO.NOTIFY) || line.includes(DIGITAL_AUTO.SET_TEXT)) {
+        kind |= LINE_KIND.MQTT_CALL;
+    }
+    return kind;
+};
+
+/**
+ * Index over the lines of a code snippet, built in a single pass.
+ * Holds the kind of every line and maps subscription callbacks to the line subscribing them.
+ */
+export class CodeLineIndex {
+    readonly kinds: number[];
+    readonly subscribeLineByCallback = new Map<string, number>();
+    private linesByKind = new Map<number, number[]>();
+
+    /**
+     * @param {string[]} lines Lines to index, they are not copied.
+     */
+    constructor(readonly lines: string[]) {
+        this.kinds = new Array<number>(lines.length);
+        [LINE_KIND.CLASS, LINE_KIND.METHOD, LINE_KIND.SUBSCRIBE_CALL, LINE_KIND.ASSIGNMENT, LINE_KIND.MQTT_CALL].forEach((kind: number) =>
+            this.linesByKind.set(kind, [])
+        );
+        lines.forEach((line: string, lineNumber: number) => {
+            const kind = classifyLine(line);
+            this.kinds[lineNumber] = kind;
+            this.linesByKind.forEach((lineNumbers: number[], lineKind: number) => {
+                if (kind & lineKind) {
+                    lineNumbers.push(lineNumber);
+                }
+            });
+            if (kind & LINE_KIND.SUBSCRIBE_CALL) {
+                const callbackName = line.split(DIGITAL_AUTO.SUBSCRIBE_CALL)[1].split(/[),]/)[0].trim();
+                if (!this.subscribeLineByCallback.has(callbackName)) {
+                    this.subscribeLineByCallback.set(callbackName, lineNumber);
+                }
+            }
+        });
+    }
+
+    public isKind(lineNumber: number, kind: number): boolean {
+        return (this.kinds[lineNumber] & kind) !== 0;
+    }
+
+    /**
+     * @param {number} kind One of `LINE_KIND`.
+     * @return {number[]} Ascending line numbers of the given kind.
+     */
+    public linesOfKind(kind: number): number[] {
+        return this.linesByKind.get(kind) ?? [];
+    }
+
+    public subscribeLineOf(callbackName: string): string | undefined {
+        const lineNumber = this.subscribeLineByCallback.get(callbackName);
+        return lineNumber === undefined ? undefined : this.lines[lineNumber];
+    }
+}
@@ -0,0 +1,68 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+/**
+ * Least recently used cache bounded by the number of entries and optionally by the size of its values.
+ * Relies on the insertion order of `Map`, the first entry is always the least recently used one.
+ */
+export class LruCache<K, V> {
+    private entries = new Map<K, V>();
+    private totalBytes = 0;
+
+    /**
+     * @param {number} maxEntries Maximum number of entries kept in the cache.
+     * @param {number} maxBytes Maximum sum of the sizes of all values, values larger than this are not kept.
+     * @param {(value: V) => number} sizeOf Estimates the size of a value in bytes.
+     */
+    constructor(private maxEntries: number, private maxBytes: number = Infinity, private sizeOf: (value: V) => number = () => 0) {}
+
+    get size(): number {
+        return this.entries.size;
+    }
+
+    get bytes(): number {
+        return this.totalBytes;
+    }
+
+    public get(key: K): V | undefined {
+        const value = this.entries.get(key);
+        if (value !== undefined) {
+            this.entries.delete(key);
+            this.entries.set(key, value);
+        }
+        return value;
+    }
+
+    public set(key: K, value: V): void {
+        this.delete(key);
+        this.entries.set(key, value);
+        this.totalBytes += this.sizeOf(value);
+        while (this.entries.size > this.maxEntries || this.totalBytes > this.maxBytes) {
+            this.delete(this.entries.keys().next().value as K);
+        }
+    }
+
+    public delete(key: K): void {
+        const value = this.entries.get(key);
+        if (value !== undefined) {
+            this.totalBytes -= this.sizeOf(value);
+            this.entries.delete(key);
+        }
+    }
+
+    public clear(): void {
+        this.entries.clear();
+        this.totalBytes = 0;
+    }
+}
@@ -0,0 +1,68 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { StatusCodes } from 'http-status-codes';
+import { RATE_LIMIT } from './constants';
+import { delay } from './helpers';
+
+const parseRetryAfter = (retryAfter: string): number => {
+    const seconds = Number(retryAfter);
+    // Retry-After is either a number of seconds or an HTTP date
+    return isNaN(seconds) ? Date.parse(retryAfter) : Date.now() + seconds * 1000;
+};
+
+/**
+ * Pauses requests according to the rate limit headers of GitHub responses.
+ *
+ * `Retry-After` pauses for the given time, an exhausted `X-RateLimit-Remaining` pauses until
+ * `X-RateLimit-Reset`. Share one scheduler between all clients using the same token.
+ */
+export class RateLimitScheduler {
+    private resumeAt = 0;
+
+    /**
+     * @return {number} Time in milliseconds since epoch before which no request should be sent.
+     */
+    get pausedUntil(): number {
+        return this.resumeAt;
+    }
+
+    public async waitForCapacity(): Promise<void> {
+        const waitMs = this.resumeAt - Date.now();
+        if (waitMs > 0) {
+            await delay(waitMs);
+        }
+    }
+
+    /**
+     * Updates the pause from the headers of a response.
+     * @param {number | undefined} status Response status.
+     * @param {Record<string, any>} headers Response headers with lower case names.
+     * @return {boolean} If the request was rejected because of a rate limit and can be retried.
+     */
+    public update(status: number | undefined, headers: Record<string, any> = {}): boolean {
+        let resumeAt: number | undefined;
+        if (headers['retry-after'] !== undefined) {
+            resumeAt = parseRetryAfter(String(headers['retry-after']));
+        } else if (String(headers['x-ratelimit-remaining']) === '0' && headers['x-ratelimit-reset'] !== undefined) {
+            resumeAt = Number(headers['x-ratelimit-reset']) * 1000;
+        } else if (status === StatusCodes.TOO_MANY_REQUESTS) {
+            resumeAt = Date.now() + RATE_LIMIT.defaultWaitMs;
+        }
+        if (resumeAt !== undefined && !isNaN(resumeAt)) {
+            this.resumeAt = Math.max(this.resumeAt, resumeAt);
+        }
+        return status === StatusCodes.TOO_MANY_REQUESTS || (status === StatusCodes.FORBIDDEN && resumeAt !== undefined);
+    }
+}
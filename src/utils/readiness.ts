@@ -0,0 +1,113 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import type { AxiosInstance } from 'axios';
+import { StatusCodes } from 'http-status-codes';
+import { READINESS_POLLING } from './constants';
+import { delay } from './helpers';
+import { Instrumentation, NOOP_INSTRUMENTATION } from '../instrumentation';
+import { isAxiosError } from './httpClient';
+
+/**
+ * @type ReadinessOptions
+ * @prop {number} initialDelayMs Delay before the second attempt.
+ * @prop {number} maxDelayMs Upper bound for the delay between two attempts.
+ * @prop {number} backoffFactor Factor the delay grows with after every attempt.
+ * @prop {number} jitter Fraction of the delay which is randomly subtracted, between 0 and 1.
+ * @prop {number} timeoutMs Deadline for the resource to become ready.
+ * @prop {(message: string) => void} log Receives one line per attempt, nothing is logged by default.
+ * Observers receive the attempts as `readinessBackoff` waits and with the `readiness` wait.
+ */
+export interface ReadinessOptions {
+    initialDelayMs: number;
+    maxDelayMs: number;
+    backoffFactor: number;
+    jitter: number;
+    timeoutMs: number;
+    log: (message: string) => void;
+}
+
+/**
+ * @type ReadinessAttempt
+ * @prop {number} attempt Number of the attempt, starting at 1.
+ * @prop {number | undefined} status Response status, undefined if no response was received.
+ * @prop {number} durationMs Duration of the request.
+ */
+export interface ReadinessAttempt {
+    attempt: number;
+    status: number | undefined;
+    durationMs: number;
+}
+
+export const DEFAULT_READINESS_OPTIONS: ReadinessOptions = { ...READINESS_POLLING, log: () => {} };
+
+// GitHub answers with these while a freshly generated repository is still being populated
+const NOT_READY_STATUS_CODES = [StatusCodes.NOT_FOUND, StatusCodes.CONFLICT, StatusCodes.UNPROCESSABLE_ENTITY];
+
+const isNotReady = (status: number | undefined): boolean =>
+    status === undefined || NOT_READY_STATUS_CODES.includes(status) || status >= StatusCodes.INTERNAL_SERVER_ERROR;
+
+/**
+ * Delay before the given attempt, growing exponentially and reduced by a random jitter.
+ * @param {number} attempt Number of the attempt which failed.
+ * @param {ReadinessOptions} options
+ * @return {number} Delay in milliseconds.
+ */
+export const backoffDelay = (attempt: number, options: ReadinessOptions): number => {
+    const exponentialDelay = Math.min(options.maxDelayMs, options.initialDelayMs * Math.pow(options.backoffFactor, attempt - 1));
+    return Math.round(exponentialDelay * (1 - options.jitter * Math.random()));
+};
+
+/**
+ * Polls a resource with GET until it can be read, instead of waiting a fixed time for GitHub.
+ * @param {AxiosInstance} client Client the resource path is relative to.
+ * @param {string} resourcePath
+ * @param {Partial<ReadinessOptions>} readinessOptions
+ * @param {Instrumentation} instrumentation Measures the delays between the attempts, with the status of the failed attempt.
+ * @return {Promise<ReadinessAttempt[]>} All attempts, the last one succeeded.
+ * @throws {AxiosError} If the resource answers with an unexpected error or is not ready before the deadline.
+ */
+export const waitForResource = async (
+    client: AxiosInstance,
+    resourcePath: string,
+    readinessOptions: Partial<ReadinessOptions> = {},
+    instrumentation: Instrumentation = NOOP_INSTRUMENTATION
+): Promise<ReadinessAttempt[]> => {
+    const options: ReadinessOptions = { ...DEFAULT_READINESS_OPTIONS, ...readinessOptions };
+    const deadline = Date.now() + options.timeoutMs;
+    const attempts: ReadinessAttempt[] = [];
+    for (let attempt = 1; ; attempt++) {
+        const startTime = Date.now();
+        try {
+            const response = await client.get(resourcePath);
+            attempts.push({ attempt: attempt, status: response.status, durationMs: Date.now() - startTime });
+            options.log(`Readiness check #${attempt} for ${resourcePath} succeeded after ${Date.now() - startTime} ms.`);
+            return attempts;
+        } catch (error) {
+            if (!isAxiosError(error) || !isNotReady(error.response?.status)) {
+                throw error;
+            }
+            const durationMs = Date.now() - startTime;
+            attempts.push({ attempt: attempt, status: error.response?.status, durationMs: durationMs });
+            const waitMs = backoffDelay(attempt, options);
+            if (Date.now() + waitMs > deadline) {
+                options.log(`Readiness check #${attempt} for ${resourcePath} failed after ${durationMs} ms. Giving up.`);
+                throw error;
+            }
+            options.log(`Readiness check #${attempt} for ${resourcePath} failed after ${durationMs} ms. Retrying in ${waitMs} ms.`);
+            const attributes = { resourcePath: resourcePath, attempt: attempt, status: error.response?.status };
+            await instrumentation.measureAsync('wait', 'readinessBackoff', attributes, () => delay(waitMs));
+        }
+    }
+};
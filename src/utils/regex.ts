@@ -12,6 +12,8 @@
 //
 // SPDX-License-Identifier: Apache-2.0
 
+import { LruCache } from './lruCache';
+
 // NOTE: since safari doesn't support lookbehind regex yet. Try to avoid it.
 // https://caniuse.com/js-regexp-lookbehind
 export const REGEX = {
@@ -19,7 +21,7 @@ export const REGEX = {
     EVERYTHING_BETWEEN_MULTILINE: /([^\S\r\n]*\"\"\"[\s\S]*?\"\"\")/gm,
     GET_EVERY_PLUGINS_USAGE: /.*plugins.*/gm,
     // Replace content in on_start method (Here digital.auto code comes in)
-    FIND_BEGIN_OF_ON_START_METHOD: /[\t ]*async def on\_start\(self\)\:[\r\n]/gm,
+    FIND_BEGIN_OF_ON_START_METHOD: /[\t ]*async def on\_start\(self\)\:$/g,
     FIND_VEHICLE_INIT: /self\.Vehicle \= vehicle_client/gm,
     FIND_VEHICLE_OCCURENCE: /vehicle\./gm,
     FIND_UNWANTED_VEHICLE_CHANGE: /\(await self\.Vehicle/gm,
@@ -29,8 +31,40 @@ export const REGEX = {
     FIND_LINE_BEGINNING_WITH_WHITESPACES: /^\s+/gm,
     FIND_SAMPLE_APP: /SampleApp/gm,
     FIND_SUBSCRIBE_METHOD_CALL: /\.subscribe\(/gm,
+    FIND_DATAPOINT_ACCESS: /Vehicle.*?(\.subscribe|\.get|\.set|\))/,
 };
 
-export const quotedVariableRegex = (variableName: string) => new RegExp(`=\\s?".*\\b${variableName}\\b.*"`, 'g');
-export const underscoredVariableRegex = (variableName: string) => new RegExp(`_${variableName}|${variableName}_`, 'g');
-export const variableRegex = (variableName: string) => new RegExp(`(?<![\\.\\"])${variableName}(?![\\.\\"])`, 'g');
+export const REGEX_CACHE_SIZE = 512;
+const regexCache = new LruCache<string, RegExp>(REGEX_CACHE_SIZE);
+
+/**
+ * Returns a compiled `RegExp` shared by all conversions.
+ * Only use it with `String.replace` or non global patterns, a global `RegExp` keeps its `lastIndex` between calls.
+ */
+const cachedRegex = (pattern: string, flags: string): RegExp => {
+    const cacheKey = `${flags}/${pattern}`;
+    let regex = regexCache.get(cacheKey);
+    if (!regex) {
+        regex = new RegExp(pattern, flags);
+        regexCache.set(cacheKey, regex);
+    }
+    return regex;
+};
+
+export const escapeRegex = (string: string) => string.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+const variableAlternation = (variableNames: string[]) =>
+    [...variableNames]
+        .sort((a: string, b: string) => b.length - a.length)
+        .map(escapeRegex)
+        .join('|');
+
+export const quotedVariableRegex = (variableName: string) => cachedRegex(`=\\s?".*\\b${escapeRegex(variableName)}\\b.*"`, '');
+export const underscoredVariableRegex = (variableName: string) =>
+    cachedRegex(`_${escapeRegex(variableName)}|${escapeRegex(variableName)}_`, '');
+export const variableRegex = (variableName: string) => cachedRegex(`(?<![\\.\\"])${escapeRegex(variableName)}(?![\\.\\"])`, 'g');
+export const unquotedVariableRegex = (variableName: string) => cachedRegex(`(?<!")${escapeRegex(variableName)}(?!")`, 'g');
+// Matches any of the given variables like `variableRegex` does, longer names take precedence
+export const variablesRegex = (variableNames: string[]) =>
+    cachedRegex(`(?<![\\.\\"])(?:${variableAlternation(variableNames)})(?![\\.\\"])`, 'g');
+// Tests whether a line contains any of the given variables at all
+export const anyVariableRegex = (variableNames: string[]) => cachedRegex(variableAlternation(variableNames), '');
@@ -0,0 +1,241 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import { PYTHON, VELOCITAS } from './codeConstants';
+import { REGEX, escapeRegex } from './regex';
+
+/**
+ * Rewrite of a code construct, e.g. of a digital.auto call to its Velocitas counterpart.
+ * @type RewriteRule
+ * @prop {string} name Unique within a rule set, used to register other rules before it.
+ * @prop {RegExp} pattern Its flags are ignored and numbered backreferences are not supported,
+ * as all patterns of a rule set are combined into one.
+ * @prop {string | ((match: string, ...args: any[]) => string)} replacement Inserted literally, or computed from the match,
+ * the capture groups of the pattern and the context passed to `apply` or `applyToLines`, which follows the groups.
+ * @prop {boolean} once Only the first match within `applyToLines` is rewritten.
+ */
+export interface RewriteRule {
+    name: string;
+    pattern: RegExp;
+    replacement: string | ((match: string, ...args: any[]) => string);
+    once?: boolean;
+}
+
+interface CompiledRules {
+    regex: RegExp;
+    // Index of the capture group enclosing the pattern of each rule
+    groupIndexes: number[];
+    groupCounts: number[];
+}
+
+const countCaptureGroups = (pattern: RegExp): number => new RegExp(`${pattern.source}|`).exec('')!.length - 1;
+
+/**
+ * Ordered rules which are compiled once into a single pattern and applied in one scan of the text.
+ * Like `String.replace` with an alternation, the leftmost match wins, at the same position the rule registered first wins
+ * and replaced text is not scanned again. Rules depending on the output of other rules have to match their input instead.
+ */
+export class RewriteRuleSet<C = undefined> {
+    private ruleList: RewriteRule[] = [];
+    private compiledRules: CompiledRules | undefined;
+
+    /**
+     * @param {RewriteRule[]} rules In order of precedence.
+     */
+    constructor(rules: RewriteRule[] = []) {
+        rules.forEach((rule: RewriteRule) => this.register(rule));
+    }
+
+    get rules(): RewriteRule[] {
+        return [...this.ruleList];
+    }
+
+    /**
+     * Identifies the rules, e.g. as part of a cache key.
+     * @return {string | undefined} Undefined if a replacement is a function, as the state captured by a function
+     * is not part of its source and results of these rules must not be cached.
+     */
+    get signature(): string | undefined {
+        if (this.ruleList.some((rule: RewriteRule) => typeof rule.replacement !== 'string')) {
+            return undefined;
+        }
+        return this.ruleList.map((rule: RewriteRule) => `${rule.name}/${rule.pattern.source}/${rule.replacement}`).join('\n');
+    }
+
+    /**
+     * @param {RewriteRule} rule
+     * @param {string} before Name of the rule which the new rule takes precedence over, appended if omitted.
+     * @return {RewriteRuleSet} This rule set.
+     * @throws {Error} If the name is already registered or `before` is unknown.
+     */
+    public register(rule: RewriteRule, before?: string): RewriteRuleSet<C> {
+        if (this.ruleList.some((registeredRule: RewriteRule) => registeredRule.name === rule.name)) {
+            throw new Error(`Rewrite rule ${rule.name} is already registered.`);
+        }
+        const index = before === undefined ? this.ruleList.length : this.ruleList.findIndex((registered) => registered.name === before);
+        if (index === -1) {
+            throw new Error(`Rewrite rule ${before} is not registered.`);
+        }
+        this.ruleList.splice(index, 0, rule);
+        this.compiledRules = undefined;
+        return this;
+    }
+
+    /**
+     * @param {string} text
+     * @param {C} context Passed to function replacements.
+     * @return {string} Text with every match rewritten.
+     */
+    public apply(text: string, context?: C): string {
+        return this.rewrite(text, new Set<string>(), context);
+    }
+
+    /**
+     * Applies the rules line by line. Replacements containing line breaks are split into separate lines.
+     * @param {string[]} lines
+     * @param {C} context Passed to function replacements.
+     * @return {string[]} New array of lines.
+     */
+    public applyToLines(lines: string[], context?: C): string[] {
+        const rewrittenRules = new Set<string>();
+        const rewrittenLines: string[] = [];
+        lines.forEach((line: string) => {
+            const rewrittenLine = this.rewrite(line, rewrittenRules, context);
+            if (rewrittenLine === line) {
+                rewrittenLines.push(line);
+            } else {
+                rewrittenLines.push(...rewrittenLine.split('\n'));
+            }
+        });
+        return rewrittenLines;
+    }
+
+    private rewrite(text: string, rewrittenRules: Set<string>, context: C | undefined): string {
+        if (this.ruleList.length === 0) {
+            return text;
+        }
+        const { regex, groupIndexes, groupCounts } = this.compile();
+        return text.replace(regex, (match: string, ...args: any[]) => {
+            // The group of the matching rule is the only one of the enclosing groups which participated in the match
+            const ruleIndex = groupIndexes.findIndex((groupIndex: number) => args[groupIndex - 1] !== undefined);
+            const rule = this.ruleList[ruleIndex];
+            if (rule.once) {
+                if (rewrittenRules.has(rule.name)) {
+                    return match;
+                }
+                rewrittenRules.add(rule.name);
+            }
+            if (typeof rule.replacement === 'string') {
+                return rule.replacement;
+            }
+            const groups = args.slice(groupIndexes[ruleIndex], groupIndexes[ruleIndex] + groupCounts[ruleIndex]);
+            return rule.replacement(match, ...groups, context);
+        });
+    }
+
+    private compile(): CompiledRules {
+        if (!this.compiledRules) {
+            const groupIndexes: number[] = [];
+            const groupCounts: number[] = [];
+            let groupIndex = 1;
+            this.ruleList.forEach((rule: RewriteRule) => {
+                groupIndexes.push(groupIndex);
+                groupCounts.push(countCaptureGroups(rule.pattern));
+                groupIndex += groupCounts[groupCounts.length - 1] + 1;
+            });
+            const source = this.ruleList.map((rule: RewriteRule) => `(${rule.pattern.source})`).join('|');
+            this.compiledRules = { regex: new RegExp(source, 'g'), groupIndexes: groupIndexes, groupCounts: groupCounts };
+        }
+        return this.compiledRules;
+    }
+}
+
+// Rewrites digital.auto code blocks to the Velocitas structure
+export const VELOCITAS_STRUCTURE_RULES = new RewriteRuleSet([
+    // `vehicle.` within parentheses is rewritten without the `await`
+    { name: 'vehicleCallAsArgument', pattern: /\(vehicle\./, replacement: `${VELOCITAS.VEHICLE_CALL_AS_ARGUMENT}.` },
+    { name: 'vehicleCall', pattern: REGEX.FIND_VEHICLE_OCCURENCE, replacement: VELOCITAS.VEHICLE_CALL },
+    { name: 'unwantedVehicleChange', pattern: REGEX.FIND_UNWANTED_VEHICLE_CHANGE, replacement: VELOCITAS.VEHICLE_CALL_AS_ARGUMENT },
+    { name: 'printfStatement', pattern: REGEX.FIND_PRINTF_STATEMENTS, replacement: VELOCITAS.INFO_LOGGER_SIGNATURE },
+    // The parenthesis is not consumed, so a `vehicle.` argument is still rewritten by `vehicleCallAsArgument`
+    { name: 'printStatement', pattern: /print(?=\()/, replacement: 'logger.info' },
+]);
+
+// Rewrites lines of the assembled main.py
+export const FINALIZE_RULES = new RewriteRuleSet([
+    // Matches the whole line at its start, so it has to take precedence over all other rules
+    { name: 'pluginsUsage', pattern: REGEX.GET_EVERY_PLUGINS_USAGE, replacement: '' },
+    { name: 'subscribeMethodCall', pattern: REGEX.FIND_SUBSCRIBE_METHOD_CALL, replacement: VELOCITAS.SUBSCRIPTION_SIGNATURE },
+    { name: 'asyncio', pattern: /await (?:await )?aio/, replacement: VELOCITAS.ASYNCIO },
+    { name: 'doubleAwait', pattern: /await await/, replacement: PYTHON.AWAIT },
+    { name: 'getValue', pattern: /\.get\(\)/, replacement: VELOCITAS.GET_VALUE },
+]);
+
+/**
+ * Per conversion values inserted into the template main.py by `MAIN_PY_RULES`.
+ * @type MainPyRewriteContext
+ * @prop {string[]} codeSnippet Converted code snippet of the `on_start` method.
+ * @prop {string[]} memberVariables Assignments of the member variables in `__init__`.
+ * @prop {string} appClassName Class name of the VehicleApp.
+ */
+export interface MainPyRewriteContext {
+    codeSnippet: string[];
+    memberVariables: string[];
+    appClassName: string;
+}
+
+// Inserts the converted code snippet into the template main.py, the inserted code blocks are already rewritten
+// and not scanned again
+export const MAIN_PY_RULES = new RewriteRuleSet<MainPyRewriteContext>([
+    {
+        name: 'onStart',
+        pattern: REGEX.FIND_BEGIN_OF_ON_START_METHOD,
+        replacement: (_match: string, context: MainPyRewriteContext) => context.codeSnippet.join('\n'),
+    },
+    {
+        name: 'vehicleInit',
+        pattern: REGEX.FIND_VEHICLE_INIT,
+        replacement: (_match: string, context: MainPyRewriteContext) =>
+            ['self.Vehicle = vehicle_client', ...context.memberVariables].join('\n'),
+    },
+    { name: 'subscribeTopicImport', pattern: new RegExp(escapeRegex(VELOCITAS.IMPORT_SUBSCRIBE_TOPIC)), replacement: '', once: true },
+    {
+        name: 'sampleApp',
+        pattern: REGEX.FIND_SAMPLE_APP,
+        replacement: (_match: string, context: MainPyRewriteContext) => context.appClassName,
+    },
+]);
+
+// Rewrites whole lines of the finalized main.py, at most one of these rules applies to a line
+export const FINALIZE_LINE_RULES = new RewriteRuleSet([
+    {
+        name: 'enumArgument',
+        pattern: /^(?=[\s\S]*\.set\()[^(]*\(self\.Vehicle[\s\S]*$/,
+        replacement: (codeLine: string) => {
+            const vehicleClassEnumProperty = codeLine.split('(')[1].split(')')[0];
+            const identifiedEnumString = vehicleClassEnumProperty.split('.').at(-1);
+            return codeLine.replace(vehicleClassEnumProperty, `"${identifiedEnumString}"`);
+        },
+    },
+    {
+        name: 'loggerArguments',
+        pattern: /^(?=[\s\S]*logger\.info\()[\s\S]*",[\s\S]*$/,
+        replacement: (codeLine: string) => codeLine.replace('",', ': %s",'),
+    },
+    {
+        name: 'awaitedValue',
+        pattern: /^[\s\S]*\.get\(\)\)\.value[\s\S]*$/,
+        replacement: (codeLine: string) => codeLine.replace(/await/, '(await').replace(/{await/, '{(await'),
+    },
+]);
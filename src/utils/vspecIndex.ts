@@ -0,0 +1,99 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+const isObject = (value: any): boolean => typeof value === 'object' && value !== null && !Array.isArray(value);
+
+const hasChild = (children: any, name: string): boolean => isObject(children) && Object.prototype.hasOwnProperty.call(children, name);
+
+const copyWithoutChildren = (node: any): any => {
+    if (!isObject(node)) {
+        return node;
+    }
+    const { children, ...attributes } = node;
+    return { ...attributes, children: {} };
+};
+
+/**
+ * Index over the signals of a decoded VSS vspec, e.g. `{"Vehicle": {"type": "branch", "children": {...}}}`.
+ *
+ * The `children` of the branches already form a trie of the path segments, so signal paths are resolved
+ * in O(path length) by walking it instead of building a flat copy of megabytes of signals.
+ */
+export class VspecIndex {
+    /**
+     * @param {any} vspec Decoded vspec, it is not copied.
+     */
+    constructor(private readonly vspec: any) {}
+
+    /**
+     * @param {string} signalPath Dot separated path, e.g. `Vehicle.Cabin.Seat.Row1.Pos1.Position`.
+     * @return {any} Node of the signal or branch, undefined if the path does not exist.
+     */
+    public resolve(signalPath: string): any {
+        let children = this.vspec;
+        let node: any;
+        for (const segment of signalPath.split('.')) {
+            if (!hasChild(children, segment)) {
+                return undefined;
+            }
+            node = children[segment];
+            children = node?.children;
+        }
+        return node;
+    }
+
+    /**
+     * @param {string[]} signalPaths
+     * @return {string[]} Paths which do not exist in the vspec, in the given order.
+     */
+    public findUnknownSignals(signalPaths: string[]): string[] {
+        return signalPaths.filter((signalPath: string) => this.resolve(signalPath) === undefined);
+    }
+
+    /**
+     * Creates a vspec which only contains the given signals and the branches leading to them.
+     * Branches keep all their attributes, signals and branches given as path are kept completely.
+     * Top level branches are always kept, so the pruned vspec still has a `Vehicle` root. Unknown paths are ignored.
+     * @param {string[]} signalPaths
+     * @return {any} Pruned vspec, unchanged nodes are shared with the indexed vspec.
+     */
+    public prune(signalPaths: string[]): any {
+        if (!isObject(this.vspec)) {
+            return this.vspec;
+        }
+        const prunedVspec = Object.keys(this.vspec).reduce((rootNodes: any, name: string) => {
+            rootNodes[name] = copyWithoutChildren(this.vspec[name]);
+            return rootNodes;
+        }, {});
+        signalPaths.forEach((signalPath: string) => {
+            const segments = signalPath.split('.');
+            let children = this.vspec;
+            let prunedChildren = prunedVspec;
+            for (let index = 0; index < segments.length && hasChild(children, segments[index]); index++) {
+                const node = children[segments[index]];
+                if (index === segments.length - 1) {
+                    prunedChildren[segments[index]] = node;
+                } else if (prunedChildren[segments[index]] === node) {
+                    // A branch on the path is already kept completely
+                    break;
+                } else if (!hasChild(prunedChildren, segments[index])) {
+                    prunedChildren[segments[index]] = copyWithoutChildren(node);
+                }
+                children = node.children;
+                prunedChildren = prunedChildren[segments[index]].children;
+            }
+        });
+        return prunedVspec;
+    }
+}
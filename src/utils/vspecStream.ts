@@ -0,0 +1,357 @@
+// Copyright (c) 2023-2024 Contributors to the Eclipse Foundation
+//
+// This program and the accompanying materials are made available under the
+// terms of the Apache License, Version 2.0 which is available at
+// https://www.apache.org/licenses/LICENSE-2.0.
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+// WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+// License for the specific language governing permissions and limitations
+// under the License.
+//
+// SPDX-License-Identifier: Apache-2.0
+
+import * as stream from 'stream';
+import { StringDecoder } from 'string_decoder';
+import { CONTENT_ENCODINGS, VSPEC_CHUNK_SIZE } from './constants';
+
+const BASE64_CHARACTERS = /[^A-Za-z0-9+/\-_=]/g;
+const JSON_NUMBER = /^-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?$/;
+const JSON_LITERALS = ['true', 'false', 'null'];
+const JSON_WHITESPACE = ' \t\n\r';
+
+/**
+ * Decodes base64 text chunk by chunk like `Buffer.from(text, 'base64')` decodes the whole text.
+ */
+export class Base64DecodeStream extends stream.Transform {
+    private remainder = '';
+    private isPaddingReached = false;
+
+    constructor() {
+        super({ decodeStrings: false });
+    }
+
+    _transform(chunk: string | Buffer, _encoding: BufferEncoding, callback: stream.TransformCallback): void {
+        if (this.isPaddingReached) {
+            callback();
+            return;
+        }
+        let base64 = this.remainder + chunk.toString().replace(BASE64_CHARACTERS, '');
+        const paddingIndex = base64.indexOf('=');
+        if (paddingIndex >= 0) {
+            // Decoding ends at the first padding character
+            this.isPaddingReached = true;
+            base64 = base64.slice(0, paddingIndex);
+        }
+        const decodableLength = this.isPaddingReached ? base64.length : base64.length - (base64.length % 4);
+        this.remainder = base64.slice(decodableLength);
+        callback(null, Buffer.from(base64.slice(0, decodableLength), CONTENT_ENCODINGS.base64 as BufferEncoding));
+    }
+
+    _flush(callback: stream.TransformCallback): void {
+        callback(null, Buffer.from(this.remainder, CONTENT_ENCODINGS.base64 as BufferEncoding));
+    }
+}
+
+/**
+ * Encodes bytes to base64 chunk by chunk, the result equals encoding all bytes at once.
+ */
+export class Base64EncodeStream extends stream.Transform {
+    private remainder = Buffer.alloc(0);
+
+    _transform(chunk: Buffer, _encoding: BufferEncoding, callback: stream.TransformCallback): void {
+        const bytes = this.remainder.length > 0 ? Buffer.concat([this.remainder, chunk]) : chunk;
+        const encodableLength = bytes.length - (bytes.length % 3);
+        this.remainder = bytes.subarray(encodableLength);
+        callback(null, bytes.subarray(0, encodableLength).toString(CONTENT_ENCODINGS.base64 as BufferEncoding));
+    }
+
+    _flush(callback: stream.TransformCallback): void {
+        callback(null, this.remainder.toString(CONTENT_ENCODINGS.base64 as BufferEncoding));
+    }
+}
+
+enum Expect {
+    VALUE,
+    KEY,
+    COLON,
+    COMMA_OR_END,
+    END_OF_INPUT,
+}
+
+enum Token {
+    NONE,
+    STRING,
+    NUMBER,
+    LITERAL,
+}
+
+/**
+ * Validates and pretty prints JSON text chunk by chunk.
+ *
+ * The output equals `JSON.stringify(JSON.parse(text), null, indentation)`, except that keys keep their order
+ * in the text: `JSON.parse` moves integer-like keys (e.g. `"2"`) ahead of the other keys of an object and merges
+ * duplicate keys, the stream keeps both as they are. Memory is bounded by the chunk size and the longest string or number.
+ */
+export class JsonFormatStream extends stream.Transform {
+    private decoder = new StringDecoder(CONTENT_ENCODINGS.utf8 as BufferEncoding);
+    private containers: string[] = [];
+    private expect = Expect.VALUE;
+    private pendingOpening = '';
+    private token = Token.NONE;
+    private tokenText = '';
+    private isEscaped = false;
+    private isKey = false;
+    // Key of the current member of every open container, empty for arrays and before the first key
+    private keyPath: string[] = [];
+    private output: string[] = [];
+
+    /**
+     * @param {number} indentation Number of spaces per level.
+     * @param {boolean} trailingNewline Appends a newline to the formatted JSON.
+     * @param {(keyPath: string[]) => void} onKey Receives the keys of the enclosing members for every key,
+     * the array is reused for the following keys.
+     */
+    constructor(private indentation: number = 4, private trailingNewline: boolean = false, private onKey?: (keyPath: string[]) => void) {
+        super({ decodeStrings: true });
+    }
+
+    _transform(chunk: Buffer, _encoding: BufferEncoding, callback: stream.TransformCallback): void {
+        try {
+            this.format(this.decoder.write(chunk));
+            callback(null, this.flushOutput());
+        } catch (error) {
+            callback(error as Error);
+        }
+    }
+
+    _flush(callback: stream.TransformCallback): void {
+        try {
+            this.format(this.decoder.end());
+            this.endToken();
+            if (this.expect !== Expect.END_OF_INPUT || this.token === Token.STRING) {
+                throw new SyntaxError('Unexpected end of JSON input');
+            }
+            if (this.trailingNewline) {
+                this.output.push('\n');
+            }
+            callback(null, this.flushOutput());
+        } catch (error) {
+            callback(error as Error);
+        }
+    }
+
+    private flushOutput(): string {
+        const formattedText = this.output.join('');
+        this.output = [];
+        return formattedText;
+    }
+
+    private format(text: string): void {
+        let index = 0;
+        while (index < text.length) {
+            if (this.token === Token.STRING) {
+                index = this.continueString(text, index);
+                continue;
+            }
+            const character = text[index];
+            if (this.token !== Token.NONE) {
+                if (/[0-9a-zA-Z+\-.]/.test(character)) {
+                    this.tokenText += character;
+                    index++;
+                    continue;
+                }
+                this.endToken();
+            }
+            index++;
+            if (JSON_WHITESPACE.includes(character)) {
+                continue;
+            }
+            if (character === '"') {
+                this.startValue(this.expect === Expect.KEY);
+                this.token = Token.STRING;
+                this.tokenText = character;
+            } else if (character === '{' || character === '[') {
+                this.startValue(false);
+                this.pendingOpening = character;
+                this.containers.push(character);
+                this.keyPath.push('');
+                this.expect = character === '{' ? Expect.KEY : Expect.VALUE;
+            } else if (character === '}' || character === ']') {
+                this.closeContainer(character);
+            } else if (character === ':') {
+                this.expectToBe(Expect.COLON, character);
+                this.output.push(': ');
+                this.expect = Expect.VALUE;
+            } else if (character === ',') {
+                this.expectToBe(Expect.COMMA_OR_END, character);
+                this.output.push(',\n', this.indent(this.containers.length));
+                this.expect = this.containers[this.containers.length - 1] === '{' ? Expect.KEY : Expect.VALUE;
+            } else {
+                this.startValue(false);
+                this.token = /[-0-9]/.test(character) ? Token.NUMBER : Token.LITERAL;
+                this.tokenText = character;
+            }
+        }
+    }
+
+    private continueString(text: string, startIndex: number): number {
+        for (let index = startIndex; index < text.length; index++) {
+            if (this.isEscaped) {
+                this.isEscaped = false;
+            } else if (text[index] === '\\') {
+                this.isEscaped = true;
+            } else if (text[index] === '"') {
+                this.tokenText += text.slice(startIndex, index + 1);
+                this.endToken();
+                return index + 1;
+            }
+        }
+        this.tokenText += text.slice(startIndex);
+        return text.length;
+    }
+
+    private startValue(isKey: boolean): void {
+        if (!isKey) {
+            this.expectToBe(Expect.VALUE, 'value');
+        }
+        this.isKey = isKey;
+        if (this.pendingOpening) {
+            this.output.push(this.pendingOpening, '\n', this.indent(this.containers.length));
+            this.pendingOpening = '';
+        }
+    }
+
+    private endToken(): void {
+        if (this.token === Token.NONE) {
+            return;
+        }
+        let value: string;
+        if (this.token === Token.STRING) {
+            // Parsing and stringifying normalizes escapes exactly like formatting the whole document
+            value = JSON.stringify(JSON.parse(this.tokenText));
+        } else if (this.token === Token.NUMBER && JSON_NUMBER.test(this.tokenText)) {
+            value = JSON.stringify(JSON.parse(this.tokenText));
+        } else if (this.token === Token.LITERAL && JSON_LITERALS.includes(this.tokenText)) {
+            value = this.tokenText;
+        } else {
+            throw new SyntaxError(`Unexpected token ${this.tokenText} in JSON`);
+        }
+        this.output.push(value);
+        this.token = Token.NONE;
+        this.tokenText = '';
+        if (this.isKey) {
+            this.keyPath[this.keyPath.length - 1] = JSON.parse(value);
+            this.onKey?.(this.keyPath);
+            this.isKey = false;
+            this.expect = Expect.COLON;
+        } else {
+            this.endValue();
+        }
+    }
+
+    private closeContainer(closing: string): void {
+        const opening = closing === '}' ? '{' : '[';
+        const isEmpty = this.pendingOpening === opening;
+        const expected = isEmpty ? (opening === '{' ? Expect.KEY : Expect.VALUE) : Expect.COMMA_OR_END;
+        if (this.containers[this.containers.length - 1] !== opening || this.expect !== expected) {
+            throw new SyntaxError(`Unexpected token ${closing} in JSON`);
+        }
+        this.containers.pop();
+        this.keyPath.pop();
+        if (isEmpty) {
+            this.output.push(opening, closing);
+            this.pendingOpening = '';
+        } else {
+            this.output.push('\n', this.indent(this.containers.length), closing);
+        }
+        this.endValue();
+    }
+
+    private endValue(): void {
+        this.expect = this.containers.length > 0 ? Expect.COMMA_OR_END : Expect.END_OF_INPUT;
+    }
+
+    private expectToBe(expected: Expect, found: string): void {
+        if (this.expect !== expected) {
+            throw new SyntaxError(`Unexpected token ${found} in JSON`);
+        }
+    }
+
+    private indent(level: number): string {
+        return ' '.repeat(level * this.indentation);
+    }
+}
+
+function* sliceText(text: string, chunkSize: number): Generator<string> {
+    for (let index = 0; index < text.length; index += chunkSize) {
+        yield text.slice(index, index + chunkSize);
+    }
+}
+
+const pipelineOf = (...streams: (NodeJS.ReadableStream | NodeJS.ReadWriteStream)[]): stream.Readable =>
+    // Errors of any stage are forwarded to the returned stream
+    (stream.pipeline as any)(...streams, () => {}) as stream.Readable;
+
+/**
+ * Streams the pretty printed vspec.json of a base64 encoded vspec payload.
+ * @param {string} vspecPayload Base64 encoded Vspec payload.
+ * @param {number} chunkSize Number of base64 characters decoded at once.
+ * @return {Readable} Formatted JSON followed by a newline, emits a SyntaxError for invalid payloads.
+ */
+export const createVspecJsonStream = (vspecPayload: string, chunkSize: number = VSPEC_CHUNK_SIZE): stream.Readable =>
+    pipelineOf(stream.Readable.from(sliceText(vspecPayload, chunkSize)), new Base64DecodeStream(), new JsonFormatStream(4, true));
+
+/**
+ * Streams the base64 encoded, pretty printed vspec.json of a base64 encoded vspec payload.
+ * @param {string} vspecPayload Base64 encoded Vspec payload.
+ * @param {number} chunkSize Number of base64 characters decoded at once.
+ * @return {Readable}
+ */
+export const createEncodedVspecJsonStream = (vspecPayload: string, chunkSize: number = VSPEC_CHUNK_SIZE): stream.Readable =>
+    pipelineOf(createVspecJsonStream(vspecPayload, chunkSize), new Base64EncodeStream());
+
+const drain = async (readable: stream.Readable): Promise<void> => {
+    // eslint-disable-next-line @typescript-eslint/no-unused-vars
+    for await (const _chunk of readable) {
+        // Chunks are only formatted for validation
+    }
+};
+
+/**
+ * Validates a base64 encoded vspec payload without holding it decoded in memory.
+ * @param {string} vspecPayload Base64 encoded Vspec payload.
+ * @throws {SyntaxError} If the payload is no valid JSON.
+ */
+export const validateVspecPayload = (vspecPayload: string): Promise<void> => drain(createVspecJsonStream(vspecPayload));
+
+// The keys leading to a signal alternate between node names and `children`, e.g. Vehicle, children, Speed
+const signalKeyPath = (signalPath: string): string => JSON.stringify(signalPath.replace(/\./g, '.children.').split('.'));
+
+/**
+ * Validates a base64 encoded vspec payload and looks up signals in it like `VspecIndex.findUnknownSignals`,
+ * without holding it decoded in memory.
+ * @param {string} vspecPayload Base64 encoded Vspec payload.
+ * @param {string[]} signalPaths Dot separated paths, e.g. `Vehicle.Speed`.
+ * @param {number} chunkSize Number of base64 characters decoded at once.
+ * @return {Promise<string[]>} Paths which do not exist in the vspec, in the given order.
+ * @throws {SyntaxError} If the payload is no valid JSON.
+ */
+export const findUnknownSignalsInPayload = async (
+    vspecPayload: string,
+    signalPaths: string[],
+    chunkSize: number = VSPEC_CHUNK_SIZE
+): Promise<string[]> => {
+    const keyPathsOfUnknownSignals = new Set<string>(signalPaths.map(signalKeyPath));
+    const lastSegments = new Set<string>(signalPaths.map((signalPath: string) => signalPath.split('.').pop() as string));
+    const onKey = (keyPath: string[]) => {
+        if (keyPath.length % 2 === 1 && lastSegments.has(keyPath[keyPath.length - 1])) {
+            keyPathsOfUnknownSignals.delete(JSON.stringify(keyPath));
+        }
+    };
+    await drain(
+        pipelineOf(stream.Readable.from(sliceText(vspecPayload, chunkSize)), new Base64DecodeStream(), new JsonFormatStream(4, true, onKey))
+    );
+    return signalPaths.filter((signalPath: string) => keyPathsOfUnknownSignals.has(signalKeyPath(signalPath)));
+};